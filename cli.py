@@ -32,8 +32,29 @@ def cli():
     pass
 
 
+def _parse_quotas(ctx, param, values):
+    """Convertir opciones 'Categoría=N' en un diccionario ordenado."""
+    quotas = {}
+    for value in values:
+        category, sep, count = value.rpartition('=')
+        if not sep or not category.strip() or not count.strip().isdigit():
+            raise click.BadParameter(f"'{value}' debe tener el formato 'Categoría=N'")
+        quotas[category.strip()] = int(count)
+    return quotas or None
+
+
+def _parse_shard(ctx, param, value):
+    """Convertir 'i/N' en la tupla (i, N)."""
+    if value is None:
+        return None
+    index, sep, count = value.partition('/')
+    if not sep or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise click.BadParameter(f"'{value}' debe tener el formato 'i/N' con 1 <= i <= N")
+    return int(index), int(count)
+
+
 @cli.command(name="generate")
-@click.argument('questions_file', type=click.Path(exists=True))
+@click.argument('questions_file', type=str)
 @click.argument('exam_prefix', type=str)
 @click.argument('num_exams', type=int)
 @click.argument('questions_per_exam', type=int)
@@ -51,11 +72,39 @@ def cli():
               help='Archivo de configuración YAML personalizado')
 @click.option('--time-per-question', type=int, default=1,
               help='Minutos por pregunta (por defecto: 1)')
+@click.option('--dedupe', is_flag=True,
+              help='Detectar preguntas casi duplicadas y no repetirlas en un mismo examen')
+@click.option('--topic', 'topics', multiple=True,
+              help='Usar solo preguntas que mencionen este tema (repetible)')
+@click.option('--all-topics', is_flag=True,
+              help='Exigir que cada pregunta mencione todos los temas indicados')
+@click.option('--quota', 'quotas', multiple=True, callback=_parse_quotas,
+              help='Preguntas por categoría en cada examen, ej. "Unidad 1=5" (repetible)')
+@click.option('--max-overlap', type=click.IntRange(min=0),
+              help='Máximo de preguntas que pueden compartir dos exámenes cualesquiera')
+@click.option('--balance-answers', is_flag=True,
+              help='Repartir las respuestas correctas por igual entre las letras')
+@click.option('--unique/--allow-repeats', 'unique_variants', default=None,
+              help='Garantizar que no haya dos exámenes idénticos (por defecto: sí con --seed-mode spawn; '
+                   'no con legacy, para reproducir exactamente ejecuciones anteriores)')
+@click.option('--seed-mode', type=click.Choice(['legacy', 'spawn']), default='legacy',
+              help='Semillas por examen: legacy (prefijo_N, mismos exámenes que versiones anteriores '
+                   'salvo con --unique) o spawn (derivadas de una semilla raíz)')
+@click.option('--root-seed', type=click.IntRange(min=0),
+              help='Semilla raíz para --seed-mode spawn (por defecto: aleatoria, se guarda en el manifiesto)')
+@click.option('--docx-backend', type=click.Choice(['python-docx', 'raw']), default='python-docx',
+              help='Escritor DOCX: python-docx o raw (OOXML directo, mucho más rápido sin plantilla)')
+@click.option('--shard', callback=_parse_shard,
+              help='Generar solo el fragmento i de N de los exámenes, ej. "2/4" (numeración global)')
+@click.option('--workers', type=int,
+              help='Generar en paralelo con N procesos (por defecto: performance.parallel_processing)')
 def generate_exams(questions_file, exam_prefix, num_exams, questions_per_exam,
-                   export_format, template, answers, config, time_per_question):
+                   export_format, template, answers, config, time_per_question, dedupe,
+                   topics, all_topics, quotas, max_overlap, balance_answers, unique_variants,
+                   seed_mode, root_seed, docx_backend, shard, workers):
     """Generar exámenes desde archivo de preguntas.
     
-    QUESTIONS_FILE: Archivo con las preguntas (formato .txt)
+    QUESTIONS_FILE: Archivo con las preguntas (formato .txt), carpeta o patrón glob
     
     EXAM_PREFIX: Prefijo para los exámenes (ej: "Parcial", "Final")
     
@@ -68,6 +117,17 @@ def generate_exams(questions_file, exam_prefix, num_exams, questions_per_exam,
       examgen generate preguntas.txt Parcial 3 10
       examgen generate preguntas.txt Final 5 20 --format both --answers excel
       examgen generate preguntas.txt Parcial 2 15 --template plantilla.docx
+      examgen generate bancos/ Final 5 40
+      examgen generate "bancos/tema*.txt" Parcial 3 20
+      examgen generate bancos/ Final 5 40 --dedupe
+      examgen generate redes.txt Parcial 3 10 --topic TCP --topic UDP
+      examgen generate banco.txt Final 4 15 --quota "Unidad 1=5" --quota "Unidad 2=5"
+      examgen generate banco.txt Final 500 20 --format docx --workers 8
+      examgen generate banco.txt Final 5000 20 --format docx --docx-backend raw
+      examgen generate banco.txt Parcial 40 20 --max-overlap 3
+      examgen generate banco.txt Final 10 25 --balance-answers
+      examgen generate banco.txt Final 1000 30 --seed-mode spawn --root-seed 1234
+      examgen generate banco.txt Final 40000 30 --shard 2/4 --answers csv
     """
     try:
         with Progress(
@@ -78,20 +138,28 @@ def generate_exams(questions_file, exam_prefix, num_exams, questions_per_exam,
             task = progress.add_task("Generando exámenes...", total=None)
             
             # Import here to avoid slow startup
-            from examgenerator.core import load_questions_from_file, validate_questions
+            from examgenerator.core import load_bank
             from examgenerator.config import config as app_config
             
             # Load custom config if provided
             if config:
                 app_config.load_config(config)
             
-            # Load questions
+            # Load and validate questions once; generation reuses this bank
             progress.update(task, description="Cargando preguntas...")
-            questions = load_questions_from_file(questions_file)
-            validate_questions(questions)
+            questions = load_bank(questions_file)
             
             console.print(f"✓ Cargadas {len(questions)} preguntas desde [cyan]{questions_file}[/cyan]")
             
+            if dedupe:
+                progress.update(task, description="Buscando preguntas casi duplicadas...")
+                duplicate_groups = questions.find_duplicates().duplicate_groups()
+                console.print(f"✓ Grupos de preguntas casi duplicadas: [yellow]{len(duplicate_groups)}[/yellow]")
+            
+            if topics:
+                progress.update(task, description="Indexando palabras clave...")
+                questions.build_keyword_index()
+            
             # Generate exams using the original eg.py logic
             progress.update(task, description=f"Generando {num_exams} exámenes...")
             
@@ -104,8 +172,21 @@ def generate_exams(questions_file, exam_prefix, num_exams, questions_per_exam,
                 num_questions=questions_per_exam,
                 export_format=export_format,
                 template_path=template,
-                answers_format=answers,
-                minutes_per_question=time_per_question
+                answers_format='xlsx' if answers.lower() == 'excel' else answers.lower(),
+                minutes_per_question=time_per_question,
+                bank=questions,
+                topics=list(topics),
+                match_all_topics=all_topics,
+                quotas=quotas,
+                max_overlap=max_overlap,
+                balance_answers=balance_answers,
+                unique_variants=unique_variants,
+                seed_mode=seed_mode,
+                root_seed=root_seed,
+                shard=shard,
+                docx_backend=docx_backend,
+                parallel=True if workers else None,
+                max_workers=workers
             )
         
         # Success message
@@ -301,37 +382,193 @@ def validate(questions_file):
       examgen validate preguntas.txt
     """
     try:
-        from examgenerator.core import load_questions_from_file, validate_questions
+        from examgenerator.core import iter_questions_from_file, validate_questions
         
         console.print(f"Validando [cyan]{questions_file}[/cyan]...")
         
-        questions = load_questions_from_file(questions_file)
-        validate_questions(questions)
-        
         # Show summary
         table = Table(title="Resumen de Preguntas", show_header=True)
         table.add_column("Pregunta #", justify="right", style="cyan")
         table.add_column("Opciones", justify="center", style="yellow")
         table.add_column("Respuesta", justify="center", style="green")
         
-        for i, q in enumerate(questions[:10], 1):  # Show first 10
+        # Stream the bank: validate and count without keeping it in memory
+        preview = []
+        total = 0
+        
+        def track(questions):
+            nonlocal total
+            for q in questions:
+                total += 1
+                if total <= 10:  # Show first 10
+                    preview.append(q)
+                yield q
+        
+        validate_questions(track(iter_questions_from_file(questions_file)))
+        
+        for i, q in enumerate(preview, 1):
             table.add_row(
                 str(i),
                 str(len(q.get('options', []))),
                 str(q.get('answer', 'N/A'))
             )
         
-        if len(questions) > 10:
+        if total == 0:
+            raise ValueError("No se cargó ninguna pregunta. Verifica el formato del archivo.")
+        
+        if total > 10:
             table.add_row("...", "...", "...")
         
         console.print(table)
-        console.print(f"\n[green]✓ Archivo válido: {len(questions)} preguntas cargadas[/green]")
+        console.print(f"\n[green]✓ Archivo válido: {total} preguntas cargadas[/green]")
         
     except Exception as e:
         console.print(f"[red]✗ Error de validación: {str(e)}[/red]")
         raise click.Abort()
 
 
+@cli.command(name="compile")
+@click.argument('questions_file', type=click.Path(exists=True))
+@click.option('--output', '-o', type=click.Path(),
+              help='Archivo .qbank de salida (por defecto: mismo nombre con extensión .qbank)')
+def compile_questions(questions_file, output):
+    """Compilar un banco de preguntas a formato binario .qbank.
+    
+    El banco compilado se abre con acceso aleatorio (mmap), de modo que
+    generar exámenes solo lee las preguntas seleccionadas.
+    
+    QUESTIONS_FILE: Archivo de preguntas a compilar
+    
+    \b
+    Ejemplos:
+      examgen compile preguntas.txt
+      examgen compile banco.txt -o banco.qbank
+    """
+    try:
+        from examgenerator.core import iter_questions_from_file, iter_validated_questions, compile_bank
+        
+        if output is None:
+            output = str(Path(questions_file).with_suffix('.qbank'))
+        
+        console.print(f"Compilando [cyan]{questions_file}[/cyan]...")
+        
+        # Single streaming pass: parse, validate and write with constant memory.
+        # compile_bank only replaces ``output`` once the whole bank is valid.
+        count = compile_bank(iter_validated_questions(iter_questions_from_file(questions_file)), output)
+        
+        console.print(f"[green]✓ Banco compilado: {count} preguntas en [cyan]{output}[/cyan][/green]")
+        
+    except Exception as e:
+        console.print(f"[red]✗ Error de compilación: {str(e)}[/red]")
+        raise click.Abort()
+
+
+@cli.command(name="regenerate")
+@click.argument('manifest', type=click.Path(exists=True))
+@click.argument('questions_file', type=str)
+@click.argument('exam_number', type=click.IntRange(min=1))
+@click.option('--answers-only', is_flag=True,
+              help='Regenerar solo la hoja de respuestas del examen')
+@click.option('--format', '-f', 'export_format',
+              type=click.Choice(['txt', 'docx', 'both'], case_sensitive=False),
+              help='Formato de exportación (por defecto: el de la generación original)')
+@click.option('--output', '-o', type=click.Path(), default='.',
+              help='Carpeta donde guardar los archivos regenerados')
+def regenerate(manifest, questions_file, exam_number, answers_only, export_format, output):
+    """Regenerar un examen a partir del manifiesto de una generación.
+    
+    Cada examen depende solo del banco y de los parámetros guardados en
+    manifest.json, así que los archivos generados pueden borrarse y
+    reconstruirse cuando hagan falta.
+    
+    MANIFEST: manifest.json (o la carpeta de la generación que lo contiene)
+    
+    QUESTIONS_FILE: El mismo banco de preguntas usado al generar
+    
+    EXAM_NUMBER: Número del examen a regenerar
+    
+    \b
+    Ejemplos:
+      examgen regenerate Examenes_Parcial/manifest.json preguntas.txt 7
+      examgen regenerate Examenes_Final banco.qbank 120 --answers-only
+    """
+    try:
+        from examgenerator.core import load_bank
+        from examgenerator.regenerate import load_manifest, regenerate_exam
+        
+        run = load_manifest(manifest)
+        bank = load_bank(questions_file)
+        Path(output).mkdir(parents=True, exist_ok=True)
+        _, answers = regenerate_exam(run, bank, exam_number, output, answers_only, export_format)
+        
+        prefix = run['generation']['exam_prefix']
+        what = "Respuestas del examen" if answers_only else "Examen"
+        console.print(f"[green]✓ {what} {prefix} {exam_number} regenerado en [cyan]{output}[/cyan][/green]")
+        console.print(' '.join(f"{number}.{letter}" for number, letter in answers.items()))
+        
+    except Exception as e:
+        console.print(f"[red]✗ Error al regenerar: {str(e)}[/red]")
+        raise click.Abort()
+
+
+@cli.command(name="merge-answers")
+@click.argument('answer_files', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--prefix', '-p', 'exam_prefix', required=True,
+              help='Prefijo de los exámenes (ej: "Final")')
+@click.option('--answers', '-a', 'answers_format',
+              type=click.Choice(['excel', 'csv'], case_sensitive=False),
+              default='excel', help='Formato del archivo consolidado')
+@click.option('--time-per-question', type=int, default=1,
+              help='Minutos por pregunta (por defecto: 1)')
+@click.option('--output', '-o', type=click.Path(), default='.',
+              help='Carpeta donde guardar el archivo consolidado')
+@click.option('--num-exams', '-n', type=click.IntRange(min=1), default=None,
+              help='Exámenes de la generación completa (por defecto: el manifest.json de los fragmentos)')
+def merge_answers(answer_files, exam_prefix, answers_format, time_per_question, output, num_exams):
+    """Unir los archivos de respuestas de una generación por fragmentos.
+    
+    ANSWER_FILES: Archivos de respuestas (.xlsx o .csv) de cada fragmento
+    
+    Los fragmentos deben cubrir todos los exámenes del 1 al total de la
+    generación, que se lee del manifest.json junto a cada archivo o de
+    --num-exams.
+    
+    \b
+    Ejemplo:
+      examgen merge-answers parte*/respuestas_Final_shard*_completas.csv -p Final -a csv
+    """
+    try:
+        from examgenerator.exporters import create_answers_csv, create_answers_excel, merge_answer_files
+        from examgenerator.regenerate import MANIFEST_NAME, load_manifest
+        
+        if num_exams is None:
+            totals = {
+                load_manifest(str(manifest))['generation']['num_exams']
+                for manifest in {Path(path).parent / MANIFEST_NAME for path in answer_files}
+                if manifest.exists()
+            }
+            if not totals:
+                raise ValueError(f"No se encontró {MANIFEST_NAME} junto a los archivos; indica --num-exams.")
+            if len(totals) > 1:
+                raise ValueError(f"Los manifiestos no coinciden en el número de exámenes: {sorted(totals)}")
+            num_exams = totals.pop()
+        
+        answer_key = merge_answer_files(answer_files, num_exams=num_exams)
+        
+        Path(output).mkdir(parents=True, exist_ok=True)
+        if answers_format == 'excel':
+            create_answers_excel(answer_key, exam_prefix, output, time_per_question)
+        else:
+            create_answers_csv(answer_key, exam_prefix, output)
+        
+        console.print(f"[green]✓ Unidas las respuestas de {len(answer_key)} exámenes "
+                      f"(1 a {num_exams}) desde {len(answer_files)} archivos[/green]")
+        
+    except Exception as e:
+        console.print(f"[red]✗ Error al unir respuestas: {str(e)}[/red]")
+        raise click.Abort()
+
+
 @cli.command(name="web")
 @click.option('--host', default='127.0.0.1', help='Host para el servidor web')
 @click.option('--port', type=int, default=5000, help='Puerto para el servidor web')
@@ -1,18 +1,65 @@
 """Core modules for exam generation."""
 
-from .question_loader import load_questions_from_file, validate_questions
+from .question_loader import (
+    load_questions_from_file,
+    load_questions_from_stream,
+    iter_questions_from_file,
+    iter_questions_from_stream,
+    load_questions_from_directory,
+    iter_validated_questions,
+    validate_question,
+    validate_questions,
+)
+from .bank import QuestionBank, load_bank, load_bank_from_bytes
 from .shuffler import shuffle_exam_questions, shuffle_question_options
+from .question import Question, ExamItem
+from .incremental_loader import IncrementalBankLoader
+from .compiled_bank import CompiledBank, compile_bank, open_compiled_bank
+from .dedup import DuplicateIndex, find_near_duplicates
+from .keyword_index import KeywordIndex
 from .time_calculator import calculate_exam_time
 from .directory_manager import create_output_directory, sanitize_folder_name
-from .exam_generator import generate_exam
+from .exam_generator import build_category_index, decode_exam, generate_exam, select_exam
+from .exam_matrix import ExamMatrix
+from .batch_generator import generate_exams_batch
+from .assembly import AssemblyResult, assemble_exams
+from .seeding import SEED_MODES, exam_rng, new_root_seed
 
 __all__ = [
+    'Question',
+    'ExamItem',
     'load_questions_from_file',
+    'load_questions_from_stream',
+    'iter_questions_from_file',
+    'iter_questions_from_stream',
+    'load_questions_from_directory',
+    'iter_validated_questions',
+    'validate_question',
     'validate_questions',
+    'QuestionBank',
+    'load_bank',
+    'load_bank_from_bytes',
+    'IncrementalBankLoader',
+    'CompiledBank',
+    'compile_bank',
+    'open_compiled_bank',
+    'DuplicateIndex',
+    'find_near_duplicates',
+    'KeywordIndex',
     'shuffle_exam_questions',
     'shuffle_question_options',
     'calculate_exam_time',
     'create_output_directory',
     'sanitize_folder_name',
     'generate_exam',
+    'select_exam',
+    'decode_exam',
+    'ExamMatrix',
+    'build_category_index',
+    'generate_exams_batch',
+    'AssemblyResult',
+    'assemble_exams',
+    'SEED_MODES',
+    'exam_rng',
+    'new_root_seed',
 ]
\ No newline at end of file
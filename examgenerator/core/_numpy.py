@@ -0,0 +1,13 @@
+"""
+Optional NumPy dependency.
+
+Modules with a vectorized path import ``NUMPY_AVAILABLE`` and ``np`` from
+here and fall back to pure Python (or raise) when NumPy is missing.
+"""
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
@@ -0,0 +1,192 @@
+"""
+Exam assembly with a cap on the questions shared by any two exams.
+
+Exams are assembled one after another. Every question keeps a bitset
+(a Python int) of the exams that already contain it, and the exam being
+built keeps a bitset of the earlier exams it has reached the cap with, so
+checking a candidate question is a single AND of two integers regardless
+of the number of exams.
+"""
+
+import random
+from typing import Dict, List, Optional, Sequence
+
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    popcount = int.bit_count
+else:
+    def popcount(value: int) -> int:
+        """Number of set bits of a non-negative int."""
+        return bin(value).count('1')
+
+
+class AssemblyResult:
+    """Question selection of every exam of an overlap-capped assembly.
+    
+    Attributes:
+        exams: Bank indices of the questions of each exam
+        max_overlap: Requested cap on shared questions between two exams
+        achieved_overlap: Largest overlap between any two assembled exams
+    """
+    
+    def __init__(self, exams: List[List[int]], max_overlap: int, achieved_overlap: int):
+        self.exams = exams
+        self.max_overlap = max_overlap
+        self.achieved_overlap = achieved_overlap
+    
+    @property
+    def cap_met(self) -> bool:
+        """Whether every pair of exams respects ``max_overlap``."""
+        return self.achieved_overlap <= self.max_overlap
+    
+    def exam_mask(self, exam: int) -> int:
+        """Bitset of the questions of exam ``exam`` (0-based)."""
+        mask = 0
+        for index in self.exams[exam]:
+            mask |= 1 << index
+        return mask
+    
+    def overlap(self, first: int, second: int) -> int:
+        """Number of questions exams ``first`` and ``second`` share."""
+        return popcount(self.exam_mask(first) & self.exam_mask(second))
+    
+    def __len__(self) -> int:
+        return len(self.exams)
+
+
+def _assemble_one(
+    rng: random.Random,
+    pool: Sequence[int],
+    k: int,
+    cap: int,
+    exams_with: Dict[int, int],
+    earlier: int,
+    groups: Optional[Sequence[int]]
+) -> Optional[List[int]]:
+    """Pick k questions sharing at most ``cap`` with each of the ``earlier`` exams.
+    
+    Returns None if the pool cannot provide them.
+    """
+    chosen: List[int] = []
+    taken = set()
+    used_groups = set()
+    shared: Dict[int, int] = {}  # Earlier exam -> questions shared so far
+    saturated = (1 << earlier) - 1 if cap == 0 else 0  # Earlier exams that reached the cap
+    
+    def take(index: int) -> None:
+        nonlocal saturated
+        if index in taken:
+            return
+        members = exams_with.get(index, 0)
+        group = groups[index] if groups is not None else None
+        if members & saturated or (group is not None and group in used_groups):
+            return
+        taken.add(index)
+        if group is not None:
+            used_groups.add(group)
+        chosen.append(index)
+        while members:
+            low = members & -members
+            exam = low.bit_length() - 1
+            shared[exam] = shared.get(exam, 0) + 1
+            if shared[exam] >= cap:
+                saturated |= low
+            members ^= low
+    
+    # Random draws first; if they run dry, scan the least used questions first
+    for _ in range(20 * k):
+        if len(chosen) == k:
+            return chosen
+        take(pool[rng.randrange(len(pool))])
+    order = list(pool)
+    rng.shuffle(order)
+    order.sort(key=lambda index: popcount(exams_with.get(index, 0)))
+    for index in order:
+        if len(chosen) == k:
+            break
+        take(index)
+    return chosen if len(chosen) == k else None
+
+
+def _assemble_all(
+    rng: random.Random,
+    pool: Sequence[int],
+    num_exams: int,
+    k: int,
+    cap: int,
+    groups: Optional[Sequence[int]]
+) -> Optional[List[List[int]]]:
+    """Greedily assemble every exam under ``cap``; None if some exam cannot be filled."""
+    exams_with: Dict[int, int] = {}  # Question -> bitset of exams containing it
+    exams: List[List[int]] = []
+    for exam in range(num_exams):
+        chosen = _assemble_one(rng, pool, k, cap, exams_with, exam, groups)
+        if chosen is None:
+            return None
+        for index in chosen:
+            exams_with[index] = exams_with.get(index, 0) | (1 << exam)
+        exams.append(chosen)
+    return exams
+
+
+def assemble_exams(
+    num_exams: int,
+    num_questions: int,
+    max_overlap: int,
+    seed: str,
+    bank_size: int,
+    question_ids: Optional[Sequence[int]] = None,
+    duplicate_groups: Optional[Sequence[int]] = None
+) -> AssemblyResult:
+    """Choose the questions of every exam so that no two exams share more
+    than ``max_overlap`` questions.
+    
+    When the cap cannot be met, assembly is retried with the cap raised
+    one question at a time, so the result always has ``num_exams`` exams
+    and reports the best overlap it achieved.
+    
+    Args:
+        num_exams: Number of exams
+        num_questions: Questions per exam
+        max_overlap: Maximum questions shared by any two exams
+        seed: Seed for the assembly (e.g. the exam prefix)
+        bank_size: Number of questions in the bank
+        question_ids: Indices to draw from (e.g. a topic filter)
+        duplicate_groups: Group id of each question; at most one per exam
+    
+    Returns:
+        AssemblyResult with the selection and the achieved overlap
+    
+    Raises:
+        ValueError: If the pool has fewer than num_questions questions
+    """
+    pool = range(bank_size) if question_ids is None else question_ids
+    if num_questions > len(pool):
+        raise ValueError(f"Solo hay {len(pool)} preguntas disponibles; se pidieron {num_questions}.")
+    
+    cap = max(max_overlap, 0)
+    while True:
+        exams = _assemble_all(random.Random(seed), pool, num_exams, num_questions, cap, duplicate_groups)
+        if exams is not None:
+            break
+        if cap >= num_questions:  # Only near-duplicate groups can get here
+            raise ValueError(
+                f"No hay {num_questions} preguntas distintas (sin casi duplicados) disponibles."
+            )
+        cap += 1  # Infeasible (or too tight for the greedy): relax and retry
+    
+    # Largest overlap actually reached, from the membership bitsets
+    achieved = 0
+    exams_with: Dict[int, int] = {}
+    for exam, chosen in enumerate(exams):
+        shared: Dict[int, int] = {}
+        for index in chosen:
+            members = exams_with.get(index, 0)
+            while members:
+                low = members & -members
+                shared[low] = shared.get(low, 0) + 1
+                members ^= low
+            exams_with[index] = exams_with.get(index, 0) | (1 << exam)
+        achieved = max(achieved, max(shared.values(), default=0))
+    
+    return AssemblyResult(exams, max_overlap, achieved)
@@ -0,0 +1,89 @@
+"""
+Answer-position balancing for generated exams.
+
+Instead of shuffling every question's options independently, the balanced
+mode first fixes how often each letter must be the correct answer in an
+exam (``answer_targets``) and then places each correct option where the
+letter is furthest below its target (``balanced_positions``). The letters
+left over when the question count is not a multiple of the letter count
+rotate with the exam index, so a whole batch stays uniform too.
+"""
+
+import random
+from typing import List, Sequence
+
+
+def answer_targets(num_questions: int, num_letters: int, exam_index: int = 0) -> List[int]:
+    """How many correct answers each letter should get in one exam.
+    
+    Args:
+        num_questions: Questions in the exam
+        num_letters: Letters available (e.g. 4 for 'ABCD')
+        exam_index: 0-based exam number; rotates the letters that receive
+            the remainder so consecutive exams even each other out
+    
+    Returns:
+        Target count per letter position
+    """
+    base, extra = divmod(num_questions, num_letters)
+    targets = [base] * num_letters
+    offset = exam_index * extra
+    for j in range(extra):
+        targets[(offset + j) % num_letters] += 1
+    return targets
+
+
+def balanced_positions(
+    rng: random.Random,
+    option_counts: Sequence[int],
+    targets: Sequence[int]
+) -> List[int]:
+    """Choose the position of each question's correct option.
+    
+    Questions with fewer options are placed first, since they can only use
+    the first letters; each one takes the allowed position with the largest
+    remaining deficit, ties broken at random. Runs in O(questions x letters).
+    
+    Args:
+        rng: Per-exam generator
+        option_counts: Number of options of each question
+        targets: Target count per position (see ``answer_targets``)
+    
+    Returns:
+        Correct-option position for each question, in input order
+    """
+    remaining = list(targets)
+    positions = [0] * len(option_counts)
+    
+    # Bucket by option count (linear, unlike a sort) and visit in random order
+    buckets: List[List[int]] = [[] for _ in range(len(targets) + 1)]
+    for question, count in enumerate(option_counts):
+        buckets[min(count, len(targets))].append(question)
+    
+    for bucket in buckets:
+        rng.shuffle(bucket)
+        for question in bucket:
+            count = min(option_counts[question], len(targets))
+            start = rng.randrange(count)
+            best = start
+            for step in range(1, count):
+                position = (start + step) % count
+                if remaining[position] > remaining[best]:
+                    best = position
+            remaining[best] -= 1
+            positions[question] = best
+    
+    return positions
+
+
+def answer_permutation(
+    rng: random.Random,
+    num_options: int,
+    correct_idx: int,
+    position: int
+) -> List[int]:
+    """Random option order (original indices) with the correct one at ``position``."""
+    others = [i for i in range(num_options) if i != correct_idx]
+    rng.shuffle(others)
+    others.insert(position, correct_idx)
+    return others
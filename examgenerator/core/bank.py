@@ -0,0 +1,180 @@
+"""
+Question bank container and single-pass load+validate pipeline.
+"""
+
+from collections.abc import Sequence
+from typing import Dict, Iterable, Optional, Union
+
+from .compiled_bank import CompiledBank, is_compiled_bank, open_compiled_bank
+from .dedup import DuplicateIndex
+from .exam_generator import build_category_index
+from .keyword_index import KeywordIndex
+from .question_loader import is_multi_file_source, load_questions_from_directory
+
+
+class QuestionBank(Sequence):
+    """A loaded question bank together with its provenance.
+    
+    Generation functions accept it anywhere a list of questions is expected.
+    ``validated`` records that every question already passed
+    ``validate_question``, so callers can skip re-validating it.
+    
+    Attributes:
+        questions: Underlying sequence (list or CompiledBank)
+        source: File, directory or glob the bank was loaded from
+        content_hash: SHA-256 of the raw bank bytes, when known
+        fingerprint: SHA-256 of the parsed content (``BankFingerprint``),
+            when the loader computed it
+        validated: Whether the bank was validated during loading
+        duplicates: Near-duplicate index, once ``find_duplicates`` has run
+        keyword_index: Inverted word index, once ``build_keyword_index`` has run
+        category_index: Question indices per category, once
+            ``build_category_index`` has run
+    """
+    
+    def __init__(
+        self,
+        questions: Sequence,
+        source: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        validated: bool = False
+    ):
+        self.questions = questions
+        self.source = source
+        self.content_hash = content_hash
+        self.validated = validated
+        self.duplicates: Optional[DuplicateIndex] = None
+        self.keyword_index: Optional[KeywordIndex] = None
+        self.category_index: Optional[Dict[str, Sequence[int]]] = None
+    
+    def __len__(self) -> int:
+        return len(self.questions)
+    
+    def __getitem__(self, index):
+        return self.questions[index]
+    
+    @property
+    def fingerprint(self) -> Optional[str]:
+        # Set by the parser (QuestionList) or read from a compiled bank's trailer
+        return getattr(self.questions, 'fingerprint', None)
+    
+    def find_duplicates(self, threshold: float = 0.7) -> DuplicateIndex:
+        """Build (once) and return the bank's near-duplicate index."""
+        if self.duplicates is None or self.duplicates.threshold != threshold:
+            self.duplicates = DuplicateIndex(self.questions, threshold=threshold)
+        return self.duplicates
+    
+    @property
+    def duplicate_groups(self) -> Optional[Sequence]:
+        """Group id per question for ``generate_exam``, or None if not indexed."""
+        return self.duplicates.groups if self.duplicates is not None else None
+    
+    def count_distinct(self, question_ids: Optional[Sequence] = None) -> int:
+        """Number of questions left once near-duplicates are counted once.
+        
+        Args:
+            question_ids: Only count these questions (default: whole bank)
+        """
+        if question_ids is None:
+            question_ids = range(len(self))
+        if self.duplicates is None:
+            return len(question_ids)
+        groups = self.duplicates.groups
+        return len({groups[index] for index in question_ids})
+    
+    def build_keyword_index(self) -> KeywordIndex:
+        """Build (once) and return the bank's inverted keyword index."""
+        if self.keyword_index is None:
+            self.keyword_index = KeywordIndex(self.questions)
+        return self.keyword_index
+    
+    def filter(self, topics: Union[str, Iterable[str]], match_all: bool = False) -> Sequence:
+        """Indices of the questions mentioning any (or all) of ``topics``.
+        
+        The result can be passed to ``generate_exam`` as ``question_ids``.
+        """
+        return self.build_keyword_index().search(topics, match_all=match_all)
+    
+    def build_category_index(self) -> Dict[str, Sequence[int]]:
+        """Build (once) and return the question indices of each category."""
+        if self.category_index is None:
+            self.category_index = build_category_index(self.questions)
+        return self.category_index
+    
+    def close(self) -> None:
+        """Release resources held by a memory-mapped compiled bank."""
+        if isinstance(self.questions, CompiledBank):
+            self.questions.close()
+    
+    def __enter__(self) -> 'QuestionBank':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_bank_from_bytes(raw: bytes, source: Optional[str] = None) -> QuestionBank:
+    """Parse and validate an in-memory bank in one pass (e.g. a web upload).
+    
+    Results are shared through the parsed-bank cache, keyed by the SHA-256
+    of ``raw``.
+    
+    Raises:
+        ValueError: If the bank is empty or a question is invalid
+    """
+    from ..utils.bank_cache import get_bank_cache
+    
+    cache = get_bank_cache()
+    questions = cache.get_or_parse(raw)
+    return QuestionBank(questions, source=source, content_hash=cache.key_for(raw), validated=True)
+
+
+def load_bank(
+    source: str,
+    max_workers: Optional[int] = None,
+    detect_duplicates: bool = False,
+    index_keywords: bool = False,
+    index_categories: bool = False
+) -> QuestionBank:
+    """Load a bank from a file, directory, glob or compiled ``.qbank``.
+    
+    The source is read once and each question is validated while it is
+    parsed, so the returned bank can be handed straight to generation.
+    
+    Args:
+        source: Bank file, directory, glob pattern or compiled bank
+        max_workers: Worker processes for multi-file banks
+        detect_duplicates: Also build the near-duplicate index
+            (``QuestionBank.duplicates``)
+        index_keywords: Also build the inverted keyword index used by
+            ``QuestionBank.filter``
+        index_categories: Also build the per-category index used for
+            stratified sampling
+        
+    Returns:
+        Validated QuestionBank
+        
+    Raises:
+        FileNotFoundError: If the source does not exist
+        ValueError: If the bank is empty or a question is invalid
+    """
+    if is_multi_file_source(source):
+        questions = load_questions_from_directory(source, max_workers=max_workers, validate=True)
+        bank = QuestionBank(questions, source=source, validated=True)
+    elif is_compiled_bank(source):  # Validated at compile time
+        bank = QuestionBank(open_compiled_bank(source), source=source, validated=True)
+    else:
+        try:
+            with open(source, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"El archivo '{source}' no se encontró.")
+        bank = load_bank_from_bytes(raw, source=source)
+    
+    if detect_duplicates:
+        bank.find_duplicates()
+    if index_keywords:
+        bank.build_keyword_index()
+    if index_categories:
+        bank.build_category_index()
+    return bank
@@ -0,0 +1,102 @@
+"""
+Vectorized generation of many exam variants at once.
+
+Instead of calling ``generate_exam`` per exam, ``generate_exams_batch``
+draws the question-selection matrix and the option permutation ids for
+all exams with a handful of NumPy calls. The result is an ``ExamMatrix``,
+the same compact representation the runner uses, which decodes individual
+exams (or the exporters' answer data) on demand.
+
+Batches use a NumPy generator seeded from ``seed``, so their exams differ
+from the ones ``generate_exam`` produces for the same prefix.
+"""
+
+import hashlib
+from math import factorial
+from typing import Mapping, Sequence
+
+from ._numpy import NUMPY_AVAILABLE, np
+from .exam_matrix import ExamMatrix
+from .question import OPTION_LETTERS
+
+# Rows of the (exams x bank size) random-key matrix handled per chunk when
+# sampling without replacement by sorting
+_PERMUTATION_CHUNK = 1 << 22
+
+
+def _numpy_rng(seed: str):
+    """NumPy generator derived from a seed string (stable across runs)."""
+    digest = hashlib.sha256(seed.encode('utf-8')).digest()
+    return np.random.default_rng(int.from_bytes(digest[:16], 'little'))
+
+
+def _sample_rows(rng, n_exams: int, k: int, size: int):
+    """(n_exams, k) matrix of indices in [0, size), distinct within each row."""
+    if k > size // 4:
+        return _dense_rows(rng, n_exams, k, size)
+    
+    # Few collisions expected: draw with replacement, then redraw only the
+    # repeated copies until every row is distinct. Which copies are redrawn
+    # does not depend on the values, so each row is a uniform k-subset.
+    ids = np.sort(rng.integers(0, size, (n_exams, k), dtype=np.int64), axis=1)
+    rows = np.flatnonzero((ids[:, 1:] == ids[:, :-1]).any(axis=1))
+    while len(rows):
+        block = ids[rows]
+        repeated = np.zeros(block.shape, dtype=bool)
+        repeated[:, 1:] = block[:, 1:] == block[:, :-1]
+        block[repeated] = rng.integers(0, size, int(repeated.sum()), dtype=np.int64)
+        block.sort(axis=1)
+        ids[rows] = block
+        rows = rows[(block[:, 1:] == block[:, :-1]).any(axis=1)]
+    # Sorting fixed the order of each row; shuffle it
+    return rng.permuted(ids, axis=1)
+
+
+def _dense_rows(rng, n_exams: int, k: int, size: int):
+    """``_sample_rows`` for k close to ``size``: first k of a random permutation."""
+    ids = np.empty((n_exams, k), dtype=np.int64)
+    rows = max(1, _PERMUTATION_CHUNK // size)
+    for start in range(0, n_exams, rows):
+        stop = min(start + rows, n_exams)
+        keys = rng.random((stop - start, size))
+        ids[start:stop] = np.argpartition(keys, k - 1, axis=1)[:, :k] if k < size else np.argsort(keys, axis=1)
+        # argpartition leaves the first k unordered but not random; shuffle them
+        ids[start:stop] = rng.permuted(ids[start:stop], axis=1)
+    return ids
+
+
+def generate_exams_batch(
+    questions: Sequence[Mapping],
+    n_exams: int,
+    num_questions: int,
+    seed: str,
+    option_letters: str = OPTION_LETTERS
+) -> ExamMatrix:
+    """Generate ``n_exams`` exams of ``num_questions`` questions in one go.
+    
+    Args:
+        questions: Validated bank (list, QuestionBank or CompiledBank)
+        n_exams: Number of exams
+        num_questions: Questions per exam (capped at the bank size)
+        seed: Seed string for the whole batch (e.g. the exam prefix)
+        option_letters: Letters to use for options (default 'A'-'J')
+    
+    Returns:
+        ExamMatrix with the question ids and permutation ids of every exam
+    
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("La generación por lotes necesita NumPy: pip install numpy")
+    
+    rng = _numpy_rng(seed)
+    k = min(num_questions, len(questions))
+    question_ids = _sample_rows(rng, n_exams, k, len(questions))
+    
+    # Any id below n! is a valid order of n options (see shuffler.permutation_from_id)
+    used, inverse = np.unique(question_ids, return_inverse=True)
+    orders = np.array([factorial(len(questions[index]['options'])) for index in used.tolist()], dtype=np.int64)
+    permutation_ids = rng.integers(0, orders[inverse.reshape(question_ids.shape)])
+    
+    return ExamMatrix.from_arrays(questions, question_ids, permutation_ids, option_letters=option_letters)
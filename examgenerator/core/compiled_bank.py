@@ -0,0 +1,215 @@
+"""
+Compiled binary question-bank format with memory-mapped random access.
+
+Layout of a ``.qbank`` file (all integers little-endian)::
+
+    header   : magic b'EGQB', version (u16), reserved (u16),
+               count (u64), offset table position (u64)
+    records  : one per question, see ``_encode_record``
+    offsets  : count + 1 u64 values; record i spans offsets[i]..offsets[i+1]
+    trailer  : SHA-256 content fingerprint (32 bytes, version 3 and later)
+
+The offset table lets ``CompiledBank`` decode any single question by
+touching only the pages that hold its offset and its record. The trailer
+holds the ``BankFingerprint`` computed while compiling, so run manifests
+get it without decoding the bank.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Any
+
+from .question import BankFingerprint, Question
+
+MAGIC = b'EGQB'
+FORMAT_VERSION = 3  # Version 2 adds the question category, 3 the fingerprint trailer
+SUPPORTED_VERSIONS = (1, 2, 3)
+
+_HEADER = struct.Struct('<4sHHQQ')
+_OFFSET = struct.Struct('<Q')
+_RECORD_HEADER = struct.Struct('<BB')
+_LENGTH = struct.Struct('<I')
+_FINGERPRINT_SIZE = 32
+
+
+def _encode_record(question: Dict[str, Any]) -> bytes:
+    """Encode a question as: n_options (u8), answer index (u8), then the
+    question text, each option and the category (empty if none) as
+    u32 length + UTF-8 bytes."""
+    options = question['options']
+    answer_idx = ord(question['answer']) - ord('A')
+    parts = [_RECORD_HEADER.pack(len(options), answer_idx)]
+    for text in (question['question'], *options, question.get('category') or ''):
+        data = text.encode('utf-8')
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def _decode_record(buffer: Any, start: int, version: int = FORMAT_VERSION) -> Question:
+    """Decode the record starting at ``start`` in ``buffer``."""
+    n_options, answer_idx = _RECORD_HEADER.unpack_from(buffer, start)
+    pos = start + _RECORD_HEADER.size
+    texts = []
+    for _ in range(n_options + (2 if version >= 2 else 1)):
+        (length,) = _LENGTH.unpack_from(buffer, pos)
+        pos += _LENGTH.size
+        texts.append(bytes(buffer[pos:pos + length]).decode('utf-8'))
+        pos += length
+    category = (texts.pop() or None) if version >= 2 else None
+    return Question(texts[0], texts[1:], chr(ord('A') + answer_idx), category=category)
+
+
+def compile_bank(questions: Iterable[Dict[str, Any]], output_path: str) -> int:
+    """Write questions to a compiled ``.qbank`` file.
+    
+    Questions are written as they are consumed, so an iterator such as
+    ``iter_questions_from_file`` can be compiled without loading the bank.
+    The bank is written to a temporary file next to ``output_path`` and
+    only moved into place once it is complete, so a failed compile never
+    leaves a partial bank behind or replaces an existing one.
+    
+    Args:
+        questions: Iterable of validated question dictionaries
+        output_path: Destination path for the compiled bank
+        
+    Returns:
+        Number of questions written
+        
+    Raises:
+        ValueError: If there are no questions (or a question is invalid,
+            when ``questions`` validates as it goes)
+    """
+    offsets = array('Q')
+    fingerprint = BankFingerprint()
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * _HEADER.size)  # Placeholder, rewritten at the end
+            position = _HEADER.size
+            for question in questions:
+                record = _encode_record(question)
+                offsets.append(position)
+                fingerprint.add(question)
+                f.write(record)
+                position += len(record)
+            offsets.append(position)
+            
+            count = len(offsets) - 1
+            if count == 0:
+                raise ValueError("No se cargó ninguna pregunta. Verifica el formato del archivo.")
+            
+            table_position = position
+            for offset in offsets:
+                f.write(_OFFSET.pack(offset))
+            f.write(fingerprint.digest())
+            
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, table_position))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    return count
+
+
+def is_compiled_bank(filepath: str) -> bool:
+    """Check whether a file starts with the compiled bank magic bytes."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class CompiledBank(Sequence):
+    """Read-only, memory-mapped view of a compiled question bank.
+    
+    Behaves like a list of Question objects, but questions are only
+    decoded when accessed. ``random.sample(bank, k)`` therefore touches
+    ``k`` records instead of the whole file.
+    
+    Attributes:
+        fingerprint: Content fingerprint stored at compile time (hex), or
+            None for banks compiled before format version 3
+    """
+    
+    def __init__(self, filepath: str):
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"El archivo '{filepath}' no se encontró.")
+        
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f"'{filepath}' no es un banco compilado válido.")
+        
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{filepath}' no es un banco compilado válido.")
+        magic, version, _, count, table_position = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{filepath}' no es un banco compilado válido.")
+        if version not in SUPPORTED_VERSIONS:
+            self.close()
+            raise ValueError(f"Versión de banco compilado no soportada: {version}")
+        
+        self.version = version
+        self._count = count
+        self._table_position = table_position
+        self.fingerprint = None
+        if version >= 3:
+            trailer = table_position + (count + 1) * _OFFSET.size
+            digest = bytes(self._mm[trailer:trailer + _FINGERPRINT_SIZE])
+            if len(digest) != _FINGERPRINT_SIZE:
+                self.close()
+                raise ValueError(f"'{filepath}' no es un banco compilado válido.")
+            self.fingerprint = digest.hex()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _offset(self, index: int) -> int:
+        (offset,) = _OFFSET.unpack_from(self._mm, self._table_position + index * _OFFSET.size)
+        return offset
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Índice de pregunta fuera de rango")
+        return _decode_record(self._mm, self._offset(index), self.version)
+    
+    def __reduce__(self):
+        # Pickle by path: worker processes re-open their own memory map
+        return (open_compiled_bank, (self.filepath,))
+    
+    def close(self) -> None:
+        """Release the memory map and the underlying file."""
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+    
+    def __enter__(self) -> 'CompiledBank':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_compiled_bank(filepath: str) -> CompiledBank:
+    """Open a compiled ``.qbank`` file for random access."""
+    return CompiledBank(filepath)
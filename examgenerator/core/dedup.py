@@ -0,0 +1,223 @@
+"""
+Near-duplicate question detection with MinHash and locality-sensitive hashing.
+
+Each question (stem plus options) is reduced to a set of word bigram
+shingles, summarized by a MinHash signature, and split into LSH bands.
+Only questions that collide in some band are compared, so building the
+index is roughly linear in the bank size instead of quadratic.
+"""
+
+import random
+import re
+import unicodedata
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Mapping, Sequence
+
+from ._numpy import NUMPY_AVAILABLE, np
+
+_MASK64 = (1 << 64) - 1
+# Questions are tokenized in batches joined by _SEPARATOR; each question ends
+# with _END so its last word still forms a bigram and no question is empty.
+_SEPARATOR = '\x01'
+_END = '\x02'
+_TOKEN_PATTERN = re.compile(r'\w+|[\x01\x02]')
+_COMBINING_MARKS = re.compile('[\u0300-\u036f]+')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so trivial edits do not change shingles."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return _COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text))
+
+
+def question_text(question: Mapping) -> str:
+    """Stem and options of a question joined into one string."""
+    return ' '.join([question['question'], *question.get('options', ())])
+
+
+class _UnionFind:
+    """Disjoint sets over question indices; the smallest index is the root."""
+    
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+    
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:  # Path compression
+            self.parent[item], item = root, self.parent[item]
+        return root
+    
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+class DuplicateIndex:
+    """Groups of near-duplicate questions in a bank.
+    
+    Attributes:
+        groups: For each question index, the index of the first question of
+            its near-duplicate group (a question is its own group if unique)
+        threshold: Minimum estimated Jaccard similarity to count as duplicate
+    """
+    
+    def __init__(
+        self,
+        questions: Sequence[Mapping],
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+        batch_size: int = 1024
+    ):
+        """Build the index.
+        
+        Args:
+            questions: Bank questions
+            threshold: Minimum estimated Jaccard similarity (0-1)
+            num_perm: MinHash signature length (must be a multiple of bands)
+            bands: Number of LSH bands
+            seed: Seed for the MinHash hash functions
+            batch_size: Questions hashed per NumPy batch
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser múltiplo de bands")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        
+        rng = random.Random(seed)
+        # Multiply-shift hashing: h(x) = ((a * x + b) mod 2^64) >> 32, a odd
+        self._a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._b = [rng.getrandbits(64) for _ in range(num_perm)]
+        
+        # Word ids in first-seen order; the C-level default factory assigns
+        # the next id, so mapping a word list never runs Python code per word
+        vocab: Dict[str, int] = defaultdict()
+        vocab.default_factory = vocab.__len__
+        self._separator_id = vocab[_SEPARATOR]
+        self._vocab = vocab
+        
+        if NUMPY_AVAILABLE:
+            self._signatures = self._signatures_numpy(questions, batch_size)
+            self.groups = self._group_numpy(self._signatures)
+        else:
+            self._signatures = self._signatures_python(questions)
+            self.groups = self._group_python(self._signatures)
+        self._vocab = {}  # Only needed while hashing
+    
+    def _word_ids(self, text: str) -> List[int]:
+        return list(map(self._vocab.__getitem__, _TOKEN_PATTERN.findall(normalize_text(text))))
+    
+    def _signatures_python(self, questions: Sequence[Mapping]) -> List[array]:
+        a, b = self._a, self._b
+        signatures = []
+        for question in questions:
+            ids = self._word_ids(question_text(question) + ' ' + _END)
+            ids.append(self._separator_id)
+            shingles = {(left << 32) | right for left, right in zip(ids, ids[1:])}
+            signatures.append(array('I', (
+                min(((ai * x + bi) & _MASK64) >> 32 for x in shingles)
+                for ai, bi in zip(a, b)
+            )))
+        return signatures
+    
+    def _signatures_numpy(self, questions: Sequence[Mapping], batch_size: int):
+        a = np.array(self._a, dtype=np.uint64)[:, None]
+        b = np.array(self._b, dtype=np.uint64)[:, None]
+        shift = np.uint64(32)
+        result = np.empty((len(questions), self.num_perm), dtype=np.uint32)
+        glue = f' {_END} {_SEPARATOR} '
+        
+        for start in range(0, len(questions), batch_size):
+            texts = [question_text(q) for q in questions[start:start + batch_size]]
+            ids = self._word_ids(glue.join(texts) + glue)
+            flat = np.array(ids, dtype=np.uint64)
+            # One bigram (word, next token) per word, _END included
+            positions = np.flatnonzero(flat != self._separator_id)
+            shingles = (flat[positions] << shift) | flat[positions + 1]
+            # Each question contributes (tokens - 1) bigrams; find where each starts
+            separators = np.flatnonzero(flat == self._separator_id)
+            offsets = np.empty(len(texts), dtype=np.int64)
+            offsets[0] = 0
+            offsets[1:] = separators[:-1] - np.arange(len(texts) - 1)
+            with np.errstate(over='ignore'):  # Wrap-around is the mod 2^64
+                hashed = a * shingles[None, :]
+                hashed += b
+            hashed >>= shift
+            result[start:start + len(texts)] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        
+        return result
+    
+    def _group_python(self, signatures: List[array]) -> array:
+        rows = self.num_perm // self.bands
+        sets = _UnionFind(len(signatures))
+        
+        for band in range(self.bands):
+            start, stop = band * rows, (band + 1) * rows
+            buckets: Dict[bytes, int] = {}
+            for index, signature in enumerate(signatures):
+                first = buckets.setdefault(signature[start:stop].tobytes(), index)
+                if first != index and self.similarity(first, index) >= self.threshold:
+                    sets.union(first, index)
+        
+        return array('i', (sets.find(index) for index in range(len(signatures))))
+    
+    def _group_numpy(self, signatures) -> array:
+        size, rows = len(signatures), self.num_perm // self.bands
+        sets = _UnionFind(size)
+        # Fold each band into one 64-bit key; colliding bands are still
+        # filtered by the similarity check below
+        mixers = np.array(self._a[:rows], dtype=np.uint64)
+        
+        for band in range(self.bands):
+            with np.errstate(over='ignore'):
+                keys = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) @ mixers
+            # First question of each bucket (np.unique returns first occurrences)
+            _, first_index, bucket = np.unique(keys, return_index=True, return_inverse=True)
+            first = first_index[bucket.ravel()]
+            members = np.flatnonzero(first != np.arange(size))
+            if not len(members):
+                continue
+            firsts = first[members]
+            agreement = (signatures[firsts] == signatures[members]).mean(axis=1)
+            similar = agreement >= self.threshold
+            for i, j in zip(firsts[similar].tolist(), members[similar].tolist()):
+                sets.union(i, j)
+        
+        return array('i', (sets.find(index) for index in range(size)))
+    
+    def similarity(self, i: int, j: int) -> float:
+        """Estimated Jaccard similarity between questions ``i`` and ``j``."""
+        sig_i, sig_j = self._signatures[i], self._signatures[j]
+        if NUMPY_AVAILABLE and not isinstance(sig_i, array):
+            return float((sig_i == sig_j).mean())
+        return sum(x == y for x, y in zip(sig_i, sig_j)) / self.num_perm
+    
+    def __len__(self) -> int:
+        return len(self.groups)
+    
+    def group_of(self, index: int) -> int:
+        """Representative question index of the group ``index`` belongs to."""
+        return self.groups[index]
+    
+    def duplicate_groups(self) -> List[List[int]]:
+        """Groups with more than one question, as lists of indices."""
+        members: Dict[int, List[int]] = defaultdict(list)
+        for index, group in enumerate(self.groups):
+            members[group].append(index)
+        return [group for group in members.values() if len(group) > 1]
+
+
+def find_near_duplicates(questions: Sequence[Mapping], threshold: float = 0.7) -> DuplicateIndex:
+    """Build a DuplicateIndex for a bank (see ``DuplicateIndex``)."""
+    return DuplicateIndex(questions, threshold=threshold)
@@ -3,48 +3,241 @@ Main exam generation logic.
 """
 
 import random
-from typing import List, Dict, Tuple
-from .shuffler import shuffle_question_options
+from array import array
+from collections import defaultdict
+from typing import List, Dict, Mapping, Optional, Sequence, Set, Tuple
+from .question import OPTION_LETTERS, ExamItem
+from .shuffler import draw_permutation_id, permutation_from_id, permutation_id
+from .balancer import answer_targets, balanced_positions, answer_permutation
 
 
 def generate_exam(
     questions: List[Dict],
     num_questions: int,
     seed: str,
-    option_letters: str = 'ABCD'
+    option_letters: str = OPTION_LETTERS,
+    duplicate_groups: Optional[Sequence[int]] = None,
+    question_ids: Optional[Sequence[int]] = None,
+    quotas: Optional[Mapping[str, int]] = None,
+    category_index: Optional[Mapping[str, Sequence[int]]] = None,
+    rng: Optional[random.Random] = None,
+    balance_answers: bool = False,
+    exam_index: int = 0
 ) -> Tuple[List[Dict], Dict[int, str]]:
     """Generate a single exam with shuffled questions and options.
     
+    Each exam draws from its own ``random.Random(seed)`` (seeding it is
+    equivalent to the former ``random.seed(seed)``), so exams can be
+    generated concurrently and still match a serial run.
+    
     Args:
         questions: List of all available questions
         num_questions: Number of questions to include in exam
         seed: Seed for deterministic randomization
-        option_letters: Letters to use for options (default 'ABCD')
+        option_letters: Letters to use for options (default 'A'-'J'; a
+            question with n options uses the first n)
+        duplicate_groups: Group id of each question (e.g. ``DuplicateIndex.groups``);
+            when given, at most one question per group is selected
+        question_ids: Indices of the questions to draw from (e.g. from
+            ``QuestionBank.filter``); defaults to the whole bank
+        quotas: Questions to draw from each category (stratified sampling);
+            any remaining places up to num_questions are drawn from the pool
+        category_index: Question indices per category (see
+            ``build_category_index``), already restricted to question_ids
+            if both are given; built from ``questions`` if omitted
+        rng: Generator to use instead of a new ``random.Random(seed)``
+        balance_answers: Place correct options so every letter is the answer
+            about equally often (see ``core.balancer``)
+        exam_index: 0-based position of the exam in its batch; with
+            balance_answers, spreads leftover letters evenly across exams
         
     Returns:
         Tuple of (exam_questions, answers_dict)
-        - exam_questions: List of questions with shuffled options
+        - exam_questions: List of ExamItem (dict-compatible) with shuffled options
         - answers_dict: Dictionary mapping question_number -> correct_letter
+        
+    Raises:
+        ValueError: If duplicate_groups leaves fewer than num_questions
+            distinct questions, or a category cannot fill its quota
+    """
+    selected, permutation_ids = select_exam(
+        questions, num_questions, seed, option_letters, duplicate_groups, question_ids,
+        quotas, category_index, rng, balance_answers, exam_index
+    )
+    return decode_exam(questions, selected, permutation_ids, option_letters)
+
+
+def select_exam(
+    questions: Sequence[Mapping],
+    num_questions: int,
+    seed: str,
+    option_letters: str = OPTION_LETTERS,
+    duplicate_groups: Optional[Sequence[int]] = None,
+    question_ids: Optional[Sequence[int]] = None,
+    quotas: Optional[Mapping[str, int]] = None,
+    category_index: Optional[Mapping[str, Sequence[int]]] = None,
+    rng: Optional[random.Random] = None,
+    balance_answers: bool = False,
+    exam_index: int = 0
+) -> Tuple[List[int], List[int]]:
+    """Draw one exam as integers only (arguments as in ``generate_exam``).
+    
+    Returns:
+        Tuple of (selected, permutation_ids): bank index of each exam
+        question, and the id of its option order (see
+        ``shuffler.permutation_from_id``); ``decode_exam`` turns them into
+        what ``generate_exam`` returns
     """
-    random.seed(seed)
+    if rng is None:
+        rng = random.Random(seed)
     
-    # Select random questions
-    selected_questions = random.sample(questions, min(num_questions, len(questions)))
+    # Work with question indices so the bank itself is never copied
+    pool = range(len(questions)) if question_ids is None else question_ids
+    k = min(num_questions, len(pool))
+    if quotas is None:
+        selected = _sample_indices(rng, pool, k, duplicate_groups)
+    else:
+        if category_index is None:
+            category_index = build_category_index(questions)
+        selected = _sample_quotas(rng, pool, k, quotas, category_index, duplicate_groups)
+    option_counts = [len(questions[index]['options']) for index in selected]
     
     # Shuffle each question's options
+    if not balance_answers:
+        return selected, [draw_permutation_id(count, rng) for count in option_counts]
+    
+    num_letters = min(len(option_letters), max(option_counts, default=1))
+    targets = answer_targets(len(selected), num_letters, exam_index)
+    positions = balanced_positions(rng, option_counts, targets)
+    permutation_ids = []
+    for index, count, position in zip(selected, option_counts, positions):
+        correct_idx = option_letters.index(questions[index]['answer'])
+        permutation_ids.append(permutation_id(answer_permutation(rng, count, correct_idx, position)))
+    return selected, permutation_ids
+
+
+def decode_exam(
+    questions: Sequence[Mapping],
+    selected: Sequence[int],
+    permutation_ids: Sequence[int],
+    option_letters: str = OPTION_LETTERS
+) -> Tuple[List[ExamItem], Dict[int, str]]:
+    """Build exam items and answers from bank indices and permutation ids.
+    
+    Option texts are taken from the bank, so items share its strings.
+    """
     exam_questions = []
     answers = {}
     
-    for idx, question in enumerate(selected_questions, 1):
-        shuffled_options, new_correct_letter = shuffle_question_options(question, option_letters)
+    for idx, (index, pid) in enumerate(zip(selected, permutation_ids), 1):
+        question = questions[index]
+        options = question['options']
+        permutation, inverse = permutation_from_id(len(options), pid)
+        shuffled_options = [options[original] for original in permutation]
         
-        exam_questions.append({
-            'number': idx,
-            'question': question['question'],
-            'options': shuffled_options,
-            'original_answer': question['answer']
-        })
+        exam_questions.append(ExamItem(idx, question['question'], shuffled_options, question['answer']))
         
-        answers[idx] = new_correct_letter
+        answers[idx] = option_letters[inverse[option_letters.index(question['answer'])]]
     
     return exam_questions, answers
+
+
+def build_category_index(questions: Sequence[Mapping]) -> Dict[str, array]:
+    """Map each category to the indices of its questions (uncategorized ones are skipped)."""
+    index: Dict[str, array] = defaultdict(lambda: array('I'))
+    for position, question in enumerate(questions):
+        category = question.get('category')
+        if category is not None:
+            index[category].append(position)
+    return dict(index)
+
+
+def _sample_indices(
+    rng: random.Random,
+    pool: Sequence[int],
+    k: int,
+    groups: Optional[Sequence[int]] = None,
+    used_groups: Optional[Set[int]] = None,
+    exclude: Optional[Set[int]] = None
+) -> List[int]:
+    """Randomly select k indices from pool using ``rng``.
+    
+    With ``groups``, no two selected indices (nor any index whose group is in
+    ``used_groups``) share a duplicate group; indices in ``exclude`` are
+    never selected. Both sets are updated with the selection.
+    """
+    if groups is None and not exclude:
+        chosen = rng.sample(pool, k)
+        if exclude is not None:
+            exclude.update(chosen)
+        return chosen
+    
+    used_groups = set() if used_groups is None else used_groups
+    exclude = set() if exclude is None else exclude
+    chosen: List[int] = []
+    
+    def take(index: int) -> None:
+        group = groups[index] if groups is not None else None
+        if index in exclude or (group is not None and group in used_groups):
+            return
+        if group is not None:
+            used_groups.add(group)
+        exclude.add(index)
+        chosen.append(index)
+    
+    # Rejection sampling: rejected draws are rare, so few are wasted
+    for _ in range(20 * k):
+        if len(chosen) == k:
+            break
+        take(pool[rng.randrange(len(pool))])
+    
+    if len(chosen) < k:
+        # Pool dominated by rejected questions: walk a full permutation instead
+        order = list(pool)
+        rng.shuffle(order)
+        for index in order:
+            if len(chosen) == k:
+                break
+            take(index)
+    
+    if len(chosen) < k:
+        raise ValueError(
+            f"Solo hay {len(chosen)} preguntas distintas (sin casi duplicados); "
+            f"se pidieron {k}."
+        )
+    
+    return chosen
+
+
+def _sample_quotas(
+    rng: random.Random,
+    pool: Sequence[int],
+    k: int,
+    quotas: Mapping[str, int],
+    category_index: Mapping[str, Sequence[int]],
+    groups: Optional[Sequence[int]] = None
+) -> List[int]:
+    """Stratified selection: each category's quota, then the rest from pool.
+    
+    Only the selected questions are touched, so the cost does not depend on
+    the bank size.
+    """
+    total = sum(quotas.values())
+    if total > k:
+        raise ValueError(f"Las cuotas suman {total} preguntas, pero el examen tiene {k}.")
+    
+    used_groups: Set[int] = set()
+    chosen: Set[int] = set()
+    selected: List[int] = []
+    for category, quota in quotas.items():
+        members = category_index.get(category, ())
+        if len(members) < quota:
+            raise ValueError(
+                f"La categoría '{category}' solo tiene {len(members)} preguntas; "
+                f"se pidieron {quota}."
+            )
+        selected += _sample_indices(rng, members, quota, groups, used_groups, chosen)
+    
+    selected += _sample_indices(rng, pool, k - total, groups, used_groups, chosen)
+    rng.shuffle(selected)  # Do not group the exam by category
+    return selected
@@ -0,0 +1,111 @@
+"""
+Compact integer representation of a run's exams.
+
+An exam is fully described by the bank index of each of its questions and
+the id of each question's option order (``select_exam``). ``ExamMatrix``
+stores those two integer matrices as flat arrays, 8 bytes per exam
+question, and decodes exams into ``ExamItem`` lists only when an exporter
+asks for them. The bank itself is not part of the pickled state, so
+handing rows between processes costs a few bytes per question instead of
+every question and option string.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .exam_generator import decode_exam
+from .question import OPTION_LETTERS, ExamItem
+
+
+class ExamMatrix:
+    """Question-id and permutation-id matrices of consecutive exams.
+    
+    Attributes:
+        questions: Bank the indices refer to (not pickled; see ``bind``)
+        first_exam: Number of the first exam (1-based)
+        width: Questions per exam (fixed by the first row)
+        question_ids: Flat int32 array, ``width`` bank indices per exam
+        permutation_ids: Flat uint32 array, one option-order id per question
+        option_letters: Letters used for options
+    """
+    
+    def __init__(
+        self,
+        questions: Optional[Sequence] = None,
+        first_exam: int = 1,
+        option_letters: str = OPTION_LETTERS
+    ):
+        self.questions = questions
+        self.first_exam = first_exam
+        self.width = 0
+        self.question_ids = array('i')
+        self.permutation_ids = array('I')
+        self.option_letters = option_letters
+    
+    def append(self, selected: Sequence[int], permutation_ids: Sequence[int]) -> None:
+        """Add the next exam (as returned by ``select_exam``)."""
+        if not self.question_ids:
+            self.width = len(selected)
+        elif len(selected) != self.width:
+            raise ValueError(f"Todos los exámenes deben tener {self.width} preguntas.")
+        self.question_ids.extend(selected)
+        self.permutation_ids.extend(permutation_ids)
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        questions: Sequence,
+        question_ids,
+        permutation_ids,
+        first_exam: int = 1,
+        option_letters: str = OPTION_LETTERS
+    ) -> 'ExamMatrix':
+        """Build a matrix from (n_exams, width) NumPy arrays of ids."""
+        matrix = cls(questions, first_exam, option_letters)
+        matrix.width = question_ids.shape[1]
+        # NumPy's 'i'/'I' dtypes are the C ints behind array('i')/array('I')
+        matrix.question_ids.frombytes(question_ids.astype('i').tobytes())
+        matrix.permutation_ids.frombytes(permutation_ids.astype('I').tobytes())
+        return matrix
+    
+    def bind(self, questions: Sequence) -> 'ExamMatrix':
+        """Attach the bank (e.g. after unpickling) and return self."""
+        self.questions = questions
+        return self
+    
+    def __len__(self) -> int:
+        return len(self.question_ids) // self.width if self.width else 0
+    
+    def row(self, position: int) -> Tuple[array, array]:
+        """(question ids, permutation ids) of the exam at ``position`` (0-based)."""
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        start = position * self.width
+        stop = start + self.width
+        return self.question_ids[start:stop], self.permutation_ids[start:stop]
+    
+    def exam(self, position: int) -> Tuple[List[ExamItem], Dict[int, str]]:
+        """Decode the exam at ``position`` like ``generate_exam`` returns it."""
+        selected, permutation_ids = self.row(position)
+        return decode_exam(self.questions, selected, permutation_ids, self.option_letters)
+    
+    def exam_data(self, position: int) -> Dict[str, Any]:
+        """Exam data of the exam at ``position`` for the answer exporters."""
+        exam_questions, exam_answers = self.exam(position)
+        return {
+            'exam_number': self.first_exam + position,
+            'answers': list(exam_answers.values()),
+            'questions': exam_questions
+        }
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self.exam_data(position)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['questions'] = None  # The receiver already has the bank
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
@@ -0,0 +1,148 @@
+"""
+Inverted keyword index for topic-filtered exams.
+
+Every normalized word of a question's stem and options maps to the sorted
+indices of the questions that contain it (compressed sparse row layout:
+one flat postings array plus per-word offsets). Looking up a topic then
+costs time proportional to its matches, not to the bank size.
+"""
+
+import re
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Sequence, Union
+
+from ._numpy import NUMPY_AVAILABLE, np
+from .dedup import normalize_text, question_text
+
+_SEPARATOR = '\x01'  # Joins the questions of a tokenized batch
+_TOKEN_PATTERN = re.compile(r'\w+|\x01')
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _sorted_unique(values):
+    """Sorted distinct values (plain sort; faster than np.unique on large inputs)."""
+    values = np.sort(values)
+    if len(values):
+        keep = np.empty(len(values), dtype=bool)
+        keep[0] = True
+        np.not_equal(values[1:], values[:-1], out=keep[1:])
+        values = values[keep]
+    return values
+
+
+class KeywordIndex:
+    """Inverted index from normalized words to question indices."""
+    
+    def __init__(self, questions: Sequence[Mapping], batch_size: int = 4096):
+        """Build the index.
+        
+        Args:
+            questions: Bank questions
+            batch_size: Questions tokenized per batch
+        """
+        self.size = len(questions)
+        # Word ids in first-seen order, assigned by a C-level default factory
+        vocab: Dict[str, int] = defaultdict()
+        vocab.default_factory = vocab.__len__
+        self._separator_id = vocab[_SEPARATOR]
+        
+        if NUMPY_AVAILABLE:
+            self._build_numpy(questions, vocab, batch_size)
+        else:
+            self._build_python(questions, vocab)
+        self._vocab = dict(vocab)  # Unknown words must not grow the index
+    
+    def _batch_ids(self, questions: Sequence[Mapping], vocab: Dict[str, int]) -> List[int]:
+        glue = f' {_SEPARATOR} '
+        text = normalize_text(glue.join(question_text(q) for q in questions) + glue)
+        return list(map(vocab.__getitem__, _TOKEN_PATTERN.findall(text)))
+    
+    def _build_python(self, questions: Sequence[Mapping], vocab: Dict[str, int]) -> None:
+        occurrences: Dict[int, set] = defaultdict(set)
+        for index, question in enumerate(questions):
+            for word_id in self._batch_ids([question], vocab)[:-1]:
+                occurrences[word_id].add(index)
+        
+        self._postings = array('I')
+        self._offsets = [0]
+        for word_id in range(len(vocab)):
+            self._postings.extend(sorted(occurrences.get(word_id, ())))
+            self._offsets.append(len(self._postings))
+    
+    def _build_numpy(self, questions: Sequence[Mapping], vocab: Dict[str, int], batch_size: int) -> None:
+        keys = []
+        for start in range(0, len(questions), batch_size):
+            flat = np.array(self._batch_ids(questions[start:start + batch_size], vocab), dtype=np.uint64)
+            separators = flat == self._separator_id
+            # Question of each token: separators seen before it, plus the batch start
+            owners = np.cumsum(separators, dtype=np.uint64) - separators + np.uint64(start)
+            words = flat[~separators]
+            keys.append((words << np.uint64(32)) | owners[~separators])
+        
+        # Sorted (word, question) pairs: postings grouped by word, questions ascending
+        pairs = _sorted_unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.uint64)
+        self._postings = (pairs & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+        self._offsets = np.searchsorted(pairs >> np.uint64(32), np.arange(len(vocab) + 1, dtype=np.uint64))
+    
+    def _word_postings(self, word: str):
+        word_id = self._vocab.get(word)
+        if word_id is None:
+            return self._postings[:0]
+        return self._postings[self._offsets[word_id]:self._offsets[word_id + 1]]
+    
+    def lookup(self, term: str) -> array:
+        """Indices of the questions containing every word of ``term``.
+        
+        Matching ignores case and accents ("Protocolo TCP" matches
+        "protocolo tcp/ip").
+        """
+        words = _WORD_PATTERN.findall(normalize_text(term))
+        if not words:
+            return array('I')
+        # Intersect starting from the rarest word
+        postings = sorted((self._word_postings(word) for word in set(words)), key=len)
+        if NUMPY_AVAILABLE:
+            matches = postings[0]
+            for other in postings[1:]:
+                matches = np.intersect1d(matches, other, assume_unique=True)
+            return array('I', matches.astype(np.uint32).tobytes())
+        matches = set(postings[0])
+        for other in postings[1:]:
+            matches.intersection_update(other)
+        return array('I', sorted(matches))
+    
+    def search(self, terms: Union[str, Iterable[str]], match_all: bool = False) -> array:
+        """Indices of the questions matching any (or all) of ``terms``.
+        
+        Args:
+            terms: Topic or topics; each one is matched as in ``lookup``
+            match_all: Require every topic instead of at least one
+        
+        Returns:
+            Sorted question indices
+        """
+        if isinstance(terms, str):
+            terms = [terms]
+        results = [self.lookup(term) for term in terms]
+        if not results:
+            return array('I', range(self.size))
+        
+        if NUMPY_AVAILABLE:
+            combine = np.intersect1d if match_all else np.union1d
+            matches = np.frombuffer(results[0], dtype=np.uint32)
+            for other in results[1:]:
+                matches = combine(matches, np.frombuffer(other, dtype=np.uint32))
+            return array('I', matches.astype(np.uint32).tobytes())
+        
+        matches = set(results[0])
+        for other in results[1:]:
+            if match_all:
+                matches.intersection_update(other)
+            else:
+                matches.update(other)
+        return array('I', sorted(matches))
+    
+    def __len__(self) -> int:
+        """Number of distinct indexed words."""
+        return len(self._vocab) - 1
@@ -0,0 +1,178 @@
+"""
+Compact question and exam item representations.
+
+Both types use ``__slots__`` instead of a per-instance ``__dict__`` and
+implement the read-only ``Mapping`` protocol, so code written against the
+old ``{'question', 'options', 'answer'}`` dictionaries (exporters,
+statistics, validators) keeps working unchanged.
+"""
+
+import hashlib
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Letters for up to 10 options, the most a question may have
+OPTION_LETTERS = 'ABCDEFGHIJ'
+
+
+def intern_options(options: Iterable[str]) -> Tuple[str, ...]:
+    """Return options as a tuple of interned strings.
+    
+    Repeated option texts ("Todas las anteriores", "Verdadero", ...) then
+    share a single string object across the whole bank.
+    """
+    return tuple(sys.intern(option) for option in options)
+
+
+class Question(Mapping):
+    """A bank question with dict-style read access.
+    
+    Attributes:
+        question: Question text
+        options: Tuple of interned option texts
+        answer: Correct option letter, or None if the source had no ANSWER line
+        source: Bank file the question came from (multi-file banks), or None
+        category: Category from the question's CATEGORY line, or None
+    """
+    
+    __slots__ = ('question', 'options', 'answer', 'source', 'category')
+    
+    _OPTIONAL_KEYS = ('answer', 'source', 'category')
+    
+    def __init__(
+        self,
+        question: str,
+        options: Iterable[str],
+        answer: Optional[str] = None,
+        source: Optional[str] = None,
+        category: Optional[str] = None
+    ):
+        self.question = question
+        self.options = intern_options(options)
+        self.answer = answer
+        self.source = sys.intern(source) if source is not None else None
+        self.category = sys.intern(category) if category is not None else None
+    
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Question':
+        """Build a Question from a legacy question dictionary."""
+        return cls(
+            data['question'], data.get('options', ()), data.get('answer'),
+            data.get('source'), data.get('category')
+        )
+    
+    def _present_keys(self) -> Tuple[str, ...]:
+        return ('question', 'options') + tuple(
+            key for key in self._OPTIONAL_KEYS if getattr(self, key) is not None
+        )
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'question' or key == 'options':
+            return getattr(self, key)
+        if key in self._OPTIONAL_KEYS and getattr(self, key) is not None:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._present_keys())
+    
+    def __len__(self) -> int:
+        return len(self._present_keys())
+    
+    def __reduce__(self):
+        # Rebuild through __init__ so option strings are re-interned on unpickle
+        return (self.__class__, (self.question, self.options, self.answer, self.source, self.category))
+    
+    def __repr__(self) -> str:
+        return (
+            f"Question({self.question!r}, {self.options!r}, {self.answer!r}, "
+            f"{self.source!r}, {self.category!r})"
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain dictionary copy (options as a list)."""
+        data = dict(self)
+        data['options'] = list(self.options)
+        return data
+
+
+class ExamItem(Mapping):
+    """A question as it appears in one generated exam.
+    
+    Attributes:
+        number: Position of the question in the exam (1-based)
+        question: Question text (shared with the bank question)
+        options: Shuffled options (the same interned strings as the bank)
+        original_answer: Correct letter in the bank, before shuffling
+    """
+    
+    __slots__ = ('number', 'question', 'options', 'original_answer')
+    
+    _KEYS = ('number', 'question', 'options', 'original_answer')
+    
+    def __init__(self, number: int, question: str, options: Iterable[str], original_answer: str):
+        self.number = number
+        self.question = question
+        self.options = tuple(options)
+        self.original_answer = original_answer
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __reduce__(self):
+        return (self.__class__, (self.number, self.question, self.options, self.original_answer))
+    
+    def __repr__(self) -> str:
+        return f"ExamItem({self.number!r}, {self.question!r}, {self.options!r}, {self.original_answer!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain dictionary copy (options as a list)."""
+        data = dict(self)
+        data['options'] = list(self.options)
+        return data
+
+
+class BankFingerprint:
+    """Incremental SHA-256 of a bank's parsed content, in question order.
+    
+    Covers everything generation reads (text, options, answer, category)
+    and nothing about the file layout, so a ``.txt`` bank and its compiled
+    ``.qbank`` share a fingerprint. Loaders feed it while they parse or
+    compile, so the fingerprint never needs its own pass over the bank.
+    """
+    
+    __slots__ = ('_digest',)
+    
+    def __init__(self):
+        self._digest = hashlib.sha256()
+    
+    def add(self, question: Mapping) -> None:
+        """Add the next question of the bank."""
+        fields = [question['question'], *question['options'], question.get('answer') or '',
+                  question.get('category') or '']
+        self._digest.update(('\x1f'.join(fields) + '\x1e').encode('utf-8'))
+    
+    def digest(self) -> bytes:
+        return self._digest.digest()
+    
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+class QuestionList(list):
+    """List of parsed questions carrying the fingerprint computed while it was built.
+    
+    Attributes:
+        fingerprint: ``BankFingerprint`` hex digest of the questions, or None
+    """
+    
+    fingerprint: Optional[str] = None
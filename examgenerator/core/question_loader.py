@@ -2,30 +2,64 @@
 Core module for question loading and parsing.
 """
 
+import glob
 import os
 import re
-from typing import List, Dict, Any, Union, TextIO
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, TextIO, Iterable, Iterator, Mapping, Optional, Sequence
 import io
 
-def load_questions_from_stream(stream: TextIO) -> List[Dict[str, Union[str, List[str]]]]:
-    """Load questions from a text stream (file-like object) and return parsed question data.
+from .compiled_bank import is_compiled_bank, open_compiled_bank
+from .question import OPTION_LETTERS, BankFingerprint, Question, QuestionList
+
+# Compile regex patterns once for better performance
+OPTION_PATTERN = re.compile(r'^([A-J])[).]\s')
+QUESTION_NUMBER_PATTERN = re.compile(r'^\d+\.\s*')
+CATEGORY_PREFIX = 'CATEGORY:'
+# Letters always read as options, as in the original four-option format
+BASE_OPTION_LETTERS = 'ABCD'
+
+
+def is_option_line(line: str, num_options: int) -> bool:
+    """Tell whether ``line`` is an option of a question with ``num_options`` so far.
+    
+    A-D always mark an option. E-J only do when they are the next expected
+    letter, so question lines such as "E) ..." or "I. ..." still start a
+    new question.
+    """
+    match = OPTION_PATTERN.match(line)
+    if match is None:
+        return False
+    letter = match.group(1)
+    return letter in BASE_OPTION_LETTERS or OPTION_LETTERS.find(letter) == num_options
+
+
+def _make_question(current_question: Dict[str, Any], options: List[str]) -> Question:
+    return Question(
+        current_question['question'], options, current_question.get('answer'),
+        category=current_question.get('category')
+    )
+
+
+def iter_questions_from_stream(stream: TextIO) -> Iterator[Question]:
+    """Parse questions from a text stream, yielding them one at a time.
+    
+    Only the question currently being parsed is kept in memory, so banks of
+    any size can be processed with constant memory.
+    
+    A ``CATEGORY: <name>`` line tags the question being parsed, or the next
+    question of the same block if it appears before the question text.
     
     Args:
         stream: Text stream (file-like object) containing questions
         
-    Returns:
-        List of question dictionaries
-        
-    Raises:
-        ValueError: If format is invalid
+    Yields:
+        Question objects (dict-compatible 'question', 'options', 'answer' view)
     """
-    questions_data: List[Dict[str, Any]] = []
     current_question: Dict[str, Any] = {}
     options: List[str] = []
-    
-    # Compile regex patterns once for better performance
-    option_pattern = re.compile(r'^[A-D][).]\s')
-    question_number_pattern = re.compile(r'^\d+\.\s*')
+    pending_category: Optional[str] = None  # CATEGORY line seen before its question
 
     # Ensure we are at the beginning
     if stream.seekable():
@@ -36,13 +70,13 @@ def load_questions_from_stream(stream: TextIO) -> List[Dict[str, Union[str, List
         
         if not line:  # Empty line - end of question block
             if current_question and options:
-                current_question['options'] = options
-                questions_data.append(current_question)
+                yield _make_question(current_question, options)
                 current_question, options = {}, []
+            pending_category = None
             continue
 
         # Check line type
-        if option_pattern.match(line):  # Option line
+        if is_option_line(line, len(options)):  # Option line
             if 'question' not in current_question:
                 continue # Skip orphan options or raise error? Original raised error.
                 # raise ValueError(f"Opción detectada sin una pregunta previa en línea {line_num}.")
@@ -57,46 +91,218 @@ def load_questions_from_stream(stream: TextIO) -> List[Dict[str, Union[str, List
             except (IndexError, KeyError):
                 pass 
                 # raise ValueError(f"Formato de ANSWER incorrecto en línea {line_num}: '{line_raw.strip()}'")
+        
+        elif line.startswith(CATEGORY_PREFIX):  # Category line
+            category = line[len(CATEGORY_PREFIX):].strip() or None
+            if 'question' in current_question:
+                current_question['category'] = category
+            else:
+                pending_category = category
                 
         else:  # Question line
             # Save previous question if exists
             if current_question and options:
-                current_question['options'] = options
-                questions_data.append(current_question)
+                yield _make_question(current_question, options)
             
             # Clean question text
-            question_text = question_number_pattern.sub('', line)
+            question_text = QUESTION_NUMBER_PATTERN.sub('', line)
             current_question = {'question': question_text}
+            if pending_category is not None:
+                current_question['category'] = pending_category
+                pending_category = None
             options = []
 
     # Don't forget the last question
     if current_question and options:
-        current_question['options'] = options
-        questions_data.append(current_question)
+        yield _make_question(current_question, options)
+
+
+def iter_questions_from_file(filepath: str) -> Iterator[Question]:
+    """Parse questions from a text file, yielding them one at a time.
+    
+    Args:
+        filepath: Path to the questions file
+        
+    Yields:
+        Question objects
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"El archivo '{filepath}' no se encontró.")
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        yield from iter_questions_from_stream(f)
+
+
+def load_questions_from_stream(stream: TextIO) -> List[Question]:
+    """Load questions from a text stream (file-like object) and return parsed question data.
+    
+    Args:
+        stream: Text stream (file-like object) containing questions
+        
+    Returns:
+        List of Question objects
+        
+    Raises:
+        ValueError: If format is invalid
+    """
+    questions_data = list(iter_questions_from_stream(stream))
 
     if not questions_data:
         raise ValueError("No se cargó ninguna pregunta. Verifica el formato del archivo.")
 
     return questions_data
 
-def load_questions_from_file(filepath: str) -> List[Dict[str, Union[str, List[str]]]]:
-    """Load questions from a text file (legacy wrapper)."""
+def load_questions_from_file(filepath: str) -> Sequence[Question]:
+    """Load questions from a text file (legacy wrapper).
+    
+    Compiled ``.qbank`` files are detected by their magic bytes and opened
+    as a memory-mapped ``CompiledBank`` instead of being parsed.
+    """
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"El archivo '{filepath}' no se encontró.")
     
+    if is_compiled_bank(filepath):
+        return open_compiled_bank(filepath)
+    
     with open(filepath, 'r', encoding='utf-8') as f:
         return load_questions_from_stream(f)
 
-def validate_questions(questions: List[Dict]) -> bool:
-    """Validate question structure."""
+def is_multi_file_source(source: str) -> bool:
+    """Check whether a bank source is a directory or a glob pattern."""
+    return os.path.isdir(source) or glob.has_magic(source)
+
+
+def resolve_bank_files(source: str) -> List[str]:
+    """Expand a directory (its ``*.txt`` files) or glob pattern into bank files.
+    
+    Args:
+        source: Directory, glob pattern or single file path
+        
+    Returns:
+        Sorted list of file paths, so merged banks have a stable order
+        
+    Raises:
+        FileNotFoundError: If no file matches
+    """
+    if os.path.isdir(source):
+        files = glob.glob(os.path.join(source, '*.txt'))
+    elif glob.has_magic(source):
+        files = [path for path in glob.glob(source) if os.path.isfile(path)]
+    else:
+        files = [source] if os.path.exists(source) else []
+    
+    if not files:
+        raise FileNotFoundError(f"No se encontraron archivos de preguntas en '{source}'.")
+    
+    return sorted(files)
+
+
+def _load_tagged_file(filepath: str, validate: bool = False) -> List[Question]:
+    """Parse one bank file, tagging each question with its source file."""
+    questions = []
+    for i, question in enumerate(iter_questions_from_file(filepath), 1):
+        if validate:
+            try:
+                validate_question(question, i)
+            except ValueError as e:
+                raise ValueError(f"{filepath}: {e}") from None
+        question.source = filepath
+        questions.append(question)
+    return questions
+
+
+def load_questions_from_directory(
+    source: str,
+    max_workers: Optional[int] = None,
+    validate: bool = False
+) -> List[Question]:
+    """Load and merge every bank file in a directory or glob pattern.
+    
+    Files are parsed in a process pool and merged in sorted file order;
+    each question records the file it came from in ``source``.
+    
+    Args:
+        source: Directory (all ``*.txt`` files) or glob pattern
+        max_workers: Worker processes (default: CPU count, 1 disables the pool)
+        validate: Validate each question while parsing it
+        
+    Returns:
+        Merged QuestionList, with the fingerprint of the merged bank
+        
+    Raises:
+        FileNotFoundError: If no file matches
+        ValueError: If no question could be loaded
+    """
+    files = resolve_bank_files(source)
+    
+    load_file = partial(_load_tagged_file, validate=validate)
+    if len(files) == 1 or max_workers == 1:
+        per_file = [load_file(path) for path in files]
+    else:
+        workers = min(max_workers or os.cpu_count() or 1, len(files))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            per_file = list(executor.map(load_file, files))
+    
+    questions_data = QuestionList()
+    fingerprint = BankFingerprint()
+    for questions in per_file:
+        for question in questions:
+            fingerprint.add(question)
+        questions_data.extend(questions)
+    
+    if not questions_data:
+        raise ValueError("No se cargó ninguna pregunta. Verifica el formato del archivo.")
+    
+    questions_data.fingerprint = fingerprint.hexdigest()
+    return questions_data
+
+
+def validate_question(question: Mapping, number: int) -> None:
+    """Validate the structure of a single question.
+    
+    Args:
+        question: Question to check
+        number: 1-based position, used in error messages
+        
+    Raises:
+        ValueError: If the question is invalid
+    """
+    if 'question' not in question:
+        raise ValueError(f"Pregunta {number} no tiene texto")
+    if 'options' not in question or len(question['options']) < 2:
+        raise ValueError(f"Pregunta {number} debe tener al menos 2 opciones")
+    if len(question['options']) > len(OPTION_LETTERS):
+        raise ValueError(f"Pregunta {number} no puede tener más de {len(OPTION_LETTERS)} opciones")
+    if 'answer' not in question:
+        raise ValueError(f"Pregunta {number} no tiene respuesta")
+    answer = question['answer']
+    if not answer or answer not in OPTION_LETTERS[:len(question['options'])]:
+        raise ValueError(f"Pregunta {number} tiene respuesta inválida: {answer}")
+
+
+def iter_validated_questions(questions: Iterable[Question]) -> Iterator[Question]:
+    """Validate questions as they stream past, yielding each valid one.
+    
+    Lets a single pass over the source both parse and validate the bank.
+    
+    Raises:
+        ValueError: At the first invalid question
+    """
+    for i, question in enumerate(questions, 1):
+        validate_question(question, i)
+        yield question
+
+
+def validate_questions(questions: Iterable[Dict]) -> bool:
+    """Validate question structure.
+    
+    Accepts any iterable, so it can consume ``iter_questions_from_file``
+    directly without materializing the bank.
+    """
     for i, q in enumerate(questions, 1):
-        if 'question' not in q:
-            raise ValueError(f"Pregunta {i} no tiene texto")
-        if 'options' not in q or len(q['options']) < 2:
-            raise ValueError(f"Pregunta {i} debe tener al menos 2 opciones")
-        if 'answer' not in q:
-            raise ValueError(f"Pregunta {i} no tiene respuesta")
-        if q['answer'] not in 'ABCDEFGH':
-            raise ValueError(f"Pregunta {i} tiene respuesta inválida: {q['answer']}")
+        validate_question(q, i)
     
     return True
@@ -0,0 +1,70 @@
+"""
+Per-exam random streams.
+
+Every exam draws from its own ``random.Random``, so exams can be generated
+in any order and on any process. Two seeding modes are supported:
+
+- ``legacy``: the stream is seeded with the string ``f"{prefix}_{number}"``
+  (the original scheme; keeps old runs reproducible).
+- ``spawn``: the stream is spawned from a root seed with NumPy's
+  ``SeedSequence``. Exam ``n`` gets the child ``SeedSequence(root).spawn(...)[n - 1]``,
+  built directly from its spawn key, so any shard of exams is drawn
+  independently of the others with the same result.
+"""
+
+import random
+from typing import Optional
+
+from ._numpy import NUMPY_AVAILABLE, np
+
+SEED_MODES = ('legacy', 'spawn')
+
+
+def new_root_seed() -> int:
+    """Fresh 128-bit root seed from the OS entropy pool."""
+    if not NUMPY_AVAILABLE:
+        raise ImportError("El modo de semillas 'spawn' necesita NumPy: pip install numpy")
+    return int(np.random.SeedSequence().entropy)
+
+
+def exam_seed(exam_prefix: str, exam_number: int, attempt: int = 0) -> str:
+    """Legacy seed string of an exam; redraws append ``#attempt``."""
+    seed = f"{exam_prefix}_{exam_number}"
+    if attempt:
+        seed += f"#{attempt}"
+    return seed
+
+
+def exam_rng(
+    exam_prefix: str,
+    exam_number: int,
+    seed_mode: str = 'legacy',
+    root_seed: Optional[int] = None,
+    attempt: int = 0
+) -> random.Random:
+    """Random stream of exam ``exam_number`` (1-based).
+    
+    Args:
+        exam_prefix: Exam prefix (only used by ``legacy``)
+        exam_number: 1-based exam number
+        seed_mode: 'legacy' or 'spawn'
+        root_seed: Root seed of the run (required by ``spawn``)
+        attempt: Redraw number; each redraw gets its own stream
+    
+    Raises:
+        ValueError: If the mode is unknown or ``spawn`` has no root seed
+        ImportError: If ``spawn`` is used without NumPy
+    """
+    if seed_mode == 'legacy':
+        return random.Random(exam_seed(exam_prefix, exam_number, attempt))
+    if seed_mode != 'spawn':
+        raise ValueError(f"Modo de semillas desconocido: '{seed_mode}' (opciones: {', '.join(SEED_MODES)})")
+    if root_seed is None:
+        raise ValueError("El modo de semillas 'spawn' necesita una semilla raíz.")
+    if not NUMPY_AVAILABLE:
+        raise ImportError("El modo de semillas 'spawn' necesita NumPy: pip install numpy")
+    
+    # Same key SeedSequence.spawn would give the child (and its redraws)
+    spawn_key = (exam_number - 1, attempt) if attempt else (exam_number - 1,)
+    state = np.random.SeedSequence(root_seed, spawn_key=spawn_key).generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), 'little'))
@@ -3,41 +3,149 @@ Shuffling utilities for exam generation.
 """
 
 import random
-from typing import List, Dict, Tuple
+from math import factorial
+from typing import List, Dict, Optional, Sequence, Tuple
 
+from .question import OPTION_LETTERS
 
-def shuffle_exam_questions(questions: List[Dict], seed: str) -> List[Dict]:
+# Largest option count with a precomputed permutation table (6! = 720 rows)
+_TABLE_MAX_OPTIONS = 6
+
+
+def _decode_permutation(n: int, code: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """(permutation, inverse) of range(n) that ``Random.shuffle`` produces
+    when its draws, read as a mixed-radix number (first draw least
+    significant), equal ``code``."""
+    permutation = list(range(n))
+    for i in reversed(range(1, n)):
+        code, j = divmod(code, i + 1)
+        permutation[i], permutation[j] = permutation[j], permutation[i]
+    inverse = [0] * n
+    for position, original in enumerate(permutation):
+        inverse[original] = position
+    return tuple(permutation), tuple(inverse)
+
+
+_PERMUTATION_TABLES = {
+    n: [_decode_permutation(n, code) for code in range(factorial(n))]
+    for n in range(1, _TABLE_MAX_OPTIONS + 1)
+}
+
+
+def shuffle_exam_questions(
+    questions: List[Dict],
+    seed: str,
+    rng: Optional[random.Random] = None
+) -> List[Dict]:
     """Shuffle questions for an exam using a deterministic seed.
     
+    The global ``random`` state is never touched, so concurrent calls are
+    safe and reproducible.
+    
     Args:
         questions: List of question dictionaries
         seed: Seed string for deterministic randomization
+        rng: Generator to use instead of a new ``random.Random(seed)``
         
     Returns:
         Shuffled copy of questions list
     """
-    random.seed(seed)
-    shuffled = questions.copy()
-    random.shuffle(shuffled)
+    if rng is None:
+        rng = random.Random(seed)
+    shuffled = list(questions)
+    rng.shuffle(shuffled)
     return shuffled
 
 
-def shuffle_question_options(question: Dict, option_letters: str = 'ABCD') -> Tuple[List[str], str]:
+def draw_permutation_id(num_options: int, rng: Optional[random.Random] = None) -> int:
+    """Draw a random option order and return its permutation id.
+    
+    Consumes exactly the draws ``rng.shuffle`` would on a list of
+    ``num_options`` items; the id is those draws as a mixed-radix number
+    (below 10! for 10 options, so it fits in 32 bits).
+    """
+    randrange = (rng or random).randrange  # randrange(n) draws like shuffle's randbelow(n)
+    code = 0
+    radix = 1
+    for i in range(num_options - 1, 0, -1):
+        code += randrange(i + 1) * radix
+        radix *= i + 1
+    return code
+
+
+def permutation_from_id(num_options: int, permutation_id: int) -> Tuple[Sequence[int], Sequence[int]]:
+    """(permutation, inverse) for a permutation id (see ``draw_permutation_id``).
+    
+    ``permutation[position]`` is the original index shown at ``position``;
+    ``inverse[original]`` is the position of original option ``original``.
+    Up to 6 options this is a table lookup.
+    """
+    table = _PERMUTATION_TABLES.get(num_options)
+    if table is not None:
+        return table[permutation_id]
+    return _decode_permutation(num_options, permutation_id)
+
+
+def permutation_id(permutation: Sequence[int]) -> int:
+    """Id of an arbitrary permutation: the shuffle draws that produce it."""
+    n = len(permutation)
+    current = list(range(n))
+    position_of = list(range(n))
+    code = 0
+    radix = 1
+    for i in range(n - 1, 0, -1):
+        # The draw at step i brought permutation[i] into position i
+        j = position_of[permutation[i]]
+        code += j * radix
+        radix *= i + 1
+        current[i], current[j] = current[j], current[i]
+        position_of[current[i]], position_of[current[j]] = i, j
+    return code
+
+
+def option_permutation(
+    num_options: int,
+    rng: Optional[random.Random] = None
+) -> Tuple[Sequence[int], Sequence[int]]:
+    """Random order of option indices, and where each original option ends up.
+    
+    Consumes exactly the draws ``rng.shuffle`` would on a list of
+    ``num_options`` items and yields the same order, so exams stay identical
+    to shuffling the option texts directly.
+    
+    Args:
+        num_options: Number of options of the question
+        rng: Per-exam generator; defaults to the global ``random`` module
+        
+    Returns:
+        Tuple of (permutation, inverse), as from ``permutation_from_id``
+    """
+    return permutation_from_id(num_options, draw_permutation_id(num_options, rng))
+
+
+def shuffle_question_options(
+    question: Dict,
+    option_letters: str = OPTION_LETTERS,
+    rng: Optional[random.Random] = None
+) -> Tuple[List[str], str]:
     """Shuffle options for a question and calculate new correct answer letter.
     
+    Options are permuted by index, so repeated option texts are handled
+    correctly and questions may have any number of options up to the
+    number of letters.
+    
     Args:
         question: Question dictionary with 'options' and 'answer' keys
-        option_letters: String of letters to use (default 'ABCD')
+        option_letters: String of letters to use (default 'A'-'J')
+        rng: Per-exam generator; defaults to the global ``random`` module
         
     Returns:
         Tuple of (shuffled_options, new_correct_letter)
     """
-    correct_idx = option_letters.index(question['answer'])
-    correct_answer_text = question['options'][correct_idx]
-    
-    shuffled_options = question['options'].copy()
-    random.shuffle(shuffled_options)
+    options = question['options']
+    permutation, inverse = option_permutation(len(options), rng)
     
-    new_correct_letter = option_letters[shuffled_options.index(correct_answer_text)]
+    shuffled_options = [options[original] for original in permutation]
+    new_correct_letter = option_letters[inverse[option_letters.index(question['answer'])]]
     
     return shuffled_options, new_correct_letter
@@ -2,15 +2,20 @@
 
 from .txt_exporter import create_answers_txt, create_exam_txt
 from .docx_exporter import create_exam_docx
-from .excel_exporter import create_answers_excel
+from .excel_exporter import ExcelAnswerWriter, create_answers_excel
 from .csv_exporter import create_answers_csv
 from .html_exporter import create_answers_html
+from .answer_key import AnswerKey
+from .answer_merge import merge_answer_files
 
 __all__ = [
     'create_answers_txt',
     'create_exam_txt',
     'create_exam_docx',
     'create_answers_excel',
+    'ExcelAnswerWriter',
     'create_answers_csv',
     'create_answers_html',
+    'AnswerKey',
+    'merge_answer_files',
 ]
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Compact answer key accumulated while exams are generated.
+
+Holding every exam's data until the end keeps all their questions alive.
+``AnswerKey`` keeps only the exam numbers and the correct letters (one
+byte each) and reads back as the list of ``{'exam_number', 'answers'}``
+dictionaries the answer exporters expect, so a run can stream its exams
+and still write the consolidated answer file at the end.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Mapping
+
+
+class AnswerKey(Sequence):
+    """Correct letters of every exam of a run, one byte per answer."""
+    
+    def __init__(self, exam_data: Iterable[Mapping[str, Any]] = ()):
+        self._exam_numbers = array('I')
+        self._offsets = array('Q', [0])
+        self._letters = bytearray()
+        for data in exam_data:
+            self.add(data)
+    
+    def add(self, exam_data: Mapping[str, Any]) -> None:
+        """Record one exam (``exam_number`` and ``answers``); the rest is dropped."""
+        self._exam_numbers.append(exam_data['exam_number'])
+        self._letters += ''.join(exam_data['answers']).encode('ascii')
+        self._offsets.append(len(self._letters))
+    
+    def answers(self, position: int) -> str:
+        """Letters of the exam at ``position`` (in the order exams were added)."""
+        return self._letters[self._offsets[position]:self._offsets[position + 1]].decode('ascii')
+    
+    def __len__(self) -> int:
+        return len(self._exam_numbers)
+    
+    def __getitem__(self, position) -> Dict[str, Any]:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return {'exam_number': self._exam_numbers[position], 'answers': list(self.answers(position))}
@@ -0,0 +1,122 @@
+"""
+Merge the consolidated answer files of a sharded run.
+
+Each shard of a run (``generate --shard i/N``) writes its own consolidated
+answer file with the global exam numbers. ``merge_answer_files`` reads
+those CSV or Excel files back and returns one ``AnswerKey`` in exam order,
+ready for ``create_answers_csv`` / ``create_answers_excel``.
+"""
+
+import csv
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .answer_key import AnswerKey
+
+_EXAM_LABEL = "Examen "
+
+
+def _parse_row(cells: Iterable) -> Tuple[int, str]:
+    """(exam number, letters) of an answer row; '-' pads shorter exams."""
+    cells = iter(cells)
+    label = str(next(cells))
+    number = int(label[len(_EXAM_LABEL):])
+    letters = ''.join(str(cell) for cell in cells if cell not in (None, '', '-'))
+    return number, letters
+
+
+def _is_exam_row(row: List) -> bool:
+    return bool(row) and isinstance(row[0], str) and row[0].startswith(_EXAM_LABEL)
+
+
+def read_answers_csv(path: str) -> Iterator[Tuple[int, str]]:
+    """(exam number, letters) of every exam in a ``create_answers_csv`` file."""
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        for row in csv.reader(csvfile):
+            if _is_exam_row(row):
+                yield _parse_row(row)
+
+
+def read_answers_excel(path: str) -> Iterator[Tuple[int, str]]:
+    """(exam number, letters) of every exam in a ``create_answers_excel`` file."""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("Para leer archivos Excel necesitas instalar openpyxl: uv add openpyxl")
+    
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        # Exam rows come first; the information block after them is skipped
+        for row in wb.active.iter_rows(min_row=2, values_only=True):
+            if not _is_exam_row(row):
+                break
+            yield _parse_row(row)
+    finally:
+        wb.close()
+
+
+def read_answers_file(path: str) -> Iterator[Tuple[int, str]]:
+    """Read a consolidated answer file by extension (.csv or .xlsx).
+    
+    Raises:
+        ValueError: If the format is not supported
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return read_answers_csv(path)
+    if extension == '.xlsx':
+        return read_answers_excel(path)
+    raise ValueError(f"Formato de respuestas no soportado: '{path}' (use .csv o .xlsx)")
+
+
+def _number_ranges(numbers: List[int]) -> str:
+    """Compact '1-3, 7' description of sorted exam numbers."""
+    ranges = []
+    for number in numbers:
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ', '.join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def merge_answer_files(paths: Iterable[str], num_exams: Optional[int] = None) -> AnswerKey:
+    """Combine per-shard answer files into one key ordered by exam number.
+    
+    Args:
+        paths: Consolidated answer files (.csv or .xlsx), in any order
+        num_exams: Exams in the whole run; when given, the files must cover
+            exactly exams 1..num_exams
+    
+    Returns:
+        AnswerKey with every exam once, by exam number
+    
+    Raises:
+        ValueError: If an exam number appears in more than one file, or
+            the files do not cover 1..num_exams
+    """
+    entries = []
+    for path in paths:
+        entries.extend(read_answers_file(path))
+    entries.sort()
+    
+    key = AnswerKey()
+    previous = None
+    for number, letters in entries:
+        if number == previous:
+            raise ValueError(f"El examen {number} aparece en más de un archivo.")
+        key.add({'exam_number': number, 'answers': letters})
+        previous = number
+    
+    if num_exams is not None:
+        found = {number for number, _ in entries}
+        missing = [number for number in range(1, num_exams + 1) if number not in found]
+        if missing:
+            raise ValueError(
+                f"Faltan {len(missing)} de {num_exams} exámenes ({_number_ranges(missing)}); "
+                "¿falta algún fragmento?"
+            )
+        extra = sorted(number for number in found if not 1 <= number <= num_exams)
+        if extra:
+            raise ValueError(f"Exámenes fuera del rango 1-{num_exams}: {_number_ranges(extra)}")
+    return key
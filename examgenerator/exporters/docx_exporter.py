@@ -1,12 +1,21 @@
 """
 DOCX exporter for exams.
+
+Templates are compiled once per run (``compile_docx_template``): the
+template is parsed a single time, its content marker is cleared and the
+runs holding placeholders are located up front. Each exam then starts
+from a deep copy of the compiled body instead of re-reading the file.
 """
 
+import copy
 import os
 import random
 import math
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional, Any, TYPE_CHECKING
+from typing import List, Dict, Optional, Any, Tuple, TYPE_CHECKING
+
+from examgenerator.core.question import OPTION_LETTERS
 
 if TYPE_CHECKING:
     from docx import Document as DocumentType
@@ -15,6 +24,7 @@ else:
 
 try:
     from docx import Document
+    from docx.text.run import Run
     from docx.shared import Pt, Inches
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     from docx.enum.style import WD_STYLE_TYPE
@@ -22,6 +32,7 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
     Document = None  # type: ignore
+    Run = None  # type: ignore
     Pt = None  # type: ignore
     Inches = None  # type: ignore
     WD_ALIGN_PARAGRAPH = None  # type: ignore
@@ -81,15 +92,12 @@ def create_docx_document(title: str, template_path: Optional[str] = None) -> Any
     return doc
 
 
-def replace_placeholders(doc: Any, exam_prefix: str, exam_number: int, num_questions: int, minutes_per_question: float = 1.0):
-    """Replace placeholders in the template document.
-    
-    Args:
-        doc: Document object
-        exam_prefix: Exam prefix (e.g., "Parcial")
-        exam_number: Exam number
-        num_questions: Number of questions in exam
-    """
+# Paragraph text that marks where the exam content goes in a template
+CONTENT_MARKERS = ('{{CONTENT}}', '{{QUESTIONS}}', '{{EXAM_CONTENT}}')
+
+
+def placeholder_values(exam_prefix: str, exam_number: int, num_questions: int, minutes_per_question: float = 1.0) -> Dict[str, str]:
+    """Template placeholders and their values for one exam (in replacement order)."""
     from ..core.time_calculator import calculate_exam_time
     
     now = datetime.now()
@@ -105,7 +113,7 @@ def replace_placeholders(doc: Any, exam_prefix: str, exam_number: int, num_quest
     exam_time = calculate_exam_time(num_questions, minutes_per_question)
     exam_time_minutes = int(math.ceil(num_questions * minutes_per_question))
     
-    replacements = {
+    return {
         '{{EXAM_NAME}}': f"{exam_prefix}",
         '{{EXAM_NUMBER}}': str(exam_number),
         '{{EXAM_TITLE}}': f"EXAMEN {exam_prefix} {exam_number}",
@@ -124,6 +132,27 @@ def replace_placeholders(doc: Any, exam_prefix: str, exam_number: int, num_quest
         '{{TIME}}': exam_time,
         '{{DURATION}}': exam_time
     }
+
+
+def _template_paragraphs(doc: Any):
+    """Paragraphs whose placeholders are replaced: body and table cells."""
+    yield from doc.paragraphs
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                yield from cell.paragraphs
+
+
+def replace_placeholders(doc: Any, exam_prefix: str, exam_number: int, num_questions: int, minutes_per_question: float = 1.0):
+    """Replace placeholders in the template document.
+    
+    Args:
+        doc: Document object
+        exam_prefix: Exam prefix (e.g., "Parcial")
+        exam_number: Exam number
+        num_questions: Number of questions in exam
+    """
+    replacements = placeholder_values(exam_prefix, exam_number, num_questions, minutes_per_question)
     
     # Replace in paragraphs
     for paragraph in doc.paragraphs:
@@ -154,10 +183,8 @@ def find_content_insertion_point(doc: Any) -> Optional[int]:
     Returns:
         Paragraph index for insertion, or None if not found
     """
-    content_markers = ['{{CONTENT}}', '{{QUESTIONS}}', '{{EXAM_CONTENT}}']
-    
     for i, paragraph in enumerate(doc.paragraphs):
-        for marker in content_markers:
+        for marker in CONTENT_MARKERS:
             if marker in paragraph.text:
                 # Remove the marker
                 paragraph.text = ""
@@ -167,49 +194,36 @@ def find_content_insertion_point(doc: Any) -> Optional[int]:
     return len(doc.paragraphs) if len(doc.paragraphs) > 0 else 0
 
 
-def create_exam_docx(
+def _element_path(element: Any, root: Any) -> Tuple[int, ...]:
+    """Child indices leading from ``root`` down to ``element``."""
+    path = []
+    while element is not root:
+        parent = element.getparent()
+        path.append(parent.index(element))
+        element = parent
+    return tuple(reversed(path))
+
+
+def _apply_style(paragraph: Any, name: str, style_ids: Dict[str, Optional[str]]) -> bool:
+    """Set a style resolved at compile time; False if the document lacks it."""
+    if name not in style_ids:
+        return False
+    paragraph._p.style = style_ids[name]  # Same as ``paragraph.style = name`` without the lookup
+    return True
+
+
+def _add_exam_content(
+    doc: Any,
     exam_prefix: str,
     exam_number: int,
     selected_questions: List[Dict],
-    output_dir: str,
-    template_path: Optional[str] = None,
-    minutes_per_question: float = 1.0
+    add_title: bool,
+    style_ids: Dict[str, Optional[str]]
 ) -> None:
-    """Save exam as DOCX file.
-    
-    Args:
-        exam_prefix: Exam prefix (e.g., "Parcial", "Final")
-        exam_number: Exam number
-        selected_questions: List of question dictionaries with shuffled options
-        output_dir: Output directory path
-        template_path: Optional path to DOCX template
-        
-    Raises:
-        ImportError: If python-docx is not installed
-    """
-    if not DOCX_AVAILABLE:
-        print("Error: Para exportar a DOCX necesitas instalar python-docx:")
-        print("uv add python-docx")
-        return
-    
-    option_letters = ['A', 'B', 'C', 'D']
-    num_questions = len(selected_questions)
-    
-    # Create exam document
-    exam_doc = create_docx_document(f"EXAMEN {exam_prefix} {exam_number}", template_path)
-    
-    # Replace placeholders in template
-    replace_placeholders(exam_doc, exam_prefix, exam_number, num_questions, minutes_per_question)
-    
-    # Find insertion point for content
-    insertion_point = find_content_insertion_point(exam_doc)
-    
-    # If no template or no insertion point found, add title
-    if not template_path or insertion_point == 0:
-        title_para = exam_doc.add_paragraph(f"EXAMEN {exam_prefix} {exam_number}")
-        try:
-            title_para.style = 'Custom Title'
-        except KeyError:
+    """Append the title (optional) and the questions with their options."""
+    if add_title:
+        title_para = doc.add_paragraph(f"EXAMEN {exam_prefix} {exam_number}")
+        if not _apply_style(title_para, 'Custom Title', style_ids):
             # Style doesn't exist, apply manual formatting
             title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
             for run in title_para.runs:
@@ -222,30 +236,156 @@ def create_exam_docx(
         shuffled_options = q_data["options"]  # Already shuffled in exam_generator
         
         # Add question
-        question_para = exam_doc.add_paragraph(f"{i}. {question_text}")
-        try:
-            question_para.style = 'Question'
-        except KeyError:
+        question_para = doc.add_paragraph(f"{i}. {question_text}")
+        if not _apply_style(question_para, 'Question', style_ids):
             # Style doesn't exist, apply manual formatting
             for run in question_para.runs:
                 run.font.bold = True
                 run.font.size = Pt(11)
         
         # Add options
-        for j, option in enumerate(shuffled_options):
-            option_para = exam_doc.add_paragraph(f"{option_letters[j]}) {option}")
-            try:
-                option_para.style = 'Option'
-            except KeyError:
+        for letter, option in zip(OPTION_LETTERS, shuffled_options):
+            option_para = doc.add_paragraph(f"{letter}) {option}")
+            if not _apply_style(option_para, 'Option', style_ids):
                 # Style doesn't exist, apply manual formatting
                 option_para.paragraph_format.left_indent = Inches(0.5)
                 for run in option_para.runs:
                     run.font.size = Pt(10)
         
         # Add some space after each question
-        exam_doc.add_paragraph()
+        doc.add_paragraph()
+
+
+class CompiledDocxTemplate:
+    """A DOCX template parsed once and reused for every exam of a run.
+    
+    The content marker is cleared, the runs that contain placeholders are
+    located and the exam paragraph styles are resolved when compiling. Each exam swaps a deep copy of the
+    compiled body into the document, replaces the placeholders in those
+    runs only and appends its questions, so the package (styles, headers,
+    media) is never re-read.
+    
+    Attributes:
+        template_path: Template file, or None for the built-in styles
+        add_title: Whether exams get a title paragraph (no template, or
+            content marker in the first paragraph)
+    """
+    
+    def __init__(self, template_path: Optional[str] = None):
+        self.template_path = template_path
+        self._doc = create_docx_document("", template_path)
+        insertion_point = find_content_insertion_point(self._doc)
+        self.add_title = not template_path or insertion_point == 0
+        
+        body = self._doc.element.body
+        runs = {}
+        for paragraph in _template_paragraphs(self._doc):
+            for run in paragraph.runs:
+                if '{{' in run.text and run.element not in runs:
+                    runs[run.element] = _element_path(run.element, body)
+        self._placeholder_runs = list(runs.values())
+        self._body = copy.deepcopy(body)
+        
+        # Style ids of the exam paragraphs (missing ones get manual formatting)
+        self._style_ids: Dict[str, Optional[str]] = {}
+        for name in ('Custom Title', 'Question', 'Option'):
+            try:
+                self._style_ids[name] = self._doc.part.get_style_id(name, WD_STYLE_TYPE.PARAGRAPH)
+            except KeyError:
+                pass
+        self._lock = threading.Lock()  # The document is reused between exams
+    
+    def save_exam(
+        self,
+        filename: str,
+        exam_prefix: str,
+        exam_number: int,
+        selected_questions: List[Dict],
+        minutes_per_question: float = 1.0
+    ) -> None:
+        """Write one exam built from the template to ``filename``."""
+        replacements = placeholder_values(exam_prefix, exam_number, len(selected_questions), minutes_per_question)
+        with self._lock:
+            body = self._doc.element.body
+            body[:] = list(copy.deepcopy(self._body))
+            for path in self._placeholder_runs:
+                element = body
+                for index in path:
+                    element = element[index]
+                run = Run(element, None)
+                for placeholder, replacement in replacements.items():
+                    if placeholder in run.text:
+                        run.text = run.text.replace(placeholder, replacement)
+            
+            _add_exam_content(
+                self._doc, exam_prefix, exam_number, selected_questions, self.add_title, self._style_ids
+            )
+            self._doc.save(filename)
+
+
+# DOCX writers: python-docx, or raw OOXML for exams without a template
+DOCX_BACKENDS = ('python-docx', 'raw')
+
+# Compiled templates by (path, modification time)
+_template_cache: Dict[Tuple[Optional[str], Optional[float]], CompiledDocxTemplate] = {}
+
+
+def compile_docx_template(template_path: Optional[str] = None) -> CompiledDocxTemplate:
+    """Compiled template for ``template_path``, reused while the file is unchanged.
+    
+    Raises:
+        ImportError: If python-docx is not installed
+    """
+    mtime = None
+    if template_path and os.path.exists(template_path):
+        mtime = os.path.getmtime(template_path)
+    key = (template_path, mtime)
+    template = _template_cache.get(key)
+    if template is None:
+        # Only the latest version of each template is kept
+        for stale in [k for k in _template_cache if k[0] == template_path]:
+            del _template_cache[stale]
+        template = _template_cache[key] = CompiledDocxTemplate(template_path)
+    return template
+
+
+def create_exam_docx(
+    exam_prefix: str,
+    exam_number: int,
+    selected_questions: List[Dict],
+    output_dir: str,
+    template_path: Optional[str] = None,
+    minutes_per_question: float = 1.0,
+    backend: str = 'python-docx'
+) -> None:
+    """Save exam as DOCX file.
+    
+    Args:
+        exam_prefix: Exam prefix (e.g., "Parcial", "Final")
+        exam_number: Exam number
+        selected_questions: List of question dictionaries with shuffled options
+        output_dir: Output directory path
+        template_path: Optional path to DOCX template (compiled once and cached)
+        backend: 'python-docx', or 'raw' to write exams without a template
+            straight as OOXML (see ``docx_stream``; same document parts)
+        
+    Raises:
+        ImportError: If python-docx is not installed
+        ValueError: If the backend is unknown
+    """
+    if backend not in DOCX_BACKENDS:
+        raise ValueError(f"Backend DOCX desconocido: '{backend}' (opciones: {', '.join(DOCX_BACKENDS)})")
+    if not DOCX_AVAILABLE:
+        print("Error: Para exportar a DOCX necesitas instalar python-docx:")
+        print("uv add python-docx")
+        return
     
     # Save exam document
     filename = os.path.join(output_dir, f"examen_{exam_prefix}_{exam_number}.docx")
-    exam_doc.save(filename)
+    if backend == 'raw' and not template_path:
+        from .docx_stream import get_docx_skeleton
+        get_docx_skeleton().write_exam(filename, exam_prefix, exam_number, selected_questions)
+    else:
+        template = compile_docx_template(template_path)
+        template.save_exam(filename, exam_prefix, exam_number, selected_questions, minutes_per_question)
     print(f"Examen DOCX creado: {filename}")
@@ -0,0 +1,161 @@
+"""
+Raw OOXML writer for plain (non-templated) DOCX exams.
+
+python-docx builds an object model and resolves styles for every
+paragraph it adds. For exams without a template, everything but the body
+of ``word/document.xml`` is the same in every file, so ``DocxSkeleton``
+builds the styled default document once with python-docx, deflates its
+other parts once and splits ``document.xml`` around the body content.
+Each exam then only renders its paragraphs as XML fragments, streams them
+through a deflate compressor and writes the zip container directly. The
+parts are identical to the ones ``create_exam_docx`` produces.
+"""
+
+import io
+import re
+import struct
+import time
+import zipfile
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from examgenerator.core.question import OPTION_LETTERS
+
+_SENTINEL = 'EXAMGENERATOR_CONTENT'
+
+# Characters lxml refuses in XML text
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+# Text split the way python-docx splits run text: tabs and line breaks
+_RUN_PIECES = re.compile(r'(\t|\r|\n)')
+
+
+def _run_xml(text: str) -> str:
+    """``<w:r>`` element for ``text``, as python-docx's ``Run.text`` writes it."""
+    if _INVALID_XML.search(text):
+        raise ValueError(f"El texto contiene caracteres no válidos en XML: {text!r}")
+    parts = ['<w:r>']
+    for piece in _RUN_PIECES.split(text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        elif piece:
+            preserve = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ''
+            parts.append(f'<w:t{preserve}>{escape(piece)}</w:t>')
+    parts.append('</w:r>')
+    return ''.join(parts)
+
+
+def _paragraph_xml(text: str, style_id: Optional[str] = None) -> str:
+    """``<w:p>`` element with one run of ``text`` and an optional paragraph style."""
+    style = '' if style_id is None else f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+    run = _run_xml(text) if text else ''
+    return f'<w:p>{style}{run}</w:p>' if style or run else '<w:p/>'
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    """(time, date) fields of a zip entry, as ``zipfile`` stores them."""
+    year, month, day, hour, minute, second = time.localtime(timestamp)[:6]
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class DocxSkeleton:
+    """Parts of the default exam document, prepared once per process.
+    
+    Attributes:
+        members: (name, crc32, deflated bytes, size) of every part but
+            ``word/document.xml``, in the original order (None marks where
+            ``document.xml`` goes)
+        head: ``document.xml`` up to the body content
+        tail: ``document.xml`` from the section properties on
+        style_ids: Style ids of 'Custom Title', 'Question' and 'Option'
+    """
+    
+    DOCUMENT_PART = 'word/document.xml'
+    
+    def __init__(self):
+        # The same styled document create_exam_docx starts from
+        from .docx_exporter import create_docx_document
+        from docx.enum.style import WD_STYLE_TYPE
+        
+        doc = create_docx_document("")
+        self.style_ids: Dict[str, Optional[str]] = {
+            name: doc.part.get_style_id(name, WD_STYLE_TYPE.PARAGRAPH)
+            for name in ('Custom Title', 'Question', 'Option')
+        }
+        doc.add_paragraph(_SENTINEL)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        
+        self.members: List[Optional[Tuple[str, int, bytes, int]]] = []
+        with zipfile.ZipFile(buffer) as package:
+            for name in package.namelist():
+                data = package.read(name)
+                if name == self.DOCUMENT_PART:
+                    xml = data.decode('utf-8')
+                    sentinel = _paragraph_xml(_SENTINEL)
+                    self.head, self.tail = xml.split(sentinel)
+                    self.members.append(None)
+                    continue
+                compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+                deflated = compressor.compress(data) + compressor.flush()
+                self.members.append((name, zlib.crc32(data), deflated, len(data)))
+    
+    def fragments(self, exam_prefix: str, exam_number: int, selected_questions: List[Dict]) -> Iterator[str]:
+        """``document.xml`` of one exam, as a stream of XML fragments."""
+        title_id, question_id, option_id = (self.style_ids[name] for name in ('Custom Title', 'Question', 'Option'))
+        yield self.head
+        yield _paragraph_xml(f"EXAMEN {exam_prefix} {exam_number}", title_id)
+        for i, q_data in enumerate(selected_questions, 1):
+            yield _paragraph_xml(f"{i}. {q_data['question']}", question_id)
+            for letter, option in zip(OPTION_LETTERS, q_data['options']):
+                yield _paragraph_xml(f"{letter}) {option}", option_id)
+            yield '<w:p/>'
+        yield self.tail
+    
+    def write_exam(self, filename: str, exam_prefix: str, exam_number: int, selected_questions: List[Dict]) -> None:
+        """Write one plain exam to ``filename``."""
+        # Body first: its size and CRC go in the local header
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        chunks = []
+        crc = size = 0
+        for fragment in self.fragments(exam_prefix, exam_number, selected_questions):
+            data = fragment.encode('utf-8')
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+            chunks.append(compressor.compress(data))
+        chunks.append(compressor.flush())
+        document = (self.DOCUMENT_PART, crc, b''.join(chunks), size)
+        
+        dos_time, dos_date = _dos_datetime(time.time())
+        directory = []
+        with open(filename, 'wb') as f:
+            for member in self.members:
+                name, crc, deflated, size = member if member is not None else document
+                encoded = name.encode('ascii')
+                offset = f.tell()
+                f.write(struct.pack('<4s5H3L2H', b'PK\x03\x04', 20, 0, zipfile.ZIP_DEFLATED,
+                                    dos_time, dos_date, crc, len(deflated), size, len(encoded), 0))
+                f.write(encoded)
+                f.write(deflated)
+                directory.append(struct.pack('<4s6H3L5H2L', b'PK\x01\x02', 20, 20, 0, zipfile.ZIP_DEFLATED,
+                                             dos_time, dos_date, crc, len(deflated), size, len(encoded),
+                                             0, 0, 0, 0, 0o600 << 16, offset) + encoded)
+            start = f.tell()
+            for entry in directory:
+                f.write(entry)
+            f.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(directory), len(directory),
+                                f.tell() - start, start, 0))
+
+
+_skeleton: Optional[DocxSkeleton] = None
+
+
+def get_docx_skeleton() -> DocxSkeleton:
+    """The process-wide ``DocxSkeleton``, built on first use."""
+    global _skeleton
+    if _skeleton is None:
+        _skeleton = DocxSkeleton()
+    return _skeleton
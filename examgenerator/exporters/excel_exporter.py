@@ -1,129 +1,136 @@
 """
 Excel exporter for exam answers.
+
+``ExcelAnswerWriter`` writes the consolidated answer key with openpyxl's
+write-only mode: each exam's row goes to disk as soon as it is added and
+every cell refers to one of a few shared named styles, so memory stays
+flat and no style objects are created per cell, however many exams a run
+makes. ``create_answers_excel`` writes a finished list of exams with it.
 """
 
 import os
 from datetime import datetime
-from typing import List, Dict, Any, cast
-
-
-def create_answers_excel(all_exam_data: List[Dict[str, Any]], exam_prefix: str, output_dir: str, minutes_per_question: float = 1.0) -> None:
-    """Create a single Excel file with all exam answers (transposed layout)."""
-    try:
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils import get_column_letter
-    except ImportError:
-        print("Error: Para exportar a Excel necesitas instalar openpyxl:")
-        print("uv add openpyxl")
-        return
+from typing import Any, Dict, List, Mapping, Optional
 
-    # Import time calculation function
-    from ..core.time_calculator import calculate_exam_time
 
-    # Create workbook and worksheet
-    wb = openpyxl.Workbook()
-    ws = cast(Any, wb.active)  # Type hint para evitar errores de Pylance
-    ws.title = f"Respuestas {exam_prefix}"
-    
-    # Define styles
-    header_font = Font(bold=True, size=12, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    exam_font = Font(bold=True, size=11)
-    exam_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
+class ExcelAnswerWriter:
+    """Consolidated Excel answer key written row by row (transposed layout).
     
-    answer_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    Exams are rows (``add``), questions are columns; the information block
+    goes below the rows when the writer is closed (``close``).
     
-    # Find maximum number of questions across all exams
-    max_questions = max(len(exam_data['answers']) for exam_data in all_exam_data)
+    Raises:
+        ImportError: If openpyxl is not installed
+    """
     
-    # Set up headers (TRANSPOSED: Examen in rows, Questions in columns)
-    headers = ["Examen"]
-    for i in range(1, max_questions + 1):
-        headers.append(f"P{i}")
-    
-    # Write headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = thin_border
-    
-    # Write exam data (TRANSPOSED: each row is an exam)
-    for exam_idx, exam_data in enumerate(all_exam_data):
-        row = exam_idx + 2
+    def __init__(self, exam_prefix: str, output_dir: str, minutes_per_question: float = 1.0,
+                 num_questions: Optional[int] = None):
+        import openpyxl
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+        from openpyxl.styles.fonts import DEFAULT_FONT
         
-        # Exam name
-        cell = ws.cell(row=row, column=1, value=f"Examen {exam_data['exam_number']}")
-        cell.font = exam_font
-        cell.fill = exam_fill
-        cell.alignment = answer_alignment
-        cell.border = thin_border
+        self.exam_prefix = exam_prefix
+        self.filename = os.path.join(output_dir, f"respuestas_{exam_prefix}_completas.xlsx")
+        self.minutes_per_question = minutes_per_question
+        self.num_questions = num_questions  # Columns; taken from the first exam if None
+        self.num_exams = 0
         
-        # Answers for each question
-        for question_idx in range(max_questions):
-            col = question_idx + 2
-            if question_idx < len(exam_data['answers']):
-                answer = exam_data['answers'][question_idx]
-                cell = ws.cell(row=row, column=col, value=answer)
-            else:
-                cell = ws.cell(row=row, column=col, value="-")
-            
-            cell.alignment = answer_alignment
-            cell.border = thin_border
-    
-    # Add exam info at the bottom
-    info_start_row = len(all_exam_data) + 4
+        self._wb = openpyxl.Workbook(write_only=True)
+        self._ws = self._wb.create_sheet(f"Respuestas {exam_prefix}")
+        
+        # Shared styles (header, exam name, answers, information block)
+        header_font = Font(bold=True, size=12, color="FFFFFF")
+        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        exam_font = Font(bold=True, size=11)
+        exam_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
+        centered = Alignment(horizontal="center", vertical="center")
+        thin_side = Side(style='thin')
+        thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+        for style in (
+            NamedStyle('Encabezado', font=header_font, fill=header_fill, alignment=centered, border=thin_border),
+            NamedStyle('Examen', font=exam_font, fill=exam_fill, alignment=centered, border=thin_border),
+            NamedStyle('Respuesta', font=DEFAULT_FONT, alignment=centered, border=thin_border),
+            NamedStyle('Información', font=header_font, fill=header_fill, border=thin_border),
+            NamedStyle('Dato', font=exam_font, border=thin_border),
+            NamedStyle('Valor', font=DEFAULT_FONT, border=thin_border),
+        ):
+            self._wb.add_named_style(style)
     
-    # Exam details header
-    cell = ws.cell(row=info_start_row, column=1, value="Información de Exámenes")
-    cell.font = header_font
-    cell.fill = header_fill
-    cell.border = thin_border
+    def _cell(self, value: Any, style: str) -> Any:
+        from openpyxl.cell import WriteOnlyCell
+        
+        cell = WriteOnlyCell(self._ws, value=value)
+        cell.style = style
+        return cell
     
-    # Merge cells for the header
-    ws.merge_cells(start_row=info_start_row, start_column=1, 
-                  end_row=info_start_row, end_column=len(headers))
+    def _start(self, num_questions: int) -> None:
+        """Column widths and header row (write-only sheets need them first)."""
+        from openpyxl.utils import get_column_letter
+        
+        self.num_questions = num_questions
+        self._ws.column_dimensions['A'].width = 15
+        for col in range(2, num_questions + 2):
+            self._ws.column_dimensions[get_column_letter(col)].width = 8
+        headers = ["Examen"] + [f"P{i}" for i in range(1, num_questions + 1)]
+        self._ws.append([self._cell(header, 'Encabezado') for header in headers])
     
-    # Exam details
-    details = [
-        ("Nombre del examen:", exam_prefix),
-        ("Fecha de generación:", datetime.now().strftime("%d/%m/%Y %H:%M")),
-        ("Número total de exámenes:", str(len(all_exam_data))),
-        ("Preguntas por examen:", str(max_questions)),
-        ("Tiempo estimado:", calculate_exam_time(max_questions, minutes_per_question))
-    ]
+    def add(self, exam_data: Mapping[str, Any]) -> None:
+        """Write the row of one exam (``exam_number`` and ``answers``)."""
+        answers = exam_data['answers']
+        if not self.num_exams:
+            self._start(self.num_questions if self.num_questions is not None else len(answers))
+        if len(answers) > self.num_questions:
+            raise ValueError(f"El examen {exam_data['exam_number']} tiene más de {self.num_questions} preguntas.")
+        
+        row = [self._cell(f"Examen {exam_data['exam_number']}", 'Examen')]
+        row.extend(self._cell(answer, 'Respuesta') for answer in answers)
+        row.extend(self._cell("-", 'Respuesta') for _ in range(self.num_questions - len(answers)))
+        self._ws.append(row)
+        self.num_exams += 1
     
-    for i, (label, value) in enumerate(details):
-        row = info_start_row + i + 1
+    def close(self) -> str:
+        """Write the information block, save the file and return its path."""
+        from openpyxl.utils import get_column_letter
+        from ..core.time_calculator import calculate_exam_time
         
-        # Label
-        cell = ws.cell(row=row, column=1, value=label)
-        cell.font = exam_font
-        cell.border = thin_border
+        if not self.num_exams:
+            self._start(self.num_questions or 0)
         
-        # Value
-        cell = ws.cell(row=row, column=2, value=value)
-        cell.border = thin_border
-    
-    # Auto-adjust column widths
-    for col in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col)
-        if col == 1:
-            ws.column_dimensions[column_letter].width = 15
-        else:
-            ws.column_dimensions[column_letter].width = 8
+        # Add exam info at the bottom, two rows below the exams
+        self._ws.append([])
+        self._ws.append([])
+        info_row = self.num_exams + 4
+        self._ws.append([self._cell("Información de Exámenes", 'Información')])
+        self._ws.merged_cells.add(f"A{info_row}:{get_column_letter(self.num_questions + 1)}{info_row}")
+        
+        details = [
+            ("Nombre del examen:", self.exam_prefix),
+            ("Fecha de generación:", datetime.now().strftime("%d/%m/%Y %H:%M")),
+            ("Número total de exámenes:", str(self.num_exams)),
+            ("Preguntas por examen:", str(self.num_questions)),
+            ("Tiempo estimado:", calculate_exam_time(self.num_questions, self.minutes_per_question))
+        ]
+        for label, value in details:
+            self._ws.append([self._cell(label, 'Dato'), self._cell(value, 'Valor')])
+        
+        self._wb.save(self.filename)
+        return self.filename
+
+
+def create_answers_excel(all_exam_data: List[Dict[str, Any]], exam_prefix: str, output_dir: str, minutes_per_question: float = 1.0) -> None:
+    """Create a single Excel file with all exam answers (transposed layout)."""
+    try:
+        writer = ExcelAnswerWriter(
+            exam_prefix, output_dir, minutes_per_question,
+            num_questions=max(len(exam_data['answers']) for exam_data in all_exam_data)
+        )
+    except ImportError:
+        print("Error: Para exportar a Excel necesitas instalar openpyxl:")
+        print("uv add openpyxl")
+        return
     
-    # Save the workbook
-    excel_filename = os.path.join(output_dir, f"respuestas_{exam_prefix}_completas.xlsx")
-    wb.save(excel_filename)
+    # Rows are written one at a time (all_exam_data may be a compact AnswerKey)
+    for exam_data in all_exam_data:
+        writer.add(exam_data)
+    excel_filename = writer.close()
     print(f"Archivo Excel creado: {excel_filename}")
@@ -4,51 +4,48 @@ TXT exporter for exam answers and exams.
 
 import os
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Sequence
 
 
-def create_answers_txt(all_exam_data: List[Dict], exam_prefix: str, output_dir: str, minutes_per_question: float = 1.0) -> None:
+def create_answers_txt(all_exam_data: Sequence[Dict], exam_prefix: str, output_dir: str, minutes_per_question: float = 1.0) -> None:
     """Create a TXT file with all exam answers (transposed layout)."""
     # Import time calculation function
     from ..core.time_calculator import calculate_exam_time
     
     max_questions = max(len(exam_data['answers']) for exam_data in all_exam_data)
     
-    txt_content = f"RESPUESTAS DE EXÁMENES - {exam_prefix}\n"
-    txt_content += "=" * 50 + "\n\n"
-    
-    # Create header
-    header = "Examen".ljust(12)
-    for i in range(1, max_questions + 1):
-        header += f"P{i}".ljust(4)
-    txt_content += header + "\n"
-    txt_content += "-" * len(header) + "\n"
-    
-    # Add exam data
-    for exam_data in all_exam_data:
-        row = f"Examen {exam_data['exam_number']}".ljust(12)
-        for question_idx in range(max_questions):
-            if question_idx < len(exam_data['answers']):
-                answer = exam_data['answers'][question_idx]
-            else:
-                answer = "-"
-            row += answer.ljust(4)
-        txt_content += row + "\n"
-    
-    # Add exam info
-    txt_content += "\n" + "=" * 50 + "\n"
-    txt_content += "INFORMACIÓN DEL EXAMEN\n"
-    txt_content += "=" * 50 + "\n"
-    txt_content += f"Nombre del examen: {exam_prefix}\n"
-    txt_content += f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-    txt_content += f"Número de exámenes: {len(all_exam_data)}\n"
-    txt_content += f"Preguntas por examen: {max_questions}\n"
-    txt_content += f"Tiempo estimado: {calculate_exam_time(max_questions, minutes_per_question)}\n"
-    
-    # Write TXT file
     txt_filename = os.path.join(output_dir, f"respuestas_{exam_prefix}_completas.txt")
     with open(txt_filename, 'w', encoding='utf-8') as f:
-        f.write(txt_content)
+        f.write(f"RESPUESTAS DE EXÁMENES - {exam_prefix}\n")
+        f.write("=" * 50 + "\n\n")
+        
+        # Create header
+        header = "Examen".ljust(12)
+        for i in range(1, max_questions + 1):
+            header += f"P{i}".ljust(4)
+        f.write(header + "\n")
+        f.write("-" * len(header) + "\n")
+        
+        # Add exam data one row at a time (all_exam_data may be a compact AnswerKey)
+        for exam_data in all_exam_data:
+            row = f"Examen {exam_data['exam_number']}".ljust(12)
+            for question_idx in range(max_questions):
+                if question_idx < len(exam_data['answers']):
+                    answer = exam_data['answers'][question_idx]
+                else:
+                    answer = "-"
+                row += answer.ljust(4)
+            f.write(row + "\n")
+        
+        # Add exam info
+        f.write("\n" + "=" * 50 + "\n")
+        f.write("INFORMACIÓN DEL EXAMEN\n")
+        f.write("=" * 50 + "\n")
+        f.write(f"Nombre del examen: {exam_prefix}\n")
+        f.write(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+        f.write(f"Número de exámenes: {len(all_exam_data)}\n")
+        f.write(f"Preguntas por examen: {max_questions}\n")
+        f.write(f"Tiempo estimado: {calculate_exam_time(max_questions, minutes_per_question)}\n")
     
     print(f"Archivo TXT creado: {txt_filename}")
 
@@ -9,24 +9,26 @@ Exporta a TXT, DOCX, Excel, CSV, HTML.
 
 import os
 import sys
-import random
 from typing import List, Dict, Tuple, Optional
 
 # Import from modular architecture
 from examgenerator.core import (
-    load_questions_from_file,
     validate_questions,
     create_output_directory,
     calculate_exam_time,
-    generate_exam
+    load_bank,
+    new_root_seed,
+    QuestionBank,
 )
+from examgenerator.core.question_loader import is_multi_file_source
+from examgenerator.runner import resolve_workers, iter_exams, prepare_generation, shard_exams
+from examgenerator.regenerate import build_manifest, write_manifest
 from examgenerator.exporters import (
-    create_exam_txt,
-    create_exam_docx,
     create_answers_txt,
-    create_answers_excel,
     create_answers_csv,
-    create_answers_html
+    create_answers_html,
+    AnswerKey,
+    ExcelAnswerWriter
 )
 
 
@@ -46,7 +48,7 @@ def validate_args(args: List[str]) -> Tuple[str, str, int, int, str, Optional[st
     if len(args) < 5:
         print("Uso: python eg.py <archivo_preguntas> <prefijo_examen> <num_examenes> <preguntas_por_examen> [formato] [plantilla] [formato_respuestas] [minutos_por_pregunta]")
         print("\nArgumentos:")
-        print("  archivo_preguntas      : Archivo .txt con las preguntas")
+        print("  archivo_preguntas      : Archivo .txt con las preguntas (o carpeta / patrón glob)")
         print("  prefijo_examen         : Prefijo para los exámenes (ej: Parcial, Final)")
         print("  num_examenes           : Cantidad de exámenes a generar")
         print("  preguntas_por_examen   : Número de preguntas por examen")
@@ -61,7 +63,7 @@ def validate_args(args: List[str]) -> Tuple[str, str, int, int, str, Optional[st
         raise ValueError("Argumentos insuficientes.")
     
     questions_file = args[1]
-    if not os.path.exists(questions_file):
+    if not os.path.exists(questions_file) and not is_multi_file_source(questions_file):
         raise FileNotFoundError(f"El archivo '{questions_file}' no se encontró.")
     
     exam_prefix = args[2]
@@ -123,12 +125,25 @@ def main_generate(
     export_format: str = 'txt',
     template_path: Optional[str] = None,
     answers_format: str = 'xlsx',
-    minutes_per_question: float = 1.0
+    minutes_per_question: float = 1.0,
+    bank: Optional[QuestionBank] = None,
+    topics: Optional[List[str]] = None,
+    match_all_topics: bool = False,
+    quotas: Optional[Dict[str, int]] = None,
+    max_overlap: Optional[int] = None,
+    balance_answers: bool = False,
+    unique_variants: Optional[bool] = None,
+    seed_mode: str = 'legacy',
+    root_seed: Optional[int] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    docx_backend: str = 'python-docx',
+    parallel: Optional[bool] = None,
+    max_workers: Optional[int] = None
 ) -> str:
     """Main generation function (callable from CLI).
     
     Args:
-        questions_file: Path to questions file
+        questions_file: Path to questions file, directory or glob pattern
         exam_prefix: Exam prefix (e.g., "Parcial", "Final")
         num_exams: Number of exams to generate
         num_questions: Questions per exam
@@ -136,6 +151,29 @@ def main_generate(
         template_path: Optional DOCX template path
         answers_format: Answers format ('xlsx', 'csv', 'txt', 'html')
         minutes_per_question: Minutes assigned per question (can be decimal)
+        bank: Already loaded and validated bank; when given, questions_file
+            is not read again
+        topics: Only use questions mentioning one of these topics
+        match_all_topics: Require every topic instead of at least one
+        quotas: Questions per category in every exam (stratified sampling)
+        max_overlap: Maximum questions any two exams may share
+        balance_answers: Spread correct answers evenly over the letters
+        unique_variants: Redraw any exam identical to an earlier one. By
+            default only in 'spawn' mode: 'legacy' keeps reproducing the
+            exams of earlier runs, repeats included
+        seed_mode: 'legacy' (seed string per exam) or 'spawn' (per-exam
+            streams spawned from ``root_seed``)
+        root_seed: Root seed for 'spawn' mode; a fresh one is drawn (and
+            saved in the manifest) when omitted
+        shard: (i, N) to generate only the i-th of N blocks of the run's
+            exams, with the numbering and seeds of the whole run; its
+            answer file is named ``<prefix>_shard<i>de<N>`` for
+            ``merge-answers``
+        docx_backend: 'python-docx', or 'raw' to write exams without a
+            template straight as OOXML
+        parallel: Generate and export exams in a process pool
+            (default: ``performance.parallel_processing``)
+        max_workers: Number of worker processes (default: ``performance.max_workers``)
         
     Returns:
         Output directory path
@@ -155,84 +193,166 @@ def main_generate(
     # Create output directory
     output_dir = create_output_directory(exam_prefix)
     
-    # Load and validate questions
-    questions_data = load_questions_from_file(questions_file)
-    validate_questions(questions_data)
+    # Load and validate questions in a single pass (unless the caller already did)
+    if bank is None:
+        bank = load_bank(questions_file)
+    elif not bank.validated:
+        validate_questions(bank)
+    questions_data = bank
     print(f"Cargadas {len(questions_data)} preguntas del archivo '{questions_file}'.")
     
+    # Restrict the pool to the requested topics
+    question_ids = None
+    available = len(questions_data)
+    if topics:
+        question_ids = bank.filter(topics, match_all=match_all_topics)
+        available = len(question_ids)
+        print(f"Preguntas sobre {', '.join(topics)}: {available}")
+        if not available:
+            raise ValueError("Ninguna pregunta coincide con los temas indicados.")
+    
     # Adjust questions per exam if necessary
-    if num_questions > len(questions_data):
-        print(f"Advertencia: Solo hay {len(questions_data)} preguntas disponibles.")
-        num_questions = len(questions_data)
+    limit = available
+    if num_questions > available:
+        print(f"Advertencia: Solo hay {available} preguntas disponibles.")
+        num_questions = available
+    
+    # Near-duplicate questions (if the bank was indexed) never share an exam
+    if bank.duplicates is not None:
+        distinct = bank.count_distinct(question_ids)
+        limit = min(limit, distinct)
+        if num_questions > distinct:
+            print(f"Advertencia: Solo hay {distinct} preguntas distintas (sin casi duplicados).")
+            num_questions = distinct
+
+    if quotas:
+        # Check the quotas against what the pool holds before raising num_questions
+        category_index = bank.build_category_index()
+        allowed = set(question_ids) if question_ids is not None else None
+        for category, quota in quotas.items():
+            members = category_index.get(category, ())
+            size = len(members) if allowed is None else sum(1 for index in members if index in allowed)
+            if quota > size:
+                raise ValueError(
+                    f"La cuota de la categoría '{category}' ({quota}) supera sus {size} preguntas disponibles."
+                )
+        total = sum(quotas.values())
+        if total > limit:
+            raise ValueError(f"Las cuotas suman {total} preguntas, pero solo hay {limit} disponibles.")
+        if total > num_questions:
+            num_questions = total
+            print(f"Advertencia: Las cuotas suman {num_questions} preguntas por examen.")
+
+    # Category index and overlap-capped assembly (deterministic, so the
+    # manifest is enough to rebuild any exam later)
+    generation_options, assembly = prepare_generation(
+        bank, exam_prefix, num_exams, num_questions,
+        question_ids=question_ids, quotas=quotas,
+        max_overlap=max_overlap, balance_answers=balance_answers
+    )
+    if quotas:
+        category_index = generation_options['category_index']
+        for category, quota in quotas.items():
+            print(f"Categoría '{category}': {quota} de {len(category_index.get(category, ()))} preguntas")
+    if assembly is not None:
+        print(f"Máximo de preguntas compartidas entre dos exámenes: {assembly.achieved_overlap}")
+        if not assembly.cap_met:
+            print(f"Advertencia: No se pudo respetar el límite de {max_overlap} preguntas compartidas; "
+                  f"el mejor resultado es {assembly.achieved_overlap}.")
+
+    if unique_variants is None:
+        unique_variants = seed_mode != 'legacy'
+    if seed_mode == 'spawn' and root_seed is None:
+        if shard is not None:
+            raise ValueError("Para generar por fragmentos en modo spawn indique la semilla raíz.")
+        root_seed = new_root_seed()
+    if seed_mode == 'spawn':
+        print(f"Semilla raíz: {root_seed}")
 
     # Calculate and show exam time
     exam_time = calculate_exam_time(num_questions, minutes_per_question)
     print(f"Tiempo estimado por examen: {exam_time} (minutos por pregunta: {minutes_per_question})")
 
-    # Store all exam data for answer files
-    all_exam_data = []
+    exam_numbers = range(1, num_exams + 1)
+    answers_prefix = exam_prefix
+    if shard is not None:
+        exam_numbers = shard_exams(num_exams, *shard)
+        answers_prefix = f"{exam_prefix}_shard{shard[0]}de{shard[1]}"
+        print(f"Fragmento {shard[0]}/{shard[1]}: exámenes {exam_numbers.start} a {exam_numbers.stop - 1}")
 
-    # Generate exams
-    for i in range(1, num_exams + 1):
-        # Set deterministic random seed for consistent shuffling
-        seed = f"{exam_prefix}_{i}"
-        
-        # Generate exam
-        exam_questions, exam_answers = generate_exam(
-            questions_data,
-            num_questions,
-            seed
-        )
-        
-        # Store exam data for consolidated answer file
-        all_exam_data.append({
-            'exam_number': i,
-            'answers': list(exam_answers.values()),
-            'questions': exam_questions
-        })
-        
-        # Create exam content for TXT export
-        exam_content = f"--- EXAMEN {exam_prefix} {i} ---\n\n"
-        option_letters = ['A', 'B', 'C', 'D']
-        
-        for q in exam_questions:
-            exam_content += f"{q['number']}. {q['question']}\n"
-            for j, option in enumerate(q['options']):
-                exam_content += f"   {option_letters[j]}) {option}\n"
-            exam_content += "\n"
-        
-        # Export based on selected format
-        if export_format in ['txt', 'both']:
-            create_exam_txt(exam_content, exam_prefix, i, output_dir)
-            
-            # Individual answers file
-            answers_content = f"--- RESPUESTAS EXAMEN {exam_prefix} {i} ---\n\n"
-            for q_num, answer in exam_answers.items():
-                answers_content += f"{q_num}. {answer})\n"
-            
-            answers_file_path = os.path.join(output_dir, f"respuestas_examen_{exam_prefix}_{i}.txt")
-            with open(answers_file_path, 'w', encoding='utf-8') as f:
-                f.write(answers_content)
-        
-        if export_format in ['docx', 'both']:
-            create_exam_docx(
-                exam_prefix,
-                i,
-                exam_questions,
-                output_dir,
-                template_path,
-                minutes_per_question,
-            )
+    # Generate and export exams (in parallel when configured); only their
+    # answers are kept, so memory stays flat however many exams are made
+    workers = min(resolve_workers(parallel, max_workers), max(len(exam_numbers), 1))
+    if workers > 1:
+        print(f"Generando exámenes en paralelo con {workers} procesos.")
+
+    # The Excel key is written row by row as exams arrive
+    excel_writer = None
+    if answers_format == 'xlsx' and exam_numbers:
+        try:
+            excel_writer = ExcelAnswerWriter(answers_prefix, output_dir, minutes_per_question)
+        except ImportError:
+            print("Error: Para exportar a Excel necesitas instalar openpyxl:")
+            print("uv add openpyxl")
+
+    answer_key = AnswerKey()
+    for exam_data in iter_exams(
+        questions_data,
+        exam_prefix,
+        num_exams,
+        num_questions,
+        output_dir,
+        export_format=export_format,
+        template_path=template_path,
+        minutes_per_question=minutes_per_question,
+        generation_options=generation_options,
+        exam_question_ids=assembly.exams if assembly is not None else None,
+        unique_variants=unique_variants,
+        seed_mode=seed_mode,
+        root_seed=root_seed,
+        exam_numbers=exam_numbers,
+        docx_backend=docx_backend,
+        parallel=workers > 1,
+        max_workers=workers
+    ):
+        answer_key.add(exam_data)
+        if excel_writer is not None:
+            excel_writer.add(exam_data)
 
     # Create consolidated answer file in selected format
-    if answers_format == 'xlsx':
-        create_answers_excel(all_exam_data, exam_prefix, output_dir, minutes_per_question)
+    if not answer_key:
+        print("Advertencia: Este fragmento no contiene exámenes.")
+    elif answers_format == 'xlsx':
+        if excel_writer is not None:
+            print(f"Archivo Excel creado: {excel_writer.close()}")
     elif answers_format == 'csv':
-        create_answers_csv(all_exam_data, exam_prefix, output_dir)
+        create_answers_csv(answer_key, answers_prefix, output_dir)
     elif answers_format == 'html':
-        create_answers_html(all_exam_data, exam_prefix, output_dir, minutes_per_question)
+        create_answers_html(answer_key, answers_prefix, output_dir, minutes_per_question)
     elif answers_format == 'txt':
-        create_answers_txt(all_exam_data, exam_prefix, output_dir, minutes_per_question)
+        create_answers_txt(answer_key, answers_prefix, output_dir, minutes_per_question)
+
+    # Everything needed to rebuild any exam later (examgen regenerate)
+    write_manifest(output_dir, build_manifest(
+        bank,
+        exam_prefix=exam_prefix,
+        num_exams=num_exams,
+        num_questions=num_questions,
+        topics=list(topics) if topics else None,
+        match_all_topics=match_all_topics,
+        quotas=quotas,
+        max_overlap=max_overlap,
+        balance_answers=balance_answers,
+        unique_variants=unique_variants,
+        seed_mode=seed_mode,
+        root_seed=root_seed,
+        shard=list(shard) if shard is not None else None,
+        export_format=export_format,
+        template_path=template_path,
+        minutes_per_question=minutes_per_question,
+        answer_files=True,
+        docx_backend=docx_backend
+    ))
 
     format_msg = {
         'txt': 'TXT',
@@ -241,7 +361,7 @@ def main_generate(
     }
     
     template_msg = f" usando plantilla '{template_path}'" if template_path else ""
-    print(f"Generados {num_exams} exámenes ({exam_prefix}) con {num_questions} preguntas cada uno en formato {format_msg[export_format]}{template_msg}.")
+    print(f"Generados {len(exam_numbers)} exámenes ({exam_prefix}) con {num_questions} preguntas cada uno en formato {format_msg[export_format]}{template_msg}.")
     print(f"Archivos guardados en la carpeta: {output_dir}")
     print(f"Archivo de respuestas creado en formato: {answers_format.upper()}")
     
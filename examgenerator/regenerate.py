@@ -0,0 +1,190 @@
+"""
+Rebuild exams of a past run from its manifest instead of archiving them.
+
+Every exam is a deterministic function of the bank and the run settings
+(its seed string or spawned stream), so ``main_generate`` writes a small
+``manifest.json`` next to the exams with a fingerprint of the bank and
+those settings. ``regenerate_exam`` checks the fingerprint and rebuilds a
+single exam, or only its answer key, in the time it takes to load the bank
+and generate one exam; the generated files can then be deleted.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from examgenerator.core import QuestionBank
+from examgenerator.core.question import BankFingerprint
+from examgenerator.runner import build_exam, format_answers_txt, generate_and_export_exam, make_job, prepare_generation
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Settings that decide which exams a run produces
+_GENERATION_KEYS = (
+    'exam_prefix', 'num_exams', 'num_questions', 'topics', 'match_all_topics',
+    'quotas', 'max_overlap', 'balance_answers', 'unique_variants', 'seed_mode', 'root_seed',
+    'shard', 'dedupe_threshold',
+)
+
+
+def bank_fingerprint(questions: Sequence[Mapping]) -> str:
+    """SHA-256 of the bank's parsed content, in order (see ``BankFingerprint``).
+    
+    Banks loaded by ``load_bank`` already carry it, computed while they were
+    parsed or stored in the compiled ``.qbank``; other sequences are hashed
+    here.
+    """
+    known = getattr(questions, 'fingerprint', None)
+    if known is not None:
+        return known
+    fingerprint = BankFingerprint()
+    for question in questions:
+        fingerprint.add(question)
+    return fingerprint.hexdigest()
+
+
+def build_manifest(bank: QuestionBank, **settings: Any) -> Dict[str, Any]:
+    """Manifest of a run: bank fingerprint plus generation and export settings.
+    
+    Args:
+        bank: Bank the run used
+        **settings: exam_prefix, num_exams, num_questions (final, after any
+            adjustment), topics, match_all_topics, quotas, max_overlap,
+            balance_answers, unique_variants, seed_mode, root_seed, shard,
+            export_format, template_path, minutes_per_question, answer_files,
+            docx_backend
+    """
+    duplicates = bank.duplicates
+    generation = {key: settings.get(key) for key in _GENERATION_KEYS}
+    generation['dedupe_threshold'] = duplicates.threshold if duplicates is not None else None
+    return {
+        'version': MANIFEST_VERSION,
+        'bank': {
+            'sha256': bank_fingerprint(bank),
+            'questions': len(bank),
+            'source': bank.source,
+        },
+        'generation': generation,
+        'export': {
+            'export_format': settings.get('export_format', 'txt'),
+            'template_path': settings.get('template_path'),
+            'minutes_per_question': settings.get('minutes_per_question', 1.0),
+            'answer_files': settings.get('answer_files', True),
+            'docx_backend': settings.get('docx_backend', 'python-docx'),
+        },
+    }
+
+
+def write_manifest(output_dir: str, manifest: Mapping[str, Any]) -> str:
+    """Write ``manifest.json`` into ``output_dir`` and return its path."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a manifest file, or the ``manifest.json`` of an output directory.
+    
+    Raises:
+        FileNotFoundError: If there is no manifest
+        ValueError: If the manifest version is not supported
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No se encontró el manifiesto '{path}'.")
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Versión de manifiesto no soportada: {manifest.get('version')}")
+    return manifest
+
+
+def _prepare_job(
+    manifest: Mapping[str, Any],
+    bank: QuestionBank,
+    output_dir: str,
+    export_format: Optional[str] = None
+) -> Dict[str, Any]:
+    expected = manifest['bank']['sha256']
+    if len(bank) != manifest['bank']['questions'] or bank_fingerprint(bank) != expected:
+        raise ValueError(
+            "El banco de preguntas no coincide con el del manifiesto "
+            f"(se esperaba SHA-256 {expected[:12]}…)."
+        )
+    
+    generation = manifest['generation']
+    if generation['dedupe_threshold'] is not None:
+        bank.find_duplicates(generation['dedupe_threshold'])
+    question_ids = None
+    if generation['topics']:
+        question_ids = bank.filter(generation['topics'], match_all=generation['match_all_topics'])
+    
+    generation_options, assembly = prepare_generation(
+        bank, generation['exam_prefix'], generation['num_exams'], generation['num_questions'],
+        question_ids=question_ids, quotas=generation['quotas'],
+        max_overlap=generation['max_overlap'], balance_answers=generation['balance_answers']
+    )
+    export = manifest['export']
+    return make_job(
+        bank,
+        generation['exam_prefix'],
+        generation['num_questions'],
+        output_dir,
+        export_format=export_format or export['export_format'],
+        template_path=export['template_path'],
+        minutes_per_question=export['minutes_per_question'],
+        answer_files=export['answer_files'],
+        generation_options=generation_options,
+        exam_question_ids=assembly.exams if assembly is not None else None,
+        unique_variants=bool(generation.get('unique_variants')),
+        seed_mode=generation.get('seed_mode') or 'legacy',
+        root_seed=generation.get('root_seed'),
+        docx_backend=export.get('docx_backend', 'python-docx'),
+    )
+
+
+def regenerate_exam(
+    manifest: Mapping[str, Any],
+    bank: QuestionBank,
+    exam_number: int,
+    output_dir: Optional[str] = None,
+    answers_only: bool = False,
+    export_format: Optional[str] = None
+) -> Tuple[List[Any], Dict[int, str]]:
+    """Rebuild exam ``exam_number`` of the run described by ``manifest``.
+    
+    Args:
+        manifest: Manifest of the run (see ``load_manifest``)
+        bank: The run's bank; its fingerprint must match the manifest
+        exam_number: 1-based exam number
+        output_dir: Where to write the rebuilt files; None writes nothing
+        answers_only: Write only the exam's TXT answer key
+        export_format: Override the run's 'txt', 'docx' or 'both'
+    
+    Returns:
+        Tuple of (exam_questions, answers_dict), identical to the original run
+    
+    Raises:
+        ValueError: If the bank does not match or exam_number is out of range
+    """
+    num_exams = manifest['generation']['num_exams']
+    if not 1 <= exam_number <= num_exams:
+        raise ValueError(f"El examen {exam_number} no existe; la generación tenía {num_exams} exámenes.")
+    
+    job = _prepare_job(manifest, bank, output_dir or '', export_format)
+    if output_dir is None or answers_only:
+        exam_questions, exam_answers = build_exam(job, exam_number)
+        if output_dir is not None:
+            prefix = job['exam_prefix']
+            path = os.path.join(output_dir, f"respuestas_examen_{prefix}_{exam_number}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(format_answers_txt(prefix, exam_number, exam_answers))
+        return exam_questions, exam_answers
+    
+    exam_data = generate_and_export_exam(job, exam_number)
+    letters = {number: letter for number, letter in enumerate(exam_data['answers'], 1)}
+    return exam_data['questions'], letters
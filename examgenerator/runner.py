@@ -0,0 +1,459 @@
+"""
+Per-exam generation and export, serially or across a process pool.
+
+``iter_exams`` is the shared loop behind ``legacy.main_generate`` and the
+web interface. Each exam is generated from its own seed and written to
+disk independently, so exam indices can be distributed over worker
+processes (``performance.parallel_processing`` / ``performance.max_workers``)
+and the files are identical to a serial run.
+
+Exams are yielded in order as they are written and only a bounded window
+of them is in flight, so callers that reduce them as they arrive (e.g.
+into an ``AnswerKey``) run in flat memory however many exams they make.
+"""
+
+import hashlib
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from examgenerator.core import AssemblyResult, QuestionBank, assemble_exams
+from examgenerator.core.exam_generator import decode_exam, select_exam
+from examgenerator.core.exam_matrix import ExamMatrix
+from examgenerator.core.question import OPTION_LETTERS
+from examgenerator.core.seeding import exam_rng, exam_seed
+from examgenerator.exporters import create_exam_txt, create_exam_docx
+
+# Settings shared by every exam of a run; set once per worker process
+_worker_job: Optional[Dict[str, Any]] = None
+
+# Most exams handed to a worker at once (bounds the rows held in flight)
+_MAX_CHUNK = 64
+
+# Redraws allowed for an exam that repeats an earlier variant
+_MAX_REDRAWS = 100
+
+
+def format_exam_txt(exam_prefix: str, exam_number: int, exam_questions: Sequence[Mapping]) -> str:
+    """Plain-text body of one exam."""
+    exam_content = f"--- EXAMEN {exam_prefix} {exam_number} ---\n\n"
+    
+    for q in exam_questions:
+        exam_content += f"{q['number']}. {q['question']}\n"
+        # Each question gets as many letters as it has options
+        for letter, option in zip(OPTION_LETTERS, q['options']):
+            exam_content += f"   {letter}) {option}\n"
+        exam_content += "\n"
+    
+    return exam_content
+
+
+def format_answers_txt(exam_prefix: str, exam_number: int, exam_answers: Mapping[int, str]) -> str:
+    """Plain-text answer key of one exam."""
+    answers_content = f"--- RESPUESTAS EXAMEN {exam_prefix} {exam_number} ---\n\n"
+    for q_num, answer in exam_answers.items():
+        answers_content += f"{q_num}. {answer})\n"
+    return answers_content
+
+
+def build_exam_row(job: Mapping[str, Any], exam_number: int, attempt: int = 0) -> Tuple[List[int], List[int]]:
+    """Draw exam ``exam_number`` of a run as bank indices and permutation ids.
+    
+    Args:
+        job: Run settings (see ``make_job``)
+        exam_number: 1-based exam index; seeds its stream (see ``exam_rng``)
+        attempt: Redraw number; each redraw uses its own stream
+    
+    Returns:
+        Tuple of (selected, permutation_ids), as from ``select_exam``
+    """
+    generation_options = job['generation_options']
+    if job.get('exam_question_ids') is not None:
+        # Preassembled selection: the exam seed only orders questions and options
+        generation_options = {
+            'question_ids': job['exam_question_ids'][exam_number - 1],
+            'balance_answers': generation_options.get('balance_answers', False),
+        }
+    if generation_options.get('balance_answers'):
+        generation_options = dict(generation_options, exam_index=exam_number - 1)
+    
+    prefix = job['exam_prefix']
+    rng = exam_rng(prefix, exam_number, job.get('seed_mode', 'legacy'), job.get('root_seed'), attempt)
+    return select_exam(
+        job['questions'], job['num_questions'], exam_seed(prefix, exam_number, attempt),
+        rng=rng, **generation_options
+    )
+
+
+def _variant_key(selected: Sequence[int], permutation_ids: Sequence[int]) -> bytes:
+    """16-byte digest identifying an exam variant (selection, order and options)."""
+    return hashlib.blake2b(
+        array('i', selected).tobytes() + array('I', permutation_ids).tobytes(), digest_size=16
+    ).digest()
+
+
+def iter_unique_rows(job: Mapping[str, Any], num_exams: int) -> Iterator[Tuple[List[int], List[int]]]:
+    """Rows of exams 1..num_exams with no two identical variants.
+    
+    Each variant's digest goes into a set; an exam that repeats an earlier
+    one is redrawn with its next ``attempt`` stream, so the result is still
+    deterministic. Costs one hash and one set lookup per exam.
+    
+    Raises:
+        ValueError: If the bank cannot provide enough distinct variants
+    """
+    seen = set()
+    for exam_number in range(1, num_exams + 1):
+        for attempt in range(_MAX_REDRAWS + 1):
+            row = build_exam_row(job, exam_number, attempt)
+            key = _variant_key(*row)
+            if key not in seen:
+                break
+        else:
+            raise ValueError(
+                f"No hay suficientes variantes distintas para {num_exams} exámenes "
+                f"(repetido el examen {exam_number})."
+            )
+        seen.add(key)
+        yield row
+
+
+def build_exam(job: Mapping[str, Any], exam_number: int) -> Tuple[List[Any], Dict[int, str]]:
+    """Generate exam ``exam_number`` of a run without writing anything.
+    
+    Returns:
+        Tuple of (exam_questions, answers_dict), as from ``generate_exam``
+    """
+    if job.get('unique_variants'):
+        # Earlier exams decide whether this one was redrawn
+        for row in islice(iter_unique_rows(job, exam_number), exam_number - 1, None):
+            return decode_exam(job['questions'], *row)
+    return decode_exam(job['questions'], *build_exam_row(job, exam_number))
+
+
+def export_exam(
+    job: Mapping[str, Any],
+    exam_number: int,
+    exam_questions: Sequence[Mapping],
+    exam_answers: Mapping[int, str]
+) -> None:
+    """Write the files of one generated exam."""
+    exam_prefix = job['exam_prefix']
+    output_dir = job['output_dir']
+    
+    if job['export_format'] in ['txt', 'both']:
+        create_exam_txt(format_exam_txt(exam_prefix, exam_number, exam_questions),
+                        exam_prefix, exam_number, output_dir)
+        
+        if job['answer_files']:
+            # Individual answers file
+            answers_content = format_answers_txt(exam_prefix, exam_number, exam_answers)
+            answers_file_path = os.path.join(output_dir, f"respuestas_examen_{exam_prefix}_{exam_number}.txt")
+            with open(answers_file_path, 'w', encoding='utf-8') as f:
+                f.write(answers_content)
+    
+    if job['export_format'] in ['docx', 'both']:
+        create_exam_docx(
+            exam_prefix,
+            exam_number,
+            exam_questions,
+            output_dir,
+            job['template_path'],
+            job['minutes_per_question'],
+            job.get('docx_backend', 'python-docx'),
+        )
+
+
+def generate_and_export_exam(job: Mapping[str, Any], exam_number: int) -> Dict[str, Any]:
+    """Generate exam ``exam_number`` of a run and write its files.
+    
+    Args:
+        job: Run settings (see ``make_job``)
+        exam_number: 1-based exam index. Its random stream comes from
+            ``job['seed_mode']`` (see ``exam_rng``): ``legacy`` seeds it with
+            ``f"{prefix}_{number}"``; ``spawn`` takes child ``number - 1`` of
+            ``SeedSequence(job['root_seed'])``. Redraws of repeated variants
+            use the next stream of the same exam.
+    
+    Returns:
+        Exam data for the consolidated answer exporters
+    """
+    exam_questions, exam_answers = build_exam(job, exam_number)
+    export_exam(job, exam_number, exam_questions, exam_answers)
+    
+    return {
+        'exam_number': exam_number,
+        'answers': list(exam_answers.values()),
+        'questions': exam_questions
+    }
+
+
+def prepare_generation(
+    bank: QuestionBank,
+    exam_prefix: str,
+    num_exams: int,
+    num_questions: int,
+    question_ids: Optional[Sequence[int]] = None,
+    quotas: Optional[Mapping[str, int]] = None,
+    max_overlap: Optional[int] = None,
+    balance_answers: bool = False
+) -> Tuple[Dict[str, Any], Optional[AssemblyResult]]:
+    """Build the ``generate_exam`` options of a run from its settings.
+    
+    Deterministic for a given bank and settings, so a run can be rebuilt
+    from its manifest (see ``examgenerator.regenerate``).
+    
+    Args:
+        bank: Validated bank (with its duplicate index, if deduplicating)
+        exam_prefix: Exam prefix (also the assembly seed)
+        num_exams: Number of exams
+        num_questions: Final questions per exam
+        question_ids: Topic-filtered pool, or None for the whole bank
+        quotas: Questions per category in every exam
+        max_overlap: Maximum questions any two exams may share
+        balance_answers: Spread correct answers evenly over the letters
+    
+    Returns:
+        Tuple of (generation_options, assembly); assembly is None unless
+        max_overlap is set, and then its ``exams`` are the per-exam selections
+    
+    Raises:
+        ValueError: If max_overlap is combined with quotas
+    """
+    # Per-category index for stratified sampling, restricted to the topic filter
+    category_index = None
+    if quotas:
+        category_index = bank.build_category_index()
+        if question_ids is not None:
+            allowed = set(question_ids)
+            category_index = {
+                category: [index for index in members if index in allowed]
+                for category, members in category_index.items()
+            }
+    
+    # Assemble all exams up front so no two share more than max_overlap questions
+    assembly = None
+    if max_overlap is not None:
+        if quotas:
+            raise ValueError("El límite de preguntas compartidas no se puede combinar con cuotas por categoría.")
+        assembly = assemble_exams(
+            num_exams, num_questions, max_overlap, exam_prefix, len(bank),
+            question_ids=question_ids, duplicate_groups=bank.duplicate_groups
+        )
+    
+    generation_options = {
+        'duplicate_groups': bank.duplicate_groups,
+        'question_ids': question_ids,
+        'quotas': quotas,
+        'category_index': category_index,
+        'balance_answers': balance_answers,
+    }
+    return generation_options, assembly
+
+
+def _init_worker(job: Dict[str, Any]) -> None:
+    global _worker_job
+    _worker_job = job
+
+
+def _run_in_worker(exam_numbers: range, rows: Optional[ExamMatrix] = None) -> ExamMatrix:
+    # Export here and send back only the integer rows; the parent decodes
+    # them against its own copy of the bank. Rows drawn by the parent
+    # (unique variants) arrive with the chunk.
+    if rows is None:
+        matrix = ExamMatrix(_worker_job['questions'], first_exam=exam_numbers.start)
+        for number in exam_numbers:
+            matrix.append(*build_exam_row(_worker_job, number))
+    else:
+        matrix = rows.bind(_worker_job['questions'])
+    for position, number in enumerate(exam_numbers):
+        export_exam(_worker_job, number, *matrix.exam(position))
+    return matrix
+
+
+def shard_exams(num_exams: int, shard: int, num_shards: int) -> range:
+    """Exam numbers of shard ``shard`` (1-based) out of ``num_shards``.
+    
+    Shards are contiguous, near-equal blocks of 1..num_exams, so exam
+    numbers (and therefore seeds) are the same as in an unsharded run.
+    
+    Raises:
+        ValueError: If the shard does not exist
+    """
+    if not 1 <= shard <= num_shards:
+        raise ValueError(f"Fragmento {shard}/{num_shards} inválido.")
+    start = (shard - 1) * num_exams // num_shards
+    stop = shard * num_exams // num_shards
+    return range(start + 1, stop + 1)
+
+
+def resolve_workers(parallel: Optional[bool] = None, max_workers: Optional[int] = None) -> int:
+    """Number of worker processes to use (1 means serial).
+    
+    Unset arguments fall back to ``performance.parallel_processing`` and
+    ``performance.max_workers`` from the configuration.
+    """
+    from examgenerator.config import config
+    
+    if parallel is None:
+        parallel = config.get('performance.parallel_processing', False)
+    if not parallel:
+        return 1
+    if max_workers is None:
+        max_workers = config.get('performance.max_workers') or os.cpu_count() or 1
+    return max(1, int(max_workers))
+
+
+def make_job(
+    questions: Sequence[Mapping],
+    exam_prefix: str,
+    num_questions: int,
+    output_dir: str,
+    export_format: str = 'txt',
+    template_path: Optional[str] = None,
+    minutes_per_question: float = 1.0,
+    answer_files: bool = True,
+    generation_options: Optional[Dict[str, Any]] = None,
+    exam_question_ids: Optional[Sequence[Sequence[int]]] = None,
+    unique_variants: bool = False,
+    seed_mode: str = 'legacy',
+    root_seed: Optional[int] = None,
+    docx_backend: str = 'python-docx'
+) -> Dict[str, Any]:
+    """Settings shared by every exam of a run (arguments as in ``iter_exams``)."""
+    if isinstance(questions, QuestionBank):
+        questions = questions.questions  # Workers only need the questions, not the indexes
+    return {
+        'questions': questions,
+        'exam_prefix': exam_prefix,
+        'num_questions': num_questions,
+        'output_dir': output_dir,
+        'export_format': export_format,
+        'template_path': template_path,
+        'minutes_per_question': minutes_per_question,
+        'answer_files': answer_files,
+        'generation_options': generation_options or {},
+        'exam_question_ids': exam_question_ids,
+        'unique_variants': unique_variants,
+        'seed_mode': seed_mode,
+        'root_seed': root_seed,
+        'docx_backend': docx_backend,
+    }
+
+
+def iter_exams(
+    questions: Sequence[Mapping],
+    exam_prefix: str,
+    num_exams: int,
+    num_questions: int,
+    output_dir: str,
+    export_format: str = 'txt',
+    template_path: Optional[str] = None,
+    minutes_per_question: float = 1.0,
+    answer_files: bool = True,
+    generation_options: Optional[Dict[str, Any]] = None,
+    exam_question_ids: Optional[Sequence[Sequence[int]]] = None,
+    unique_variants: bool = False,
+    seed_mode: str = 'legacy',
+    root_seed: Optional[int] = None,
+    exam_numbers: Optional[range] = None,
+    docx_backend: str = 'python-docx',
+    parallel: Optional[bool] = None,
+    max_workers: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Generate and export exams 1..num_exams (or a shard of them), yielding each one's data.
+    
+    Args:
+        questions: Validated bank
+        exam_prefix: Exam prefix (also the seed prefix)
+        num_exams: Number of exams
+        num_questions: Questions per exam
+        output_dir: Directory for the exam files
+        export_format: 'txt', 'docx' or 'both'
+        template_path: Optional DOCX template
+        minutes_per_question: Minutes per question shown in DOCX exams
+        answer_files: Also write one TXT answers file per exam
+        generation_options: Extra ``generate_exam`` keyword arguments
+            (duplicate_groups, question_ids, quotas, category_index,
+            balance_answers); ``exam_index`` is filled in per exam
+        exam_question_ids: Bank indices of each exam's questions, e.g. from
+            ``assemble_exams``; replaces ``generation_options``
+        unique_variants: Redraw any exam identical to an earlier one
+            (see ``iter_unique_rows``)
+        seed_mode: 'legacy' (string seed per exam) or 'spawn' (streams
+            spawned from ``root_seed``; see ``exam_rng``)
+        root_seed: Root seed of the run in 'spawn' mode
+        exam_numbers: Only these exams of the run (e.g. ``shard_exams``);
+            numbering and seeds stay those of the whole run
+        docx_backend: 'python-docx' or 'raw' (see ``create_exam_docx``)
+        parallel: Use a process pool (default: ``performance.parallel_processing``)
+        max_workers: Pool size (default: ``performance.max_workers``)
+    
+    Yields:
+        Exam data per exam, in exam order, once its files are written
+    """
+    job = make_job(
+        questions, exam_prefix, num_questions, output_dir, export_format, template_path,
+        minutes_per_question, answer_files, generation_options, exam_question_ids, unique_variants,
+        seed_mode, root_seed, docx_backend
+    )
+    # Unique variants depend on every earlier exam, so they are drawn here in
+    # order (integers only) and workers just decode and export them
+    if exam_numbers is None:
+        exam_numbers = range(1, num_exams + 1)
+    rows = None
+    if unique_variants:
+        # A shard replays the (cheap) draws of the exams before it
+        rows = islice(iter_unique_rows(job, exam_numbers.stop - 1), exam_numbers.start - 1, None)
+    
+    workers = min(resolve_workers(parallel, max_workers), len(exam_numbers))
+    if workers <= 1:
+        for exam_number in exam_numbers:
+            if rows is None:
+                yield generate_and_export_exam(job, exam_number)
+                continue
+            exam_questions, exam_answers = decode_exam(job['questions'], *next(rows))
+            export_exam(job, exam_number, exam_questions, exam_answers)
+            yield {
+                'exam_number': exam_number,
+                'answers': list(exam_answers.values()),
+                'questions': exam_questions
+            }
+        return
+    
+    # The bank is sent once per worker; exams are handed out in small chunks,
+    # at most a few chunks per worker ahead of the consumer
+    chunksize = max(1, min(len(exam_numbers) // (workers * 4), _MAX_CHUNK))
+    chunks = (range(start, min(start + chunksize, exam_numbers.stop))
+              for start in range(exam_numbers.start, exam_numbers.stop, chunksize))
+    
+    def submit(pool, chunk):
+        chunk_rows = None
+        if rows is not None:
+            chunk_rows = ExamMatrix(first_exam=chunk.start)
+            for row in islice(rows, len(chunk)):
+                chunk_rows.append(*row)
+        return pool.submit(_run_in_worker, chunk, chunk_rows)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job,)) as pool:
+        pending = deque(submit(pool, chunk) for chunk in islice(chunks, workers * 2))
+        while pending:
+            matrix = pending.popleft().result().bind(job['questions'])
+            for chunk in islice(chunks, 1):
+                pending.append(submit(pool, chunk))
+            yield from matrix
+
+
+def run_exams(*args, **kwargs) -> List[Dict[str, Any]]:
+    """Generate and export exams 1..num_exams and return all their data.
+    
+    Takes the same arguments as ``iter_exams``. Memory grows with the
+    number of exams; large runs should consume ``iter_exams`` instead.
+    
+    Returns:
+        Exam data per exam, in exam order
+    """
+    return list(iter_exams(*args, **kwargs))
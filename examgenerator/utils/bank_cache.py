@@ -0,0 +1,200 @@
+"""
+Caché de bancos de preguntas ya parseados.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from ..core.incremental_loader import IncrementalBankLoader
+from ..utils.logging_config import get_logger
+
+logger = get_logger('bank_cache')
+
+# Incrementar cuando cambie el resultado del parser para invalidar el caché en disco
+PARSER_VERSION = 5
+
+
+class ParsedBankCache:
+    """Caché de dos niveles (memoria LRU + disco) indexado por SHA-256.
+    
+    Con el parser por defecto cada banco se valida mientras se parsea, así
+    que solo se almacenan bancos válidos. Los bancos devueltos se comparten
+    entre llamadas y deben tratarse como de solo lectura.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = ".cache",
+        max_entries: int = 8,
+        parser: Optional[Callable[[bytes], List[Dict[str, Any]]]] = None
+    ):
+        """
+        Inicializa el caché.
+        
+        Args:
+            cache_dir: Directorio para el nivel en disco (None lo desactiva)
+            max_entries: Número máximo de bancos en memoria
+            parser: Función que convierte los bytes del banco en preguntas
+                (por defecto, un parser incremental que valida y solo
+                re-parsea los bloques modificados respecto a bancos anteriores)
+        """
+        self.max_entries = max_entries
+        self.parser = parser or IncrementalBankLoader(validate=True).parse_bytes
+        self.cache_dir = Path(cache_dir) / "banks" if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._memory: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key_for(raw: bytes) -> str:
+        """
+        Calcula la clave del banco.
+        
+        Args:
+            raw: Contenido en bruto del archivo
+        
+        Returns:
+            Hash SHA256 del contenido
+        """
+        return hashlib.sha256(raw).hexdigest()
+    
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        return self.cache_dir / f"{key}.v{PARSER_VERSION}.pickle"
+    
+    def _remember(self, key: str, questions: List[Dict[str, Any]]):
+        self._memory[key] = questions
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _read_disk(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Error leyendo banco cacheado: {e}")
+            return None
+    
+    def _write_disk(self, key: str, questions: List[Dict[str, Any]]):
+        path = self._disk_path(key)
+        if path is None:
+            return
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(questions, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error guardando banco en caché: {e}")
+    
+    def get_or_parse(self, raw: bytes) -> List[Dict[str, Any]]:
+        """
+        Devuelve el banco parseado, parseándolo solo si no está en caché.
+        
+        Args:
+            raw: Contenido en bruto del archivo de preguntas
+        
+        Returns:
+            Lista de preguntas
+        """
+        key = self.key_for(raw)
+        
+        with self._lock:
+            questions = self._memory.get(key)
+            if questions is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                logger.debug(f"Banco en memoria: {key[:12]}")
+                return questions
+        
+        questions = self._read_disk(key)
+        if questions is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._remember(key, questions)
+            logger.info(f"⚡ Usando banco parseado desde disco: {key[:12]}")
+            return questions
+        
+        questions = self.parser(raw)
+        with self._lock:
+            self.misses += 1
+            self._remember(key, questions)
+        self._write_disk(key, questions)
+        logger.debug(f"Banco parseado y cacheado: {key[:12]}")
+        return questions
+    
+    def load_file(self, filepath: str) -> List[Dict[str, Any]]:
+        """
+        Carga un archivo de preguntas a través del caché.
+        
+        Args:
+            filepath: Ruta al archivo de preguntas
+        
+        Returns:
+            Lista de preguntas
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"El archivo '{filepath}' no se encontró.")
+        with open(filepath, 'rb') as f:
+            return self.get_or_parse(f.read())
+    
+    def clear(self):
+        """Vacía ambos niveles del caché."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for cache_file in self.cache_dir.glob("*.pickle"):
+                cache_file.unlink()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas del caché.
+        
+        Returns:
+            Diccionario con aciertos, fallos y entradas
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(list(self.cache_dir.glob("*.pickle"))) if self.cache_dir else 0,
+                'cache_dir': str(self.cache_dir.absolute()) if self.cache_dir else None
+            }
+
+
+_bank_cache: Optional[ParsedBankCache] = None
+
+
+def get_bank_cache() -> ParsedBankCache:
+    """
+    Obtiene la instancia compartida del caché de bancos.
+    
+    El nivel en disco solo se activa con ``performance.cache_enabled``.
+    
+    Returns:
+        Instancia de ParsedBankCache
+    """
+    global _bank_cache
+    if _bank_cache is None:
+        from ..config import config
+        cache_dir = config.get('performance.cache_dir', '.cache') if config.get('performance.cache_enabled', False) else None
+        _bank_cache = ParsedBankCache(cache_dir=cache_dir)
+    return _bank_cache
@@ -2,82 +2,114 @@
 Generador de estadísticas para exámenes.
 """
 
-from typing import List, Dict, Any
+from typing import Dict, Any, Iterable
 from collections import Counter
 from ..utils.logging_config import get_logger
 
 logger = get_logger('statistics')
 
 
-def generate_exam_statistics(all_exam_data: List[Dict]) -> Dict[str, Any]:
+class StatisticsAccumulator:
     """
-    Genera estadísticas detalladas sobre los exámenes generados.
-    
-    Args:
-        all_exam_data: Lista de datos de todos los exámenes
+    Acumula estadísticas examen a examen, sin guardar los exámenes.
     
-    Returns:
-        Diccionario con estadísticas
+    La memoria depende del número de preguntas distintas y de letras, no
+    del número de exámenes, así que sirve para generaciones muy grandes.
     """
-    if not all_exam_data:
-        return {}
-    
-    stats = {
-        'total_exams': len(all_exam_data),
-        'total_questions': 0,
-        'answer_distribution': {},
-        'question_reuse': Counter(),
-        'warnings': []
-    }
-    
-    # Contar respuestas y uso de preguntas
-    all_answers = []
-    for exam in all_exam_data:
+    
+    def __init__(self):
+        self.total_exams = 0
+        self.total_questions = 0
+        self.answer_counts: Counter = Counter()
+        self.question_reuse: Counter = Counter()
+    
+    def add(self, exam: Dict) -> None:
+        """
+        Incorpora los datos de un examen.
+        
+        Args:
+            exam: Datos del examen ('answers' y opcionalmente 'questions')
+        """
         answers = exam.get('answers', [])
-        stats['total_questions'] += len(answers)
-        all_answers.extend(answers)
+        self.total_exams += 1
+        self.total_questions += len(answers)
+        self.answer_counts.update(answers)
         
         # Contar reutilización de preguntas
         for question in exam.get('questions', []):
             q_text = question.get('question', '')[:50]  # Primeros 50 caracteres como ID
-            stats['question_reuse'][q_text] += 1
-    
-    # Calcular distribución de respuestas
-    answer_counts = Counter(all_answers)
-    total_answers = len(all_answers)
-    
-    if total_answers > 0:
-        for letter in sorted(answer_counts.keys()):
-            count = answer_counts[letter]
-            percentage = (count / total_answers) * 100
-            stats['answer_distribution'][letter] = {
-                'count': count,
-                'percentage': round(percentage, 2)
-            }
+            self.question_reuse[q_text] += 1
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas acumuladas.
         
-        # Detectar desbalance
-        percentages = [d['percentage'] for d in stats['answer_distribution'].values()]
-        if percentages:
-            min_pct, max_pct = min(percentages), max(percentages)
-            if min_pct < 15 or max_pct > 35:
-                stats['warnings'].append(
-                    "Distribución de respuestas desbalanceada. "
-                    f"Rango: {min_pct:.1f}% - {max_pct:.1f}%"
-                )
-    
-    # Analizar reutilización
-    reuse_values = list(stats['question_reuse'].values())
-    if reuse_values:
-        max_reuse = max(reuse_values)
-        avg_reuse = sum(reuse_values) / len(reuse_values)
-        stats['question_reuse_stats'] = {
-            'max_times_used': max_reuse,
-            'avg_times_used': round(avg_reuse, 2),
-            'unique_questions': len(stats['question_reuse'])
+        Returns:
+            Diccionario con estadísticas (vacío si no hubo exámenes)
+        """
+        if not self.total_exams:
+            return {}
+        
+        stats = {
+            'total_exams': self.total_exams,
+            'total_questions': self.total_questions,
+            'answer_distribution': {},
+            'question_reuse': Counter(self.question_reuse),
+            'warnings': []
         }
+        
+        # Calcular distribución de respuestas
+        answer_counts = self.answer_counts
+        total_answers = sum(answer_counts.values())
+        
+        if total_answers > 0:
+            for letter in sorted(answer_counts.keys()):
+                count = answer_counts[letter]
+                percentage = (count / total_answers) * 100
+                stats['answer_distribution'][letter] = {
+                    'count': count,
+                    'percentage': round(percentage, 2)
+                }
+            
+            # Detectar desbalance
+            percentages = [d['percentage'] for d in stats['answer_distribution'].values()]
+            if percentages:
+                min_pct, max_pct = min(percentages), max(percentages)
+                if min_pct < 15 or max_pct > 35:
+                    stats['warnings'].append(
+                        "Distribución de respuestas desbalanceada. "
+                        f"Rango: {min_pct:.1f}% - {max_pct:.1f}%"
+                    )
+        
+        # Analizar reutilización
+        reuse_values = list(stats['question_reuse'].values())
+        if reuse_values:
+            max_reuse = max(reuse_values)
+            avg_reuse = sum(reuse_values) / len(reuse_values)
+            stats['question_reuse_stats'] = {
+                'max_times_used': max_reuse,
+                'avg_times_used': round(avg_reuse, 2),
+                'unique_questions': len(stats['question_reuse'])
+            }
+        
+        logger.debug(f"Estadísticas generadas para {stats['total_exams']} exámenes")
+        return stats
+
+
+def generate_exam_statistics(all_exam_data: Iterable[Dict]) -> Dict[str, Any]:
+    """
+    Genera estadísticas detalladas sobre los exámenes generados.
     
-    logger.debug(f"Estadísticas generadas para {stats['total_exams']} exámenes")
-    return stats
+    Args:
+        all_exam_data: Datos de todos los exámenes (lista o iterador)
+    
+    Returns:
+        Diccionario con estadísticas
+    """
+    accumulator = StatisticsAccumulator()
+    for exam in all_exam_data:
+        accumulator.add(exam)
+    return accumulator.result()
 
 
 def print_statistics(stats: Dict[str, Any]):
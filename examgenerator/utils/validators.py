@@ -121,7 +121,7 @@ def validate_question_data(question: Dict) -> bool:
         raise ValidationError("La pregunta no puede estar vacía")
     
     # Validar opciones
-    if not isinstance(question['options'], list):
+    if not isinstance(question['options'], (list, tuple)):
         raise ValidationError("Las opciones deben ser una lista")
     
     if len(question['options']) < 2:
@@ -156,18 +156,25 @@ def validate_questions_file(file_path: str) -> Path:
     """
     path = validate_file_exists(file_path)
     
-    # Leer contenido
+    # Leer línea a línea y parar en el primer 'ANSWER:' (no carga el archivo entero)
+    has_content = False
+    has_answer = False
     try:
         with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            for line in f:
+                if not has_content and line.strip():
+                    has_content = True
+                if 'ANSWER:' in line:
+                    has_answer = True
+                    break
     except UnicodeDecodeError:
         raise ValidationError("El archivo debe estar codificado en UTF-8")
     
-    if not content.strip():
+    if not has_content:
         raise ValidationError("El archivo de preguntas está vacío")
     
     # Validar que tenga al menos una pregunta
-    if 'ANSWER:' not in content:
+    if not has_answer:
         raise ValidationError(
             "El archivo no parece contener preguntas con el formato esperado. "
             "Debe incluir 'ANSWER:' para cada pregunta"
@@ -22,7 +22,8 @@ from examgenerator.utils.validators import (
     validate_file_extension, validate_file_size, ValidationError
 )
 from examgenerator.utils.cache import QuestionCache
-from examgenerator.utils.statistics import generate_exam_statistics, print_statistics
+from examgenerator.utils.bank_cache import get_bank_cache
+from examgenerator.utils.statistics import StatisticsAccumulator, print_statistics
 from examgenerator.utils.settings import (
     get_settings, save_settings, 
     get_gemini_api_key, set_gemini_api_key,
@@ -31,11 +32,11 @@ from examgenerator.utils.settings import (
 from examgenerator.config import config as app_config
 
 # Import modular functions
-from examgenerator.core.question_loader import load_questions_from_file, validate_questions
-from examgenerator.core.exam_generator import generate_exam
-from examgenerator.exporters.txt_exporter import create_exam_txt, create_answers_txt
+from examgenerator.core.bank import load_bank_from_bytes
+from examgenerator.exporters.txt_exporter import create_answers_txt
 from examgenerator.exporters.excel_exporter import create_answers_excel
-from examgenerator.exporters.docx_exporter import create_exam_docx
+from examgenerator.exporters.answer_key import AnswerKey
+from examgenerator.runner import iter_exams
 
 logger = get_logger('web')
 
@@ -74,6 +75,7 @@ setup_logging(verbose=False, log_file='webapp.log')
 
 # Inicializar caché
 cache = QuestionCache()
+bank_cache = get_bank_cache()
 
 
 @app.route('/health')
@@ -117,10 +119,8 @@ def generate_exams():
             flash('Solo se permiten archivos .txt', 'error')
             return redirect(url_for('generate_exams'))
 
-        # Leer archivo en memoria
-        # Flask FileStorage stream está en memoria o temp file, pero es seekable
-        import io
-        stream = io.TextIOWrapper(file.stream._file, encoding='utf-8') if hasattr(file.stream, '_file') else io.TextIOWrapper(file.stream, encoding='utf-8')
+        # Leer archivo en memoria (el contenido en bruto es la clave del caché de bancos)
+        raw_questions = file.stream.read()
         
         # Obtener parámetros
         exam_prefix = request.form.get('exam_prefix', 'Examen')
@@ -153,9 +153,8 @@ def generate_exams():
                 template_file.save(t_path)
                 template_path = t_path
         
-        # Cargar preguntas usando API modular desde stream
-        from examgenerator.core.question_loader import load_questions_from_stream
-        questions_data = load_questions_from_stream(stream)
+        # Cargar y validar en una sola pasada (el caché de bancos evita re-parsear el mismo archivo)
+        questions_data = load_bank_from_bytes(raw_questions, source=filename)
         
         # Crear directorio de salida
         output_dir = Path(app.config['OUTPUT_FOLDER']) / f"Examenes_{exam_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -163,56 +162,29 @@ def generate_exams():
         
         # Generar exámenes
         try:
-            all_exam_data = []
-            
-            for i in range(1, num_exams + 1):
-                # Set deterministic random seed
-                seed = f"{exam_prefix}_{i}"
-                
-                # Generate exam using modular API
-                exam_questions, exam_answers = generate_exam(
-                    questions_data,
-                    questions_per_exam,
-                    seed
-                )
-                
-                all_exam_data.append({
-                    'exam_number': i,
-                    'questions': exam_questions,
-                    'answers': list(exam_answers.values())
-                })
-                
-                # Guardar archivos TXT
-                if export_format in ['txt', 'both']:
-                    # Create exam content
-                    exam_content = f"--- EXAMEN {exam_prefix} {i} ---\n\n"
-                    option_letters = ['A', 'B', 'C', 'D']
-                    
-                    for q in exam_questions:
-                        exam_content += f"{q['number']}. {q['question']}\n"
-                        for j, option in enumerate(q['options']):
-                            exam_content += f"   {option_letters[j]}) {option}\n"
-                        exam_content += "\n"
-                    
-                    # Save exam file using exporter
-                    create_exam_txt(exam_content, exam_prefix, i, str(output_dir))
-                
-                # Guardar archivos DOCX
-                if export_format in ['docx', 'both']:
-                    create_exam_docx(
-                        exam_prefix, 
-                        i, 
-                        exam_questions, 
-                        str(output_dir),
-                        str(template_path) if template_path else None,
-                        minutes_per_question
-                    )
+            # Generar y exportar cada examen (en paralelo si performance.parallel_processing),
+            # acumulando respuestas y estadísticas sin guardar los exámenes
+            answer_key = AnswerKey()
+            statistics = StatisticsAccumulator()
+            for exam_data in iter_exams(
+                questions_data,
+                exam_prefix,
+                num_exams,
+                questions_per_exam,
+                str(output_dir),
+                export_format=export_format,
+                template_path=str(template_path) if template_path else None,
+                minutes_per_question=minutes_per_question,
+                answer_files=False
+            ):
+                answer_key.add(exam_data)
+                statistics.add(exam_data)
             
             # Generar archivo de respuestas usando exporter
-            create_answers_excel(all_exam_data, exam_prefix, str(output_dir), minutes_per_question)
+            create_answers_excel(answer_key, exam_prefix, str(output_dir), minutes_per_question)
             
             # Generar estadísticas
-            stats = generate_exam_statistics(all_exam_data)
+            stats = statistics.result()
             
             # Incrementar contador persistente
             try:
@@ -377,8 +349,9 @@ def generate_questions():
 
 @app.route('/cache/stats')
 def cache_stats():
-    """Estadísticas del caché."""
+    """Estadísticas del caché; las de los bancos parseados van en 'parsed_banks'."""
     stats = cache.stats()
+    stats['parsed_banks'] = bank_cache.stats()
     return jsonify(stats)
 
 
@@ -426,6 +399,7 @@ def clear_cache():
     """Limpiar caché."""
     older_than_days = request.form.get('older_than_days', type=int)
     cache.clear(older_than_days)
+    bank_cache.clear()
     flash('Caché limpiado correctamente', 'success')
     return redirect(url_for('index'))
 
@@ -0,0 +1,73 @@
+"""
+Tests básicos para el ensamblado de exámenes con límite de preguntas compartidas.
+"""
+
+import itertools
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.assembly import assemble_exams
+from examgenerator.core.exam_generator import generate_exam
+from examgenerator.core.question import Question
+
+
+def pairwise_max(result):
+    """Máximo de preguntas compartidas calculado por fuerza bruta."""
+    return max(
+        (len(set(a) & set(b)) for a, b in itertools.combinations(result.exams, 2)),
+        default=0
+    )
+
+
+def test_cap_is_respected():
+    """Test que ningún par de exámenes supera el límite."""
+    result = assemble_exams(60, 20, 2, "Parcial", 1000)
+    
+    assert len(result) == 60
+    assert all(len(set(exam)) == 20 for exam in result.exams)
+    assert result.cap_met
+    assert pairwise_max(result) == result.achieved_overlap <= 2
+    assert result.overlap(0, 1) == len(set(result.exams[0]) & set(result.exams[1]))
+
+
+def test_infeasible_cap_reports_best_overlap():
+    """Test que un límite imposible informa el mejor solapamiento logrado."""
+    # 30 exámenes de 20 preguntas con 100 en el banco comparten al menos 4
+    result = assemble_exams(30, 20, 2, "Final", 100)
+    
+    assert len(result) == 30
+    assert not result.cap_met
+    assert result.achieved_overlap == pairwise_max(result) > 2
+
+
+def test_pool_groups_and_determinism():
+    """Test que se respeta el filtro, los grupos y la semilla."""
+    pool = list(range(0, 400, 2))
+    groups = [index // 4 * 4 for index in range(400)]
+    result = assemble_exams(10, 15, 1, "Parcial", 400, question_ids=pool, duplicate_groups=groups)
+    
+    for exam in result.exams:
+        assert set(exam) <= set(pool)
+        assert len({groups[index] for index in exam}) == 15
+    assert result.exams == assemble_exams(10, 15, 1, "Parcial", 400, pool, groups).exams
+    
+    with pytest.raises(ValueError):
+        assemble_exams(2, 201, 1, "Parcial", 400, question_ids=pool)
+
+
+def test_generate_exam_uses_assembled_selection():
+    """Test que generate_exam usa exactamente las preguntas ensambladas."""
+    questions = [Question(f"Pregunta {i}?", ["a", "b", "c", "d"], 'A') for i in range(50)]
+    result = assemble_exams(5, 10, 2, "Parcial", len(questions))
+    
+    for number, selection in enumerate(result.exams, 1):
+        exam, _ = generate_exam(questions, 10, f"Parcial_{number}", question_ids=selection)
+        assert sorted(item['question'] for item in exam) == sorted(questions[i]['question'] for i in selection)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+Tests básicos para el balanceo de la letra de la respuesta correcta.
+"""
+
+from collections import Counter
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.balancer import answer_targets, balanced_positions
+from examgenerator.core.exam_generator import generate_exam
+from examgenerator.core.question import Question
+
+
+QUESTIONS = [
+    Question(f"Pregunta {i}", [f"Opción {i}-{j}" for j in range(4)], 'A')
+    for i in range(200)
+]
+
+
+def test_targets_rotate_across_exams():
+    """Test que el resto se reparte por igual entre exámenes consecutivos."""
+    assert answer_targets(10, 4, 0) == [3, 3, 2, 2]
+    assert answer_targets(10, 4, 1) == [2, 2, 3, 3]
+    totals = [sum(column) for column in zip(*(answer_targets(11, 4, i) for i in range(4)))]
+    assert totals == [11, 11, 11, 11]
+
+
+def test_each_exam_is_balanced():
+    """Test que cada examen y el lote completo quedan balanceados."""
+    batch = Counter()
+    for i in range(8):
+        exam, answers = generate_exam(QUESTIONS, 10, f"Parcial_{i + 1}", balance_answers=True, exam_index=i)
+        counts = Counter(answers.values())
+        assert max(counts.values()) - min(counts.values()) <= 1
+        batch.update(counts)
+        # La opción correcta sigue en la letra indicada
+        for item in exam:
+            correct = item['options']['ABCD'.index(answers[item['number']])]
+            assert correct.endswith('-0')
+    
+    assert set(batch.values()) == {20}
+
+
+def test_short_questions_and_determinism():
+    """Test con preguntas de dos opciones y misma semilla, mismo examen."""
+    counts = [2] * 4 + [4] * 8
+    positions = balanced_positions(random.Random(1), counts, answer_targets(12, 4))
+    
+    assert all(positions[q] < 2 for q in range(4))
+    assert sorted(Counter(positions).values()) == [3, 3, 3, 3]
+    assert generate_exam(QUESTIONS, 12, "Final_1", balance_answers=True) == \
+        generate_exam(QUESTIONS, 12, "Final_1", balance_answers=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""
+Tests básicos para el caché de bancos parseados.
+"""
+
+import pytest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.utils.bank_cache import ParsedBankCache
+
+
+BANK = "¿Pregunta?\nA) Sí\nB) No\nANSWER: A\n".encode('utf-8')
+
+
+@pytest.fixture
+def temp_cache_dir():
+    """Crea directorio temporal para tests."""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_memory_hit(temp_cache_dir):
+    """Test que la segunda carga no vuelve a parsear."""
+    cache = ParsedBankCache(cache_dir=temp_cache_dir)
+    
+    first = cache.get_or_parse(BANK)
+    second = cache.get_or_parse(BANK)
+    
+    assert first is second
+    assert first[0]['answer'] == 'A'
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['memory_hits'] == 1
+
+
+def test_disk_hit(temp_cache_dir):
+    """Test que una nueva instancia recupera el banco desde disco."""
+    first = ParsedBankCache(cache_dir=temp_cache_dir).get_or_parse(BANK)
+    
+    calls = []
+    
+    def parser(raw):
+        calls.append(raw)
+        return []
+    
+    cache = ParsedBankCache(cache_dir=temp_cache_dir, parser=parser)
+    questions = cache.get_or_parse(BANK)
+    
+    assert not calls
+    assert questions[0]['options'] == ('Sí', 'No')
+    assert questions.fingerprint == first.fingerprint is not None
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_lru_eviction_and_memory_only():
+    """Test expulsión LRU sin nivel en disco."""
+    cache = ParsedBankCache(cache_dir=None, max_entries=1)
+    other = BANK.replace(b"Pregunta", b"Otra")
+    
+    cache.get_or_parse(BANK)
+    cache.get_or_parse(other)
+    cache.get_or_parse(BANK)
+    
+    stats = cache.stats()
+    assert stats['misses'] == 3
+    assert stats['memory_entries'] == 1
+    assert stats['disk_entries'] == 0
+
+
+def test_clear(temp_cache_dir):
+    """Test limpieza del caché."""
+    cache = ParsedBankCache(cache_dir=temp_cache_dir)
+    cache.get_or_parse(BANK)
+    
+    cache.clear()
+    
+    stats = cache.stats()
+    assert stats['memory_entries'] == 0
+    assert stats['disk_entries'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
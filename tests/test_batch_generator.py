@@ -0,0 +1,87 @@
+"""
+Tests básicos para la generación vectorizada de exámenes por lotes.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core import batch_generator
+from examgenerator.core.batch_generator import generate_exams_batch
+from examgenerator.core.question import Question
+
+pytestmark = pytest.mark.skipif(not batch_generator.NUMPY_AVAILABLE, reason="NumPy no está instalado")
+
+
+QUESTIONS = [
+    Question(f"Pregunta {i}", [f"Opción {i}-{j}" for j in range(2 + i % 3)], 'AB'[i % 2])
+    for i in range(300)
+]
+
+
+def check_exam(items, answers):
+    """Comprueba que un examen decodificado es coherente con el banco."""
+    assert len({item['question'] for item in items}) == len(items)
+    for item in items:
+        question = QUESTIONS[int(item['question'].split()[1])]
+        assert sorted(item['options']) == sorted(question['options'])
+        correct = question['options']['ABCD'.index(question['answer'])]
+        assert item['options']['ABCD'.index(answers[item['number']])] == correct
+
+
+@pytest.mark.parametrize("bank_size,k", [(300, 10), (30, 25), (12, 12)])
+def test_batch_exams_are_valid(bank_size, k):
+    """Test selección sin repetidos y respuestas correctas tras permutar."""
+    batch = generate_exams_batch(QUESTIONS[:bank_size], 200, k, "Parcial")
+    
+    assert len(batch) == 200
+    assert batch.width == k
+    for position in range(len(batch)):
+        items, answers = batch.exam(position)
+        assert len(items) == k
+        check_exam(items, answers)
+
+
+def test_large_batch_uses_sparse_sampling(monkeypatch):
+    """Test que muchos exámenes con k moderado no construyen la matriz densa."""
+    import numpy as np
+    
+    def dense_rows(*args):
+        raise AssertionError("k moderado no debe usar el muestreo denso")
+    
+    monkeypatch.setattr(batch_generator, '_dense_rows', dense_rows)
+    bank = QUESTIONS * 10  # 3000 preguntas (textos repetidos, índices distintos)
+    batch = generate_exams_batch(bank, 5000, 50, "Parcial")
+    
+    ids = np.array(batch.question_ids).reshape(5000, 50)
+    assert ((ids >= 0) & (ids < len(bank))).all()
+    ordered = np.sort(ids, axis=1)
+    assert not (ordered[:, 1:] == ordered[:, :-1]).any()
+
+
+def test_batch_is_deterministic():
+    """Test que la misma semilla produce el mismo lote."""
+    first = generate_exams_batch(QUESTIONS, 50, 20, "Final")
+    second = generate_exams_batch(QUESTIONS, 50, 20, "Final")
+    other = generate_exams_batch(QUESTIONS, 50, 20, "Parcial")
+    
+    assert first.question_ids == second.question_ids
+    assert first.permutation_ids == second.permutation_ids
+    assert first.question_ids != other.question_ids
+
+
+def test_exam_data():
+    """Test formato de datos para los exportadores de respuestas."""
+    batch = generate_exams_batch(QUESTIONS, 3, 5, "Final")
+    data = list(batch)
+    
+    assert [exam['exam_number'] for exam in data] == [1, 2, 3]
+    assert data[1]['answers'] == list(batch.exam(1)[1].values())
+    assert len(data[2]['questions']) == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Tests básicos para bancos con categorías y muestreo estratificado.
+"""
+
+import io
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.bank import QuestionBank
+from examgenerator.core.compiled_bank import compile_bank, open_compiled_bank
+from examgenerator.core.exam_generator import build_category_index, generate_exam
+from examgenerator.core.incremental_loader import IncrementalBankLoader
+from examgenerator.core.question import Question
+from examgenerator.core.question_loader import load_questions_from_stream
+from examgenerator.legacy import main_generate
+
+
+BANK = """CATEGORY: Redes
+1. ¿Qué puerto usa HTTP?
+A) 80
+B) 443
+C) 21
+D) 22
+ANSWER: A
+
+2. ¿Qué es la RAM?
+A) Memoria
+B) Disco
+C) Red
+D) CPU
+ANSWER: A
+CATEGORY: Hardware
+
+3. ¿Pregunta sin categoría?
+A) Sí
+B) No
+C) Tal vez
+D) Nunca
+ANSWER: B
+"""
+
+
+def make_bank(per_category):
+    """Crea un banco sintético con varias categorías."""
+    return [
+        Question(f"Pregunta {category} {i}", ["a", "b", "c", "d"], 'A', category=category)
+        for category, count in per_category.items()
+        for i in range(count)
+    ]
+
+
+def test_parse_category_lines():
+    """Test que CATEGORY se asigna antes o después del enunciado."""
+    questions = load_questions_from_stream(io.StringIO(BANK))
+    
+    assert [q.get('category') for q in questions] == ['Redes', 'Hardware', None]
+    assert 'category' not in questions[2]
+    assert IncrementalBankLoader().parse_bytes(BANK.encode('utf-8')) == questions
+
+
+def test_compiled_bank_keeps_category(tmp_path):
+    """Test que el banco compilado conserva la categoría."""
+    questions = load_questions_from_stream(io.StringIO(BANK))
+    path = str(tmp_path / "banco.qbank")
+    compile_bank(questions, path)
+    
+    with open_compiled_bank(path) as bank:
+        assert list(bank) == questions
+
+
+def test_stratified_quotas():
+    """Test que cada examen respeta las cuotas por categoría."""
+    questions = make_bank({'U1': 30, 'U2': 20, 'U3': 50})
+    index = build_category_index(questions)
+    assert len(index['U2']) == 20
+    
+    for i in range(10):
+        exam, answers = generate_exam(
+            questions, 12, f"Parcial_{i}", quotas={'U1': 5, 'U2': 3}, category_index=index
+        )
+        texts = [item['question'] for item in exam]
+        assert len(set(texts)) == 12 == len(answers)
+        assert sum('U1' in text for text in texts) >= 5
+        assert sum('U2' in text for text in texts) >= 3
+    
+    exam, _ = generate_exam(questions, 8, "Final_1", quotas={'U1': 5, 'U2': 3})
+    assert sorted(q['question'].split()[1] for q in exam) == ['U1'] * 5 + ['U2'] * 3
+
+
+def test_quota_errors():
+    """Test errores cuando una categoría no alcanza su cuota."""
+    questions = make_bank({'U1': 3, 'U2': 5})
+    
+    with pytest.raises(ValueError):
+        generate_exam(questions, 5, "Parcial_1", quotas={'U1': 4})
+    with pytest.raises(ValueError):
+        generate_exam(questions, 5, "Parcial_1", quotas={'U1': 3, 'U2': 3})
+
+
+def test_main_generate_rejects_oversized_quotas(tmp_path, monkeypatch):
+    """Test que main_generate avisa claramente de cuotas imposibles antes de generar."""
+    monkeypatch.chdir(tmp_path)
+    bank = QuestionBank(make_bank({'U1': 3, 'U2': 5, 'U3': 2}), validated=True)
+    
+    with pytest.raises(ValueError, match="categoría 'U1' \\(4\\) supera sus 3"):
+        main_generate('banco.txt', 'Parcial', 2, 5, 'txt', None, 'csv', bank=bank, quotas={'U1': 4})
+    with pytest.raises(ValueError, match="categoría 'U2' \\(3\\) supera sus 0"):
+        main_generate('banco.txt', 'Parcial', 2, 5, 'txt', None, 'csv', bank=bank,
+                      topics=['U1'], quotas={'U2': 3})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
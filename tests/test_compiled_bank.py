@@ -0,0 +1,97 @@
+"""
+Tests básicos para el formato de banco compilado (.qbank).
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.compiled_bank import (
+    CompiledBank,
+    compile_bank,
+    is_compiled_bank,
+    open_compiled_bank,
+)
+from examgenerator.core.question import Question
+from examgenerator.core.question_loader import iter_validated_questions, load_questions_from_file
+from examgenerator.core.exam_generator import generate_exam
+
+
+def make_questions(n):
+    """Crea un banco sintético de n preguntas."""
+    return [
+        Question(f"Pregunta número {i} ¿ñandú?", [f"Opción {i}-{j}" for j in range(4)], 'ABCD'[i % 4])
+        for i in range(n)
+    ]
+
+
+def test_compile_roundtrip(tmp_path):
+    """Test compilar y leer de nuevo todas las preguntas."""
+    questions = make_questions(50)
+    path = tmp_path / "banco.qbank"
+    
+    assert compile_bank(iter(questions), str(path)) == 50
+    assert is_compiled_bank(str(path))
+    
+    with open_compiled_bank(str(path)) as bank:
+        assert len(bank) == 50
+        assert bank[0] == questions[0]
+        assert bank[-1] == questions[-1]
+        assert bank[10:13] == questions[10:13]
+        with pytest.raises(IndexError):
+            bank[50]
+
+
+def test_compiled_bank_sampling_matches_list(tmp_path):
+    """Test que generar desde el banco compilado equivale a hacerlo desde la lista."""
+    questions = make_questions(200)
+    path = tmp_path / "banco.qbank"
+    compile_bank(questions, str(path))
+    
+    with CompiledBank(str(path)) as bank:
+        assert generate_exam(bank, 10, "Parcial_1") == generate_exam(questions, 10, "Parcial_1")
+        assert random.Random(3).sample(bank, 5) == random.Random(3).sample(questions, 5)
+
+
+def test_load_questions_from_file_detects_compiled(tmp_path):
+    """Test que el cargador reconoce bancos compilados."""
+    path = tmp_path / "banco.qbank"
+    compile_bank(make_questions(3), str(path))
+    
+    bank = load_questions_from_file(str(path))
+    assert isinstance(bank, CompiledBank)
+    bank.close()
+
+
+def test_invalid_compiled_bank(tmp_path):
+    """Test archivo que no es un banco compilado."""
+    path = tmp_path / "falso.qbank"
+    path.write_bytes(b"no es un banco")
+    
+    assert not is_compiled_bank(str(path))
+    with pytest.raises(ValueError):
+        CompiledBank(str(path))
+
+
+def test_failed_compile_keeps_existing_bank(tmp_path):
+    """Test que una compilación fallida no deja banco parcial ni pisa el anterior."""
+    path = tmp_path / "banco.qbank"
+    compile_bank(make_questions(5), str(path))
+    original = path.read_bytes()
+    
+    invalid = make_questions(3) + [Question("¿Sin respuesta?", ["x", "y"])]
+    with pytest.raises(ValueError, match="no tiene respuesta"):
+        compile_bank(iter_validated_questions(invalid), str(path))
+    with pytest.raises(ValueError, match="ninguna pregunta"):
+        compile_bank([], str(path))
+    
+    assert path.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["banco.qbank"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
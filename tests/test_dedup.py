@@ -0,0 +1,98 @@
+"""
+Tests básicos para la detección de preguntas casi duplicadas.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core import dedup
+from examgenerator.core.dedup import DuplicateIndex
+from examgenerator.core.bank import QuestionBank
+from examgenerator.core.question import Question
+from examgenerator.core.exam_generator import generate_exam
+
+
+def make_bank(n, seed=0):
+    """Crea un banco sintético de n preguntas con vocabulario aleatorio."""
+    rng = random.Random(seed)
+    words = [f"termino{i}" for i in range(2000)]
+    return [
+        Question(
+            ' '.join(rng.choice(words) for _ in range(15)) + '?',
+            [' '.join(rng.choice(words) for _ in range(3)) for _ in range(4)],
+            'A'
+        )
+        for _ in range(n)
+    ]
+
+
+def reworded(question, word='cambiada'):
+    """Copia de la pregunta con una palabra del enunciado sustituida."""
+    words = question['question'].split()
+    words[3] = word
+    return Question(' '.join(words), question['options'], question['answer'])
+
+
+def test_finds_reworded_questions():
+    """Test que las preguntas reformuladas caen en el mismo grupo."""
+    questions = make_bank(300)
+    questions.append(reworded(questions[10]))
+    questions.append(Question("¿Qué es la CPU?", ["Un procesador", "Memoria", "Disco", "Red"], 'A'))
+    questions.append(Question("¿QUÉ ES LA CPU?", ["Un procesador", "Memoria", "Disco", "Red"], 'A'))
+    
+    index = DuplicateIndex(questions)
+    
+    assert index.group_of(300) == index.group_of(10) == 10
+    assert index.group_of(302) == 301
+    assert sorted(index.duplicate_groups()) == [[10, 300], [301, 302]]
+    assert index.similarity(10, 300) >= index.threshold
+
+
+def test_python_fallback_matches_numpy(monkeypatch):
+    """Test que la implementación sin NumPy produce los mismos grupos."""
+    if not dedup.NUMPY_AVAILABLE:
+        pytest.skip("NumPy no está instalado")
+    
+    questions = make_bank(200)
+    questions += [reworded(questions[i]) for i in range(0, 200, 20)]
+    fast = DuplicateIndex(questions)
+    
+    monkeypatch.setattr(dedup, 'NUMPY_AVAILABLE', False)
+    slow = DuplicateIndex(questions)
+    
+    assert list(fast.groups) == list(slow.groups)
+
+
+def test_generate_exam_excludes_duplicates():
+    """Test que un examen nunca contiene dos preguntas del mismo grupo."""
+    questions = make_bank(20)
+    questions += [reworded(q, word) for q in questions for word in ('uno', 'dos')]
+    bank = QuestionBank(questions)
+    groups = bank.find_duplicates().groups
+    assert bank.count_distinct() == 20
+    
+    group_by_text = {q['question']: groups[i] for i, q in enumerate(questions)}
+    for i in range(20):
+        exam, _ = generate_exam(bank, 20, f"Parcial_{i}", duplicate_groups=groups)
+        assert len({group_by_text[item['question']] for item in exam}) == 20
+    
+    with pytest.raises(ValueError):
+        generate_exam(bank, 21, "Parcial_1", duplicate_groups=groups)
+
+
+def test_generate_exam_without_groups_unchanged():
+    """Test que sin grupos la selección es la misma que antes."""
+    questions = make_bank(50)
+    
+    assert generate_exam(questions, 10, "Final_1") == generate_exam(
+        questions, 10, "Final_1", duplicate_groups=None
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Tests básicos para la exportación DOCX con plantillas compiladas.
+"""
+
+import os
+import pytest
+import sys
+import zipfile
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+docx = pytest.importorskip("docx")
+
+from examgenerator.exporters.docx_exporter import compile_docx_template, create_exam_docx
+
+QUESTIONS = [
+    {'question': f"Pregunta {i}", 'options': [f"Opción {i}-{j}" for j in range(3)]}
+    for i in range(4)
+]
+
+
+def make_template(path, footer="Fin"):
+    """Plantilla con marcadores en párrafos y en una tabla."""
+    doc = docx.Document()
+    doc.add_paragraph("Curso {{COURSE}}")
+    paragraph = doc.add_paragraph("Examen nº ")
+    paragraph.add_run("{{EXAM_NUMBER}}")
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "{{EXAM_TITLE}}"
+    doc.add_paragraph("{{CONTENT}}")
+    doc.add_paragraph(footer)
+    doc.save(path)
+
+
+def test_compiled_template_per_exam(tmp_path):
+    """Test que cada examen parte de la plantilla original con sus propios valores."""
+    template = tmp_path / "plantilla.docx"
+    make_template(template)
+    for number in (1, 2):
+        create_exam_docx("Final", number, QUESTIONS[:number + 1], str(tmp_path), str(template))
+    
+    for number in (1, 2):
+        doc = docx.Document(str(tmp_path / f"examen_Final_{number}.docx"))
+        texts = [p.text for p in doc.paragraphs]
+        assert texts[:4] == ["Curso Final", f"Examen nº {number}", "", "Fin"]
+        assert doc.tables[0].cell(0, 0).text == f"EXAMEN Final {number}"
+        assert sum(text.endswith(") Opción 0-0") for text in texts) == 1
+        assert len([text for text in texts if text.startswith(("1.", "2.", "3."))]) == number + 1
+
+
+def test_template_cache_follows_mtime(tmp_path):
+    """Test que la plantilla compilada se reutiliza hasta que cambia el archivo."""
+    template = tmp_path / "plantilla.docx"
+    make_template(template)
+    compiled = compile_docx_template(str(template))
+    assert compile_docx_template(str(template)) is compiled
+    
+    make_template(template, footer="Nuevo pie")
+    stat = os.stat(template)
+    os.utime(template, (stat.st_atime, stat.st_mtime + 10))
+    assert compile_docx_template(str(template)) is not compiled
+    
+    create_exam_docx("Final", 1, QUESTIONS, str(tmp_path), str(template))
+    doc = docx.Document(str(tmp_path / "examen_Final_1.docx"))
+    assert doc.paragraphs[3].text == "Nuevo pie"
+
+
+def test_raw_backend_matches_python_docx(tmp_path):
+    """Test que el backend raw produce las mismas partes que python-docx."""
+    questions = QUESTIONS + [{'question': " ¿<Qué> & \"esto\"?\tfin", 'options': ["a\nb", " x ", "ñ"]}]
+    for backend in ('python-docx', 'raw'):
+        (tmp_path / backend).mkdir()
+        create_exam_docx("Final", 1, questions, str(tmp_path / backend), backend=backend)
+    
+    packages = [zipfile.ZipFile(tmp_path / backend / "examen_Final_1.docx") for backend in ('python-docx', 'raw')]
+    assert packages[1].testzip() is None
+    assert packages[0].namelist() == packages[1].namelist()
+    for name in packages[0].namelist():
+        assert packages[0].read(name) == packages[1].read(name), name
+    
+    with pytest.raises(ValueError):
+        create_exam_docx("Final", 1, QUESTIONS, str(tmp_path), backend='otro')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
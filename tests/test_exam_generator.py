@@ -0,0 +1,109 @@
+"""
+Tests básicos para la generación de exámenes con generadores aislados.
+"""
+
+import io
+import random
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.exam_generator import generate_exam
+from examgenerator.core.question import Question
+from examgenerator.core.question_loader import load_questions_from_stream, validate_question
+from examgenerator.core.shuffler import shuffle_exam_questions, shuffle_question_options
+from examgenerator.runner import format_exam_txt
+
+
+QUESTIONS = [
+    Question(f"Pregunta {i}", [f"Opción {i}-{j}" for j in range(4)], 'ABCD'[i % 4])
+    for i in range(200)
+]
+
+
+def legacy_generate_exam(questions, num_questions, seed):
+    """Implementación anterior con el estado global de random."""
+    random.seed(seed)
+    selected = random.sample(questions, num_questions)
+    result = []
+    for question in selected:
+        correct = question['options']['ABCD'.index(question['answer'])]
+        options = list(question['options'])
+        random.shuffle(options)
+        result.append((question['question'], options, 'ABCD'[options.index(correct)]))
+    return result
+
+
+def test_matches_global_seed_implementation():
+    """Test que el resultado es idéntico al de random.seed(seed)."""
+    for i in range(1, 6):
+        exam, answers = generate_exam(QUESTIONS, 20, f"Parcial_{i}")
+        expected = legacy_generate_exam(QUESTIONS, 20, f"Parcial_{i}")
+        assert [(item['question'], list(item['options']), answers[item['number']]) for item in exam] == expected
+
+
+def test_parallel_matches_serial():
+    """Test que generar en hilos produce los mismos exámenes que en serie."""
+    seeds = [f"Final_{i}" for i in range(1, 101)]
+    serial = [generate_exam(QUESTIONS, 30, seed) for seed in seeds]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        parallel = list(pool.map(lambda seed: generate_exam(QUESTIONS, 30, seed), seeds))
+    
+    assert parallel == serial
+
+
+def test_global_random_state_untouched():
+    """Test que generar no altera el estado global de random."""
+    random.seed(123)
+    state = random.getstate()
+    
+    generate_exam(QUESTIONS, 10, "Parcial_1")
+    shuffle_exam_questions(QUESTIONS, "Parcial_1")
+    
+    assert random.getstate() == state
+
+
+def test_duplicate_option_texts():
+    """Test que opciones repetidas no confunden la respuesta correcta."""
+    question = Question("¿Cuál?", ["Ninguna", "Ninguna", "Sí", "Ninguna"], 'B')
+    
+    for seed in range(50):
+        options, letter = shuffle_question_options(question, rng=random.Random(seed))
+        assert sorted(options) == sorted(question['options'])
+        assert letter in 'ABCD'
+        # Mismo sorteo con un texto distinto en B: la letra debe señalarlo
+        marked = Question("¿Cuál?", ["Ninguna", "Correcta", "Sí", "Ninguna"], 'B')
+        marked_options, marked_letter = shuffle_question_options(marked, rng=random.Random(seed))
+        assert letter == marked_letter and marked_options['ABCD'.index(letter)] == "Correcta"
+
+
+def test_questions_with_more_than_four_options():
+    """Test de preguntas con 2 a 10 opciones, del archivo a la exportación TXT."""
+    text = (
+        "¿Seis opciones?\nA) uno\nB) dos\nC) tres\nD) cuatro\nE) cinco\nF) seis\nANSWER: F\n\n"
+        "¿Dos opciones?\nA) sí\nB) no\nANSWER: A\n"
+    )
+    questions = load_questions_from_stream(io.StringIO(text))
+    assert [len(q['options']) for q in questions] == [6, 2]
+    
+    exam, answers = generate_exam(questions, 2, "Parcial_1")
+    for item in exam:
+        letter = answers[item['number']]
+        assert letter in 'ABCDEF'[:len(item['options'])]
+        expected = "seis" if len(item['options']) == 6 else "sí"
+        assert item['options']['ABCDEFGHIJ'.index(letter)] == expected
+    
+    content = format_exam_txt("Parcial", 1, exam)
+    assert "   F) " in content and "   G) " not in content
+    
+    with pytest.raises(ValueError):
+        validate_question(Question("¿Fuera de rango?", ["a", "b", "c"], 'D'), 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+"""
+Tests básicos para la representación compacta de exámenes.
+"""
+
+import pickle
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.exam_generator import generate_exam, select_exam
+from examgenerator.core.exam_matrix import ExamMatrix
+from examgenerator.core.question import Question
+from examgenerator.core.shuffler import permutation_from_id, permutation_id
+
+
+QUESTIONS = [
+    Question(f"Pregunta {i}", [f"Opción {i}-{j}" for j in range(2 + i % 9)], 'AB'[i % 2])
+    for i in range(100)
+]
+
+
+def test_matrix_decodes_like_generate_exam():
+    """Test que decodificar la matriz da los mismos exámenes."""
+    matrix = ExamMatrix(QUESTIONS, first_exam=3)
+    for number in range(3, 13):
+        matrix.append(*select_exam(QUESTIONS, 12, f"Final_{number}", balance_answers=True))
+    
+    assert len(matrix) == 10
+    assert matrix.question_ids.itemsize == 4
+    for position, exam_data in enumerate(matrix):
+        items, answers = generate_exam(QUESTIONS, 12, f"Final_{position + 3}", balance_answers=True)
+        assert exam_data == {'exam_number': position + 3, 'answers': list(answers.values()), 'questions': items}
+
+
+def test_pickle_excludes_bank():
+    """Test que el pickle no incluye el banco y se recupera con bind."""
+    matrix = ExamMatrix(QUESTIONS)
+    matrix.append(*select_exam(QUESTIONS, 5, "Parcial_1"))
+    
+    restored = pickle.loads(pickle.dumps(matrix))
+    assert restored.questions is None
+    assert restored.bind(QUESTIONS).exam(0) == matrix.exam(0)
+    assert b"Pregunta" not in pickle.dumps(matrix)
+    
+    with pytest.raises(ValueError):
+        matrix.append([1, 2], [0, 0])
+
+
+def test_permutation_ids_round_trip():
+    """Test que el id de una permutación la reconstruye (hasta 10 opciones)."""
+    permutation = (3, 9, 0, 7, 1, 8, 2, 6, 4, 5)
+    assert tuple(permutation_from_id(10, permutation_id(permutation))[0]) == permutation
+    assert permutation_id(permutation) < 2 ** 32
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,44 @@
+"""
+Tests básicos para la hoja de respuestas Excel en modo streaming.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from examgenerator.exporters import ExcelAnswerWriter, create_answers_excel
+
+
+def test_streaming_layout(tmp_path):
+    """Test diseño traspuesto, relleno con '-' e información al final."""
+    exams = [{'exam_number': n, 'answers': list("ABCD"[:4 - (n == 2)])} for n in (1, 2, 3)]
+    create_answers_excel(exams, "Final", str(tmp_path), 1.5)
+    
+    ws = openpyxl.load_workbook(tmp_path / "respuestas_Final_completas.xlsx").active
+    rows = list(ws.iter_rows(values_only=True))
+    assert ws.title == "Respuestas Final"
+    assert rows[0] == ("Examen", "P1", "P2", "P3", "P4")
+    assert rows[2] == ("Examen 2", "A", "B", "C", "-")
+    assert rows[6][0] == "Información de Exámenes"
+    assert [str(r) for r in ws.merged_cells.ranges] == ["A7:E7"]
+    assert rows[9][:2] == ("Número total de exámenes:", "3")
+    assert ws["A1"].style == "Encabezado" and ws["C3"].style == "Respuesta"
+    assert ws["C3"].border.left.style == "thin"
+
+
+def test_writer_rejects_longer_exams(tmp_path):
+    """Test que un examen con más preguntas que la cabecera se rechaza."""
+    writer = ExcelAnswerWriter("Final", str(tmp_path))
+    writer.add({'exam_number': 1, 'answers': ['A', 'B']})
+    with pytest.raises(ValueError):
+        writer.add({'exam_number': 2, 'answers': ['A', 'B', 'C']})
+    assert writer.close().endswith("respuestas_Final_completas.xlsx")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""
+Tests básicos para la recarga incremental de bancos.
+"""
+
+import io
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.incremental_loader import IncrementalBankLoader
+from examgenerator.core.question_loader import load_questions_from_stream
+
+
+def make_bank(n, edited=None):
+    """Crea un banco de n preguntas, opcionalmente con una pregunta editada."""
+    blocks = []
+    for i in range(n):
+        text = f"{i + 1}. Pregunta {i}" + (" (editada)" if i == edited else "")
+        blocks.append(f"{text}\nA) uno\nB) dos\nC) tres\nANSWER: {'ABC'[i % 3]}\n")
+    return "\n".join(blocks)
+
+
+def test_only_changed_block_is_reparsed(tmp_path):
+    """Test que editar una pregunta solo re-parsea su bloque."""
+    bank = tmp_path / "banco.txt"
+    loader = IncrementalBankLoader()
+    
+    bank.write_text(make_bank(50), encoding='utf-8')
+    loader.load_file(str(bank))
+    assert loader.stats()['last_reparsed_blocks'] == 50
+    
+    bank.write_text(make_bank(50, edited=7), encoding='utf-8')
+    questions = loader.load_file(str(bank))
+    
+    assert loader.last_reparsed == 1
+    assert loader.last_reused == 49
+    assert questions[7]['question'] == "Pregunta 7 (editada)"
+
+
+@pytest.mark.parametrize("text", [
+    make_bank(5),
+    # Pregunta sin opciones seguida de línea en blanco: el bloque se une al siguiente
+    "¿Abierta?\n\nA) sí\nB) no\nANSWER: A\n\n¿Otra?\nA) x\nB) y\nANSWER: B\n",
+    # Opciones y respuesta huérfanas tras una pregunta cerrada
+    "¿Una?\nA) x\nB) y\n\nANSWER: A\nA) z\n\n¿Dos?\nA) a\nB) b\nANSWER: B",
+    # Varias preguntas en un mismo bloque
+    "¿Una?\nA) x\nB) y\nANSWER: A\n¿Dos?\nA) a\nB) b\nANSWER: B\n",
+    # Enunciado con prefijo de opción (E-J solo cuenta como siguiente letra)
+    "¿Una?\nA) x\nB) y\nANSWER: A\nE) Enunciado\n\nA) a\nB) b\nC) c\nANSWER: B\n",
+])
+def test_matches_full_parse(text):
+    """Test que el resultado coincide con el parser completo."""
+    loader = IncrementalBankLoader()
+    
+    assert loader.parse_stream(io.StringIO(text)) == load_questions_from_stream(io.StringIO(text))
+
+
+def test_parse_bytes_matches_file(tmp_path):
+    """Test que parsear los bytes da lo mismo que cargar el archivo (incluido CRLF)."""
+    raw = make_bank(5, edited=2).replace("\n", "\r\n").encode('utf-8')
+    bank = tmp_path / "banco.txt"
+    bank.write_bytes(raw)
+    
+    assert IncrementalBankLoader().parse_bytes(raw) == IncrementalBankLoader().load_file(str(bank))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
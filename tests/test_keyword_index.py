@@ -0,0 +1,65 @@
+"""
+Tests básicos para el índice invertido de palabras clave.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core import keyword_index
+from examgenerator.core.keyword_index import KeywordIndex
+from examgenerator.core.bank import QuestionBank
+from examgenerator.core.question import Question
+from examgenerator.core.exam_generator import generate_exam
+
+
+QUESTIONS = [
+    Question("¿Qué puerto usa HTTP?", ["80", "443", "21", "22"], 'A'),
+    Question("¿TCP es orientado a conexión?", ["Sí", "No", "A veces", "Nunca"], 'A'),
+    Question("¿Qué protocolo es más rápido?", ["TCP/IP", "UDP", "ICMP", "ARP"], 'B'),
+    Question("¿Qué es la Señalización?", ["Un protocolo", "Un cable", "Un puerto", "Nada"], 'A'),
+]
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'python'])
+def index(request, monkeypatch):
+    """Índice construido con y sin NumPy."""
+    if request.param and not keyword_index.NUMPY_AVAILABLE:
+        pytest.skip("NumPy no está instalado")
+    monkeypatch.setattr(keyword_index, 'NUMPY_AVAILABLE', request.param)
+    return KeywordIndex(QUESTIONS, batch_size=3)
+
+
+def test_lookup_ignores_case_and_accents(index):
+    """Test búsqueda en enunciados y opciones sin distinguir mayúsculas ni tildes."""
+    assert list(index.lookup("tcp")) == [1, 2]
+    assert list(index.lookup("SENALIZACION")) == [3]
+    assert list(index.lookup("protocolo")) == [2, 3]
+    assert list(index.lookup("es protocolo")) == [2, 3]
+    assert list(index.lookup("inexistente")) == []
+
+
+def test_search_any_and_all(index):
+    """Test combinación de varios temas."""
+    assert list(index.search(["UDP", "HTTP"])) == [0, 2]
+    assert list(index.search(["TCP", "UDP"], match_all=True)) == [2]
+    assert list(index.search([])) == [0, 1, 2, 3]
+
+
+def test_generate_exam_with_filter():
+    """Test que los exámenes filtrados solo contienen preguntas del tema."""
+    bank = QuestionBank(QUESTIONS)
+    ids = bank.filter("tcp")
+    
+    exam, answers = generate_exam(bank, 5, "Parcial_1", question_ids=ids)
+    
+    assert len(exam) == 2
+    assert {item['question'] for item in exam} == {QUESTIONS[1]['question'], QUESTIONS[2]['question']}
+    assert generate_exam(bank, 2, "Parcial_1", question_ids=range(4)) == generate_exam(bank, 2, "Parcial_1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,161 @@
+"""
+Tests básicos para el cargador de preguntas.
+"""
+
+import io
+import pytest
+import sys
+import types
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.bank import QuestionBank, load_bank
+from examgenerator.core.question import Question, ExamItem
+from examgenerator.core.question_loader import (
+    iter_questions_from_stream,
+    iter_questions_from_file,
+    load_questions_from_stream,
+    load_questions_from_directory,
+    validate_questions,
+)
+
+
+SAMPLE_BANK = """1. ¿Capital de Francia?
+A) Madrid
+B) París
+C) Roma
+D) Berlín
+ANSWER: B
+
+2. ¿Cuánto es 2 + 2?
+A) 3
+B) 5
+C) 4
+D) 22
+ANSWER: C
+"""
+
+
+def test_iter_questions_is_lazy():
+    """Test que el parser devuelve un generador."""
+    questions = iter_questions_from_stream(io.StringIO(SAMPLE_BANK))
+    
+    assert isinstance(questions, types.GeneratorType)
+    first = next(questions)
+    assert first['question'] == "¿Capital de Francia?"
+    assert first['answer'] == 'B'
+
+
+def test_load_matches_iter():
+    """Test que load_questions_from_stream envuelve al iterador."""
+    loaded = load_questions_from_stream(io.StringIO(SAMPLE_BANK))
+    iterated = list(iter_questions_from_stream(io.StringIO(SAMPLE_BANK)))
+    
+    assert loaded == iterated
+    assert len(loaded) == 2
+    assert loaded[1]['options'] == ('3', '5', '4', '22')
+
+
+def test_question_dict_view_and_interning():
+    """Test vista tipo diccionario y opciones compartidas."""
+    q1 = Question("¿Uno?", ["Sí", "Todas las anteriores"], 'B')
+    q2 = Question("¿Dos?", ["No", "".join(["Todas las ", "anteriores"])], 'A')
+    
+    assert not hasattr(q1, '__dict__')
+    assert q1['answer'] == 'B' and q1.get('missing') is None
+    assert q1.to_dict() == {'question': "¿Uno?", 'options': ["Sí", "Todas las anteriores"], 'answer': 'B'}
+    assert q1.options[1] is q2.options[1]
+    assert 'answer' not in Question("¿Sin respuesta?", ["a", "b"])
+
+
+def test_exam_item_dict_view():
+    """Test vista tipo diccionario de ExamItem."""
+    item = ExamItem(1, "¿Uno?", ["b", "a"], 'A')
+    
+    assert item['number'] == 1
+    assert list(item) == ['number', 'question', 'options', 'original_answer']
+
+
+def test_load_empty_stream_raises():
+    """Test que un banco vacío produce error."""
+    with pytest.raises(ValueError):
+        load_questions_from_stream(io.StringIO(""))
+
+
+def test_validate_questions_from_iterator(tmp_path):
+    """Test validación directamente sobre el iterador de archivo."""
+    bank = tmp_path / "preguntas.txt"
+    bank.write_text(SAMPLE_BANK, encoding='utf-8')
+    
+    assert validate_questions(iter_questions_from_file(str(bank)))
+
+
+def test_iter_questions_missing_file():
+    """Test archivo inexistente."""
+    with pytest.raises(FileNotFoundError):
+        list(iter_questions_from_file("no_existe.txt"))
+
+
+def test_load_questions_from_directory(tmp_path):
+    """Test carga en paralelo de un banco repartido en varios archivos."""
+    for name in ("tema1.txt", "tema2.txt", "tema3.txt"):
+        (tmp_path / name).write_text(SAMPLE_BANK, encoding='utf-8')
+    (tmp_path / "notas.md").write_text("ignorado", encoding='utf-8')
+    
+    questions = load_questions_from_directory(str(tmp_path), max_workers=2)
+    
+    assert len(questions) == 6
+    assert [Path(q['source']).name for q in questions[::2]] == ["tema1.txt", "tema2.txt", "tema3.txt"]
+    assert questions == load_questions_from_directory(str(tmp_path / "tema*.txt"), max_workers=1)
+
+
+def test_load_questions_from_directory_no_files(tmp_path):
+    """Test carpeta sin archivos de preguntas."""
+    with pytest.raises(FileNotFoundError):
+        load_questions_from_directory(str(tmp_path))
+
+
+def test_load_bank_single_pass(tmp_path):
+    """Test que load_bank devuelve un banco ya validado."""
+    bank_file = tmp_path / "preguntas.txt"
+    bank_file.write_text(SAMPLE_BANK, encoding='utf-8')
+    
+    bank = load_bank(str(bank_file))
+    
+    assert isinstance(bank, QuestionBank)
+    assert bank.validated
+    assert len(bank) == 2
+    assert bank.content_hash and len(bank.content_hash) == 64
+
+
+def test_load_bank_reports_invalid_question(tmp_path):
+    """Test que la validación ocurre durante la carga."""
+    bank_file = tmp_path / "invalido.txt"
+    bank_file.write_text(SAMPLE_BANK + "\n¿Sin respuesta?\nA) x\nB) y\n", encoding='utf-8')
+    
+    with pytest.raises(ValueError, match="Pregunta 3 no tiene respuesta"):
+        load_bank(str(bank_file))
+
+
+def test_question_lines_with_option_like_prefix():
+    """Test que 'E) ...' o 'I. ...' solo son opciones si son la siguiente letra esperada."""
+    text = (
+        "¿Cinco opciones?\nA) a\nB) b\nC) c\nD) d\nE) e\nANSWER: E\n"
+        "E) Enunciado que empieza como una opción\nA) x\nB) y\nANSWER: A\n\n"
+        "I. Primer punto en números romanos\nA) sí\nB) no\nC) quizá\nANSWER: B\n"
+    )
+    
+    questions = load_questions_from_stream(io.StringIO(text))
+    
+    assert [q['question'] for q in questions] == [
+        "¿Cinco opciones?",
+        "E) Enunciado que empieza como una opción",
+        "I. Primer punto en números romanos",
+    ]
+    assert [len(q['options']) for q in questions] == [5, 2, 3]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+"""
+Tests básicos para regenerar exámenes desde el manifiesto.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core import compiled_bank
+from examgenerator.core.bank import QuestionBank, load_bank
+from examgenerator.core.compiled_bank import compile_bank
+from examgenerator.core.question import Question
+from examgenerator.legacy import main_generate
+from examgenerator.regenerate import bank_fingerprint, load_manifest, regenerate_exam
+
+
+def make_bank(n=60):
+    """Banco sintético con categorías alternadas."""
+    return QuestionBank([
+        Question(f"Pregunta {i}?", [f"Opción {i}-{j}" for j in range(4)], 'ABCD'[i % 4],
+                 category=f"Unidad {i % 3}")
+        for i in range(n)
+    ], source="banco.txt", validated=True)
+
+
+@pytest.fixture
+def run_dir(tmp_path, monkeypatch):
+    """Genera 8 exámenes con balanceo y límite de solapamiento."""
+    monkeypatch.chdir(tmp_path)
+    output_dir = main_generate('banco.txt', 'Parcial', 8, 10, 'txt', None, 'csv',
+                               bank=make_bank(), max_overlap=4, balance_answers=True)
+    return Path(output_dir)
+
+
+def test_regenerated_exam_is_identical(run_dir, tmp_path):
+    """Test que el examen regenerado coincide byte a byte con el original."""
+    manifest = load_manifest(str(run_dir))
+    assert manifest['generation']['num_exams'] == 8
+    # En modo legacy se permiten repeticiones por defecto (reproduce ejecuciones antiguas)
+    assert manifest['generation']['unique_variants'] is False
+    
+    rebuilt = tmp_path / "regenerado"
+    rebuilt.mkdir()
+    regenerate_exam(manifest, make_bank(), 5, str(rebuilt))
+    
+    for name in ("examen_Parcial_5.txt", "respuestas_examen_Parcial_5.txt"):
+        assert (rebuilt / name).read_bytes() == (run_dir / name).read_bytes()
+
+
+def test_answers_only_and_checks(run_dir):
+    """Test de solo respuestas, banco distinto y examen inexistente."""
+    manifest = load_manifest(str(run_dir / "manifest.json"))
+    _, answers = regenerate_exam(manifest, make_bank(), 3)
+    original = (run_dir / "respuestas_examen_Parcial_3.txt").read_text(encoding='utf-8')
+    assert [line.split()[1] for line in original.splitlines()[2:]] == [f"{a})" for a in answers.values()]
+    
+    with pytest.raises(ValueError):
+        regenerate_exam(manifest, make_bank(61), 3)
+    with pytest.raises(ValueError):
+        regenerate_exam(manifest, make_bank(), 9)
+
+
+def test_spawn_seed_mode(tmp_path, monkeypatch):
+    """Test que el manifiesto guarda la semilla raíz y regenera en modo spawn."""
+    pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    run_dir = Path(main_generate('banco.txt', 'Final', 4, 10, 'txt', None, 'csv',
+                                 bank=make_bank(), seed_mode='spawn'))
+    manifest = load_manifest(str(run_dir))
+    assert manifest['generation']['seed_mode'] == 'spawn'
+    assert manifest['generation']['unique_variants'] is True
+    assert isinstance(manifest['generation']['root_seed'], int)
+    
+    rebuilt = tmp_path / "rebuilt"
+    rebuilt.mkdir()
+    regenerate_exam(manifest, make_bank(), 3, output_dir=str(rebuilt))
+    name = "examen_Final_3.txt"
+    assert (rebuilt / name).read_bytes() == (run_dir / name).read_bytes()
+
+
+def test_fingerprint_ignores_file_layout():
+    """Test que la huella depende del contenido, no del contenedor."""
+    bank = make_bank()
+    assert bank_fingerprint(bank) == bank_fingerprint(list(bank))
+    assert bank_fingerprint(bank) != bank_fingerprint(make_bank(59))
+
+
+def test_loaders_precompute_fingerprint(tmp_path, monkeypatch):
+    """Test que los cargadores calculan la huella sin otra pasada por el banco."""
+    monkeypatch.chdir(tmp_path)
+    expected = bank_fingerprint(list(make_bank()))
+    text = "\n".join(
+        f"{q['question']}\nCATEGORY: {q['category']}\n"
+        + "".join(f"{letter}) {option}\n" for letter, option in zip("ABCD", q['options']))
+        + f"ANSWER: {q['answer']}\n"
+        for q in make_bank()
+    )
+    (tmp_path / "banco.txt").write_text(text, encoding='utf-8')
+    compile_bank(make_bank(), str(tmp_path / "banco.qbank"))
+    
+    assert load_bank(str(tmp_path / "banco.txt")).fingerprint == expected
+    
+    # El .qbank guarda la huella: no hace falta decodificar ningún registro
+    def decode_record(*args):
+        raise AssertionError("no se debe decodificar el banco")
+    
+    monkeypatch.setattr(compiled_bank, '_decode_record', decode_record)
+    with load_bank(str(tmp_path / "banco.qbank")) as bank:
+        assert bank_fingerprint(bank) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
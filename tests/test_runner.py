@@ -0,0 +1,136 @@
+"""
+Tests básicos para la generación y exportación de exámenes en paralelo.
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.question import Question
+from examgenerator.exporters import AnswerKey, create_answers_csv, create_answers_excel, merge_answer_files
+from examgenerator.runner import build_exam, iter_exams, make_job, resolve_workers, run_exams, shard_exams
+from examgenerator.utils.statistics import StatisticsAccumulator, generate_exam_statistics
+
+
+QUESTIONS = [
+    Question(f"Pregunta {i}", [f"Opción {i}-{j}" for j in range(4)], 'ABCD'[i % 4])
+    for i in range(40)
+]
+
+
+def read_dir(path):
+    """Contenido de todos los archivos de un directorio."""
+    return {name: (path / name).read_bytes() for name in sorted(os.listdir(path))}
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Test que el modo paralelo produce los mismos archivos que el serie."""
+    serial_dir, parallel_dir = tmp_path / "serie", tmp_path / "paralelo"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    
+    serial = run_exams(QUESTIONS, "Parcial", 6, 10, str(serial_dir), parallel=False)
+    parallel = run_exams(QUESTIONS, "Parcial", 6, 10, str(parallel_dir), parallel=True, max_workers=2)
+    
+    assert parallel == serial
+    assert [exam['exam_number'] for exam in parallel] == list(range(1, 7))
+    assert read_dir(parallel_dir) == read_dir(serial_dir)
+    assert len(read_dir(serial_dir)) == 12  # Examen y respuestas por examen
+
+
+def test_streaming_accumulators(tmp_path):
+    """Test que acumular examen a examen da lo mismo que la lista completa."""
+    exams_dir, list_dir, key_dir = tmp_path / "examenes", tmp_path / "lista", tmp_path / "clave"
+    for path in (exams_dir, list_dir, key_dir):
+        path.mkdir()
+    
+    all_exam_data = run_exams(QUESTIONS, "Final", 25, 8, str(exams_dir), answer_files=False)
+    answer_key = AnswerKey()
+    statistics = StatisticsAccumulator()
+    for exam_data in iter_exams(QUESTIONS, "Final", 25, 8, str(exams_dir), answer_files=False,
+                                parallel=True, max_workers=2):
+        answer_key.add(exam_data)
+        statistics.add(exam_data)
+    
+    assert len(answer_key) == 25
+    assert answer_key[-1] == {'exam_number': 25, 'answers': all_exam_data[-1]['answers']}
+    assert statistics.result() == generate_exam_statistics(all_exam_data)
+    
+    create_answers_csv(all_exam_data, "Final", str(list_dir))
+    create_answers_csv(answer_key, "Final", str(key_dir))
+    assert read_dir(key_dir) == read_dir(list_dir)
+
+
+def test_unique_variants(tmp_path):
+    """Test que ningún examen se repite y que los redibujados son deterministas."""
+    # 2 preguntas de 2 opciones: solo 8 variantes posibles
+    tiny = [Question(f"Pregunta {i}", ["Sí", "No"], 'A') for i in range(2)]
+    serial_dir, parallel_dir = tmp_path / "serie", tmp_path / "paralelo"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    
+    serial = run_exams(tiny, "Mini", 8, 2, str(serial_dir), unique_variants=True)
+    parallel = run_exams(tiny, "Mini", 8, 2, str(parallel_dir), unique_variants=True,
+                         parallel=True, max_workers=2)
+    variants = {tuple((item['question'], tuple(item['options'])) for item in exam['questions'])
+                for exam in serial}
+    assert len(variants) == 8
+    assert parallel == serial
+    assert read_dir(parallel_dir) == read_dir(serial_dir)
+    
+    job = make_job(tiny, "Mini", 2, str(serial_dir), unique_variants=True)
+    assert build_exam(job, 8)[0] == serial[-1]['questions']
+    
+    with pytest.raises(ValueError):
+        run_exams(tiny, "Mini", 9, 2, str(tmp_path), unique_variants=True)
+
+
+def test_shards_merge_into_full_run(tmp_path):
+    """Test que los fragmentos cubren la generación completa y sus respuestas se unen."""
+    full_dir = tmp_path / "completa"
+    full_dir.mkdir()
+    full = run_exams(QUESTIONS, "Final", 10, 8, str(full_dir), answer_files=False, unique_variants=True)
+    create_answers_csv(full, "Final", str(full_dir))
+    
+    shards = [shard_exams(10, i, 3) for i in (1, 2, 3)]
+    assert [number for shard in shards for number in shard] == list(range(1, 11))
+    
+    paths = []
+    for i, numbers in enumerate(reversed(shards)):
+        shard_dir = tmp_path / f"parte{i}"
+        shard_dir.mkdir()
+        part = run_exams(QUESTIONS, "Final", 10, 8, str(shard_dir), answer_files=False,
+                         unique_variants=True, exam_numbers=numbers, parallel=True, max_workers=2)
+        assert part == full[numbers.start - 1:numbers.stop - 1]
+        if i % 2:
+            create_answers_excel(part, "Final", str(shard_dir))
+            paths.append(str(shard_dir / "respuestas_Final_completas.xlsx"))
+        else:
+            create_answers_csv(part, "Final", str(shard_dir))
+            paths.append(str(shard_dir / "respuestas_Final_completas.csv"))
+    
+    merged_dir = tmp_path / "unida"
+    merged_dir.mkdir()
+    create_answers_csv(merge_answer_files(paths, num_exams=10), "Final", str(merged_dir))
+    assert read_dir(merged_dir) == {name: data for name, data in read_dir(full_dir).items() if name.endswith('.csv')}
+    
+    with pytest.raises(ValueError):
+        merge_answer_files(paths + paths[:1])
+    # Falta el primer fragmento: no hay hueco interno, pero no cubre 1..10
+    with pytest.raises(ValueError, match="Faltan 3 de 10 exámenes \\(1-3\\)"):
+        merge_answer_files(paths[:2], num_exams=10)
+
+
+def test_resolve_workers():
+    """Test número de procesos según los argumentos."""
+    assert resolve_workers(parallel=False, max_workers=8) == 1
+    assert resolve_workers(parallel=True, max_workers=3) == 3
+    assert resolve_workers(parallel=True, max_workers=0) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
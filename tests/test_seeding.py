@@ -0,0 +1,61 @@
+"""
+Tests básicos para las semillas por examen.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar directorio raíz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from examgenerator.core.question import Question
+from examgenerator.core.seeding import NUMPY_AVAILABLE, exam_rng
+from examgenerator.runner import build_exam, make_job, run_exams
+
+needs_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy no instalado")
+
+QUESTIONS = [
+    Question(f"Pregunta {i}", [f"Opción {i}-{j}" for j in range(4)], 'ABCD'[i % 4])
+    for i in range(30)
+]
+
+
+def test_legacy_mode_uses_seed_string():
+    """Test que el modo legacy reproduce la semilla prefijo_N."""
+    assert exam_rng("Parcial", 3).random() == random.Random("Parcial_3").random()
+    assert exam_rng("Parcial", 3, attempt=2).random() == random.Random("Parcial_3#2").random()
+    with pytest.raises(ValueError):
+        exam_rng("Parcial", 3, seed_mode='otro')
+
+
+@needs_numpy
+def test_spawn_mode_matches_seed_sequence():
+    """Test que cada examen usa el hijo correspondiente de SeedSequence.spawn."""
+    import numpy as np
+    
+    children = np.random.SeedSequence(1234).spawn(5)
+    for number, child in enumerate(children, 1):
+        expected = random.Random(int.from_bytes(child.generate_state(4).tobytes(), 'little'))
+        assert exam_rng("Parcial", number, 'spawn', 1234).random() == expected.random()
+    with pytest.raises(ValueError):
+        exam_rng("Parcial", 1, 'spawn')
+
+
+@needs_numpy
+def test_spawn_shards_are_independent(tmp_path):
+    """Test que un fragmento de exámenes se genera igual por separado."""
+    full = run_exams(QUESTIONS, "Final", 8, 10, str(tmp_path), answer_files=False,
+                     seed_mode='spawn', root_seed=42)
+    job = make_job(QUESTIONS, "Final", 10, str(tmp_path), seed_mode='spawn', root_seed=42)
+    for number in (8, 5, 6):
+        assert build_exam(job, number)[0] == full[number - 1]['questions']
+    
+    other = run_exams(QUESTIONS, "Final", 8, 10, str(tmp_path), answer_files=False,
+                      seed_mode='spawn', root_seed=43)
+    assert other != full
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -14,6 +14,7 @@ from examgenerator.utils.validators import (
     validate_export_format,
     validate_answers_format,
     sanitize_filename,
+    validate_questions_file,
     ValidationError
 )
 
@@ -87,5 +88,22 @@ def test_sanitize_filename():
     assert sanitize_filename("   ") == "unnamed"
 
 
+def test_validate_questions_file(tmp_path):
+    """Test validación rápida de archivo de preguntas."""
+    valid = tmp_path / "preguntas.txt"
+    valid.write_text("¿Pregunta?\nA) Sí\nB) No\nANSWER: A\n", encoding='utf-8')
+    assert validate_questions_file(str(valid)) == valid
+    
+    empty = tmp_path / "vacio.txt"
+    empty.write_text("\n   \n", encoding='utf-8')
+    with pytest.raises(ValidationError):
+        validate_questions_file(str(empty))
+    
+    no_answers = tmp_path / "sin_respuestas.txt"
+    no_answers.write_text("¿Pregunta?\nA) Sí\nB) No\n", encoding='utf-8')
+    with pytest.raises(ValidationError):
+        validate_questions_file(str(no_answers))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])